@@ -1,7 +1,9 @@
+# the heavy dependencies (mne, bsl, scipy and the plotting backends) are
+# imported by the entry points when called, to keep 'import psd_topo' fast
 from ._version import __version__  # noqa: F401
 from .fft import fft  # noqa: F401
-from .nfb import nfb  # noqa: F401
+from .nfb import nfb, nfb_sync  # noqa: F401
 from .utils._logs import set_log_level  # noqa: F401
 from .weather_map import weather_map  # noqa: F401
 
-__all__ = ("fft", "nfb", "set_log_level")
+__all__ = ("fft", "nfb", "nfb_sync", "set_log_level")
@@ -0,0 +1,136 @@
+"""On-disk cache of the topographic map geometries."""
+
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from mne import Info
+from mne import __version__ as mne_version
+from mne.utils.check import _check_sphere
+from numpy.typing import NDArray
+
+from .utils._logs import logger
+
+# increment when the content of the cached geometries changes
+_CACHE_VERSION = 1
+# arrays of a geometry, in addition to the outlines
+_ARRAYS = (
+    "interpolation",
+    "nearest",
+    "mask",
+    "extent",
+    "pos",
+    "clip_origin",
+    "clip_radius",
+)
+
+
+def _get_cache_directory() -> Path:
+    """Get the directory storing the cached geometries.
+
+    The directory is set by the environment variable ``PSD_TOPO_CACHE`` and
+    defaults to ``psd_topo/geometry`` in the user cache directory.
+    """
+    directory = os.environ.get("PSD_TOPO_CACHE")
+    if directory is not None:
+        return Path(directory).expanduser()
+    root = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(root).expanduser() / "psd_topo" / "geometry"
+
+
+def _get_key(info: Info, res: int, image_interp: str, margin: int) -> str:
+    """Hash the channels, their positions and the rendering parameters."""
+    key = dict(
+        version=_CACHE_VERSION,
+        mne=mne_version,
+        ch_names=info["ch_names"],
+        pos=[np.round(ch["loc"][:3], 9).tolist() for ch in info["chs"]],
+        sphere=np.round(_check_sphere(None, info), 9).tolist(),
+        res=res,
+        image_interp=image_interp,
+        margin=margin,
+    )
+    key = json.dumps(key, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(key).hexdigest()
+
+
+def _read_geometry(key: str) -> Optional[Dict[str, NDArray]]:
+    """Load a geometry from the cache.
+
+    Parameters
+    ----------
+    key : str
+        Key of the geometry, see ``_get_key``.
+
+    Returns
+    -------
+    geometry : dict | None
+        The geometry, formatted as by ``_compute_geometry``. None if the
+        geometry is not cached or if the cached file is corrupted.
+    """
+    fname = _get_cache_directory() / f"{key}.npz"
+    if not fname.exists():
+        return None
+    try:
+        with np.load(fname, allow_pickle=False) as file:
+            arrays = dict(file)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        logger.warning("Cache: geometry '%s' could not be read.", fname)
+        return None
+    if any(name not in arrays for name in _ARRAYS):
+        logger.warning("Cache: geometry '%s' is incomplete.", fname)
+        return None
+    geometry = dict(outlines=dict())
+    for name, array in arrays.items():
+        if name.startswith("outline-"):
+            geometry["outlines"][name[len("outline-") :]] = tuple(array)
+        elif array.size == 0 and name in ("interpolation", "nearest"):
+            geometry[name] = None
+        else:
+            geometry[name] = array
+    logger.debug("Cache: loaded geometry '%s'.", fname)
+    return geometry
+
+
+def _write_geometry(key: str, geometry: Dict[str, NDArray]) -> None:
+    """Write a geometry to the cache.
+
+    The geometry is written to a temporary file and moved in place, thus
+    concurrent processes never read a partially written file.
+
+    Parameters
+    ----------
+    key : str
+        Key of the geometry, see ``_get_key``.
+    geometry : dict
+        The geometry, formatted as by ``_compute_geometry``.
+    """
+    arrays = dict()
+    for name, value in geometry.items():
+        if name == "outlines":
+            for outline, coords in value.items():
+                arrays[f"outline-{outline}"] = np.array(coords)
+        else:
+            arrays[name] = np.empty(0) if value is None else value
+    directory = _get_cache_directory()
+    file = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=directory, suffix=".tmp", delete=False
+        ) as file:
+            np.savez(file, **arrays)
+        os.replace(file.name, directory / f"{key}.npz")
+    except OSError:
+        logger.warning(
+            "Cache: could not write the geometry to '%s'.", directory
+        )
+        if file is not None and os.path.exists(file.name):
+            os.remove(file.name)
+        return
+    logger.debug("Cache: written geometry '%s'.", directory / f"{key}.npz")
@@ -0,0 +1,454 @@
+"""Start the online loops in worker processes."""
+
+import multiprocessing as mp
+import queue
+import threading
+import time
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .config import load_config
+from .utils._checks import _check_type
+from .utils._logs import _stop_listener, logger
+from .utils.utils import _get_resolver, _resolve_amplifiers
+
+# modules imported once by the fork server and inherited by the workers
+_PRELOAD = (
+    "bsl",
+    "matplotlib.pyplot",
+    "mne",
+    "scipy.signal",
+    "psd_topo._render",
+    "psd_topo.preprocessing.artifact",
+    "psd_topo.preprocessing.filter",
+    "psd_topo.preprocessing.spatial_filter",
+    "psd_topo.topomap",
+)
+
+
+def _get_context(preload: Sequence[str] = _PRELOAD):
+    """Get the multiprocessing context used to start the workers.
+
+    The 'forkserver' start method is used when available: the heavy modules
+    are imported once by the fork server and each worker is forked from it.
+    On platforms without it, e.g. Windows, the 'spawn' start method is used
+    and each worker imports the modules.
+    """
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload(list(preload))
+    else:
+        ctx = mp.get_context("spawn")
+    return ctx
+
+
+def _run_worker(target: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run the target of a worker and write its pending logs on exit."""
+    try:
+        return target(*args, **kwargs)
+    finally:
+        # the workers exit without running the 'atexit' functions
+        _stop_listener()
+
+
+def _signal_ready(ready: mp.Queue, idx: Any) -> None:
+    """Report the readiness of a worker to the launcher."""
+    ready.put(idx)
+
+
+def _launch(
+    target: Callable[..., Any],
+    args: Iterable[Tuple[Any, ...]],
+    kwargs: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = 60.0,
+    preload: Sequence[str] = _PRELOAD,
+) -> Tuple[List[mp.Process], Dict[int, float]]:
+    """Start one worker per set of arguments and wait until they are ready.
+
+    Parameters
+    ----------
+    target : callable
+        Function run by the workers, e.g. `~psd_topo.nfb`. It must accept a
+        'ready_callback' keyword argument and call it once ready.
+    args : list of tuple | iterator of tuple
+        Positional arguments of each worker. If an iterator is provided, each
+        worker is started as soon as its arguments are yielded.
+    kwargs : dict | None
+        Keyword arguments shared by all workers.
+    timeout : float | None
+        Maximum time to wait for the workers to be ready, in seconds. None to
+        wait until all workers are ready or have exited.
+    preload : list of str
+        Modules imported by the fork server. Only used if the fork server is
+        not running yet.
+
+    Returns
+    -------
+    processes : list of Process
+        The worker processes, in the order of 'args'.
+    ready : dict
+        Time in seconds between the start of the workers and their readiness,
+        indexed by the position of the worker in 'args'. Workers which are
+        not ready before the timeout or which exited are missing.
+    """
+    _check_type(target, ("callable",), "target")
+    _check_type(kwargs, (dict, None), "kwargs")
+    _check_type(timeout, ("numeric", None), "timeout")
+    kwargs = dict() if kwargs is None else kwargs
+    ctx = _get_context(preload)
+    ready_queue = ctx.Queue()
+
+    start = time.perf_counter()
+    processes = list()
+    try:
+        for k, arg in enumerate(args):
+            process = ctx.Process(
+                target=_run_worker,
+                args=(target, *arg),
+                kwargs=dict(
+                    kwargs,
+                    ready_callback=partial(_signal_ready, ready_queue, k),
+                ),
+            )
+            process.start()
+            processes.append(process)
+    except BaseException:
+        # e.g. the iterator failed to find all the amplifiers
+        for process in processes:
+            process.kill()
+        raise
+    logger.info(
+        "Launcher: %i workers started with the '%s' method in %.2f s.",
+        len(processes),
+        ctx.get_start_method(),
+        time.perf_counter() - start,
+    )
+
+    ready = dict()
+    deadline = None if timeout is None else start + timeout
+    waiting = set(range(len(processes)))
+    while len(waiting) != 0:
+        if deadline is not None and deadline <= time.perf_counter():
+            logger.warning(
+                "Launcher: worker(s) %s not ready after %.2f s.",
+                ", ".join(str(k) for k in sorted(waiting)),
+                timeout,
+            )
+            break
+        try:
+            k = ready_queue.get(timeout=0.1)
+        except queue.Empty:
+            for k in sorted(waiting):
+                if processes[k].exitcode is not None:
+                    logger.error(
+                        "Launcher: worker %i exited with code %i before "
+                        "being ready.",
+                        k,
+                        processes[k].exitcode,
+                    )
+                    waiting.remove(k)
+            continue
+        ready[k] = time.perf_counter() - start
+        waiting.discard(k)
+        logger.info("Launcher: worker %i ready after %.2f s.", k, ready[k])
+    logger.info(
+        "Launcher: %i / %i workers live after %.2f s.",
+        len(ready),
+        len(processes),
+        time.perf_counter() - start,
+    )
+    return processes, ready
+
+
+class _Supervisor:
+    """Attach, stop and restart one worker per amplifier on the network.
+
+    The LSL streams are resolved continuously. A worker is attached to each
+    new amplifier, stopped when its amplifier disappears from the network,
+    and restarted when it reappears or when the worker exits. The other
+    workers are not affected.
+
+    A worker which exits is restarted after a delay doubled on each failure,
+    starting at 'backoff' seconds. After 'max_failures' failures within
+    'failure_window' seconds, e.g. a worker crashing at startup, the stream
+    is abandoned until it disappears from the network and reappears.
+
+    The workers are forked from the preloaded fork server and the topomap
+    geometries are read from the on-disk cache, thus a restarted worker
+    skips the imports and the interpolator computation.
+
+    Parameters
+    ----------
+    target : callable
+        Function run by the workers, e.g. `~psd_topo.nfb`. It must accept a
+        'ready_callback' keyword argument and call it once ready.
+    args : callable
+        Function returning the positional arguments of the worker from the
+        name of the amplifier stream.
+    kwargs : dict | None
+        Keyword arguments shared by all workers.
+    n : int | None
+        Maximum number of workers. None for no limit.
+    probe : float
+        Interval between two probes of the streams and of the workers, in
+        seconds.
+    resolver : ContinuousResolver | None
+        Resolver of the LSL streams, see `~psd_topo.utils.iter_amplifiers`.
+    preload : list of str
+        Modules imported by the fork server. Only used if the fork server is
+        not running yet.
+    backoff : float
+        Delay before the first restart of a worker which exited, in seconds.
+        The delay is doubled on each following failure, up to 60 seconds.
+    max_failures : int
+        Number of failures within 'failure_window' after which the stream is
+        abandoned.
+    failure_window : float
+        Duration in seconds over which the failures are counted.
+    """
+
+    def __init__(
+        self,
+        target: Callable[..., Any],
+        args: Callable[[str], Tuple[Any, ...]],
+        kwargs: Optional[Dict[str, Any]] = None,
+        n: Optional[int] = None,
+        probe: float = 0.5,
+        resolver=None,
+        preload: Sequence[str] = _PRELOAD,
+        backoff: float = 1.0,
+        max_failures: int = 5,
+        failure_window: float = 300.0,
+    ):
+        _check_type(target, ("callable",), "target")
+        _check_type(args, ("callable",), "args")
+        _check_type(kwargs, (dict, None), "kwargs")
+        _check_type(n, ("int", None), "n")
+        _check_type(probe, ("numeric",), "probe")
+        if probe <= 0:
+            raise ValueError(
+                "The probe interval 'probe' must be a strictly positive "
+                "number."
+            )
+        _check_type(backoff, ("numeric",), "backoff")
+        _check_type(max_failures, ("int",), "max_failures")
+        _check_type(failure_window, ("numeric",), "failure_window")
+        if backoff < 0 or max_failures <= 0 or failure_window <= 0:
+            raise ValueError(
+                "The restart delay 'backoff' must be a positive number, the "
+                "number of failures 'max_failures' and the duration "
+                "'failure_window' must be strictly positive."
+            )
+        self._target = target
+        self._args = args
+        self._kwargs = dict() if kwargs is None else kwargs
+        self._n = n
+        self._probe = probe
+        self._resolver = _get_resolver() if resolver is None else resolver
+        self._amp_prefix, _ = load_config()
+        self._ctx = _get_context(preload)
+        self._ready_queue = self._ctx.Queue()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._start = time.perf_counter()
+        # state of the workers, indexed by stream name
+        self._workers = dict()
+        self._starts = dict()
+        self._ready = set()
+        self._n_starts = dict()
+        # failures of the workers, indexed by stream name
+        self._backoff = backoff
+        self._max_failures = max_failures
+        self._failure_window = failure_window
+        self._failures = dict()
+        self._next_starts = dict()
+        self._failed = set()
+
+    def start(self) -> None:
+        """Start supervising the workers in a background thread."""
+        if self._thread is not None:
+            raise RuntimeError("The supervisor is already started.")
+        self._stop.clear()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop supervising and kill the workers."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            for name in list(self._workers):
+                self._kill(name)
+
+    def _run(self) -> None:
+        """Poll the streams and the workers until stopped."""
+        while True:
+            self.poll()
+            if self._stop.wait(self._probe):
+                break
+
+    def poll(self) -> None:
+        """Check the streams and the workers once."""
+        available = _resolve_amplifiers(self._resolver, self._amp_prefix)
+        with self._lock:
+            self._check_ready()
+            for name in list(self._workers):
+                exitcode = self._workers[name].exitcode
+                if exitcode is not None:
+                    self._kill(name)
+                    self._fail(name, exitcode)
+                elif name not in available:
+                    logger.warning(
+                        "Supervisor: stream '%s' lost, stopping its worker.",
+                        name,
+                    )
+                    self._kill(name)
+            # a stream which disappears is given a new chance on reconnection
+            for name in set(self._failures) - set(available):
+                self._failures.pop(name)
+                self._next_starts.pop(name, None)
+                self._failed.discard(name)
+            now = time.perf_counter()
+            for name in available:
+                if (
+                    name in self._workers
+                    or name in self._failed
+                    or now < self._next_starts.get(name, now)
+                ):
+                    continue
+                if self._n is not None and self._n <= len(self._workers):
+                    break
+                self._spawn(name)
+
+    def _spawn(self, name: str) -> None:
+        """Start the worker of a stream."""
+        self._n_starts[name] = self._n_starts.get(name, 0) + 1
+        # the number of starts identifies the report of a killed worker
+        key = (name, self._n_starts[name])
+        process = self._ctx.Process(
+            target=_run_worker,
+            args=(self._target, *self._args(name)),
+            kwargs=dict(
+                self._kwargs,
+                ready_callback=partial(_signal_ready, self._ready_queue, key),
+            ),
+        )
+        process.start()
+        self._workers[name] = process
+        self._starts[name] = time.perf_counter()
+        logger.info(
+            "Supervisor: %s worker '%s'.",
+            "attached" if self._n_starts[name] == 1 else "restarted",
+            name,
+        )
+
+    def _fail(self, name: str, exitcode: int) -> None:
+        """Account for the failure of a worker and schedule its restart."""
+        now = time.perf_counter()
+        failures = [
+            t
+            for t in self._failures.get(name, list())
+            if now - t < self._failure_window
+        ]
+        failures.append(now)
+        self._failures[name] = failures
+        if self._max_failures <= len(failures):
+            self._failed.add(name)
+            logger.error(
+                "Supervisor: worker '%s' exited with code %i, %i failures in "
+                "%.0f s, giving up until the stream reconnects.",
+                name,
+                exitcode,
+                len(failures),
+                now - failures[0],
+            )
+            return
+        delay = min(self._backoff * 2 ** (len(failures) - 1), 60.0)
+        self._next_starts[name] = now + delay
+        logger.warning(
+            "Supervisor: worker '%s' exited with code %i, restarting in "
+            "%.1f s.",
+            name,
+            exitcode,
+            delay,
+        )
+
+    def _kill(self, name: str) -> None:
+        """Kill the worker of a stream."""
+        process = self._workers.pop(name)
+        process.kill()
+        process.join()
+        self._ready.discard(name)
+        del self._starts[name]
+
+    def _check_ready(self) -> None:
+        """Collect the readiness reports of the workers."""
+        while True:
+            try:
+                name, n_starts = self._ready_queue.get_nowait()
+            except queue.Empty:
+                break
+            if name not in self._workers or n_starts != self._n_starts[name]:
+                continue  # report of a worker killed since
+            self._ready.add(name)
+            logger.info(
+                "Supervisor: worker '%s' ready after %.2f s.",
+                name,
+                time.perf_counter() - self._starts[name],
+            )
+            if len(self._ready) == self._n:
+                logger.info(
+                    "Supervisor: %i workers live after %.2f s.",
+                    self._n,
+                    time.perf_counter() - self._start,
+                )
+
+    # ------------------------------------------------------------------------
+    @property
+    def workers(self) -> Dict[str, mp.Process]:
+        """Worker processes, indexed by stream name.
+
+        :type: dict
+        """
+        with self._lock:
+            return dict(self._workers)
+
+    @property
+    def ready(self) -> List[str]:
+        """Name of the streams whose worker is ready.
+
+        :type: list of str
+        """
+        with self._lock:
+            return sorted(self._ready)
+
+    @property
+    def n_starts(self) -> Dict[str, int]:
+        """Number of times the worker of each stream was started.
+
+        :type: dict
+        """
+        with self._lock:
+            return dict(self._n_starts)
+
+    @property
+    def failed(self) -> List[str]:
+        """Name of the streams abandoned after repeated worker failures.
+
+        :type: list of str
+        """
+        with self._lock:
+            return sorted(self._failed)
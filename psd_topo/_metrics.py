@@ -0,0 +1,304 @@
+"""Metrics of the online loops, exported over HTTP or to a JSON lines file."""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from .utils._checks import _check_type
+from .utils._logs import logger
+
+
+class _Metrics:
+    """Counters of the ticks of an online loop.
+
+    The counters are stored in preallocated arrays, thus recording a tick
+    does not allocate nor format anything. The statistics are computed when
+    a snapshot is requested, by the exporting thread.
+
+    Parameters
+    ----------
+    stream_name : str
+        Name of the stream processed by the loop.
+    size : int
+        Number of ticks kept to compute the tick rate and the percentiles.
+    quality : _StreamQuality | None
+        Data-quality counters of the stream, added to the snapshots.
+    """
+
+    def __init__(self, stream_name: str, size: int = 1024, quality=None):
+        self._stream_name = stream_name
+        self._size = size
+        self._quality = quality
+        self._tics = np.full(size, np.nan)
+        self._compute = np.full(size, np.nan)
+        self._render = np.full(size, np.nan)
+        self._n_ticks = 0
+        self._n_dropped = 0
+        self._queue_depth = 0
+
+    def record(
+        self, tic: float, compute: float, render: float, queue_depth: int
+    ) -> None:
+        """Record a tick.
+
+        Parameters
+        ----------
+        tic : float
+            Time at which the window of the tick is retrieved, from
+            ``time.perf_counter``.
+        compute : float
+            Duration of the preprocessing and of the computation of the band
+            power, in seconds.
+        render : float
+            Duration of the update and of the rendering of the topographic
+            map, in seconds.
+        queue_depth : int
+            Number of new samples processed by the tick.
+        """
+        idx = self._n_ticks % self._size
+        self._tics[idx] = tic
+        self._compute[idx] = compute
+        self._render[idx] = render
+        self._queue_depth = queue_depth
+        self._n_ticks += 1
+
+    def drop(self) -> None:
+        """Record a dropped frame, e.g. a rejected window."""
+        self._n_dropped += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current value of the metrics.
+
+        Returns
+        -------
+        snapshot : dict
+            The metrics, with the keys:
+
+            * ``stream``: name of the stream.
+            * ``ticks``: number of ticks.
+            * ``tick_rate``: number of ticks per second over the last ticks.
+            * ``compute``: 50th, 95th and 99th percentiles of the computation
+              time over the last ticks, in seconds.
+            * ``render``: 50th, 95th and 99th percentiles of the rendering
+              time over the last ticks, in seconds.
+            * ``dropped``: number of dropped frames.
+            * ``queue_depth``: number of new samples processed by the last
+              tick.
+            * ``rss``: resident memory of the process in bytes.
+            * ``quality``: data-quality counters of the stream, if provided.
+        """
+        n = min(self._n_ticks, self._size)
+        tics = np.sort(self._tics[:n])
+        tick_rate = (
+            (n - 1) / (tics[-1] - tics[0])
+            if 2 <= n and tics[0] < tics[-1]
+            else np.nan
+        )
+        snapshot = dict(
+            stream=self._stream_name,
+            ticks=self._n_ticks,
+            tick_rate=float(tick_rate),
+            compute=_percentiles(self._compute[:n]),
+            render=_percentiles(self._render[:n]),
+            dropped=self._n_dropped,
+            queue_depth=self._queue_depth,
+            rss=_get_rss(),
+        )
+        if self._quality is not None:
+            snapshot["quality"] = self._quality.snapshot()
+        return snapshot
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    """Compute the 50th, 95th and 99th percentiles."""
+    if values.size == 0:
+        return dict(p50=np.nan, p95=np.nan, p99=np.nan)
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return dict(p50=float(p50), p95=float(p95), p99=float(p99))
+
+
+def _get_rss() -> Optional[int]:
+    """Get the resident memory of the process in bytes."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # peak resident memory, in kilobytes on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class _MetricsExporter:
+    """Export the snapshots of metrics in a background thread.
+
+    Parameters
+    ----------
+    snapshots : callable
+        Function returning the list of snapshots to export.
+    port : int | None
+        Port of the local HTTP server, serving the snapshots as JSON on
+        ``/metrics``. If the port is in use, the next ports are tried. 0 to
+        use a port assigned by the system. None to disable.
+    fname : path-like | None
+        File to which a JSON line with the snapshots is appended every
+        'interval' seconds. None to disable.
+    interval : float
+        Interval between two lines written to 'fname', in seconds.
+    host : str
+        Address of the HTTP server. Defaults to the local host only.
+    """
+
+    def __init__(
+        self,
+        snapshots: Callable[[], List[Dict[str, Any]]],
+        port: Optional[int] = None,
+        fname: Optional[Union[str, Path]] = None,
+        interval: float = 10.0,
+        host: str = "127.0.0.1",
+    ):
+        _check_type(port, ("int", None), "port")
+        _check_type(fname, ("path-like", None), "fname")
+        _check_type(interval, ("numeric",), "interval")
+        if interval <= 0:
+            raise ValueError(
+                "The interval 'interval' must be a strictly positive number."
+            )
+        self._snapshots = snapshots
+        self._fname = None if fname is None else Path(fname)
+        self._interval = interval
+        self._stop = threading.Event()
+        self._server = None
+        self._threads = list()
+        if port is not None:
+            self._server = _bind(host, port, self._payload)
+            logger.info(
+                "Metrics: serving on http://%s:%i/metrics.",
+                *self._server.server_address[:2],
+            )
+            self._threads.append(
+                threading.Thread(
+                    target=self._server.serve_forever,
+                    kwargs=dict(poll_interval=0.5),
+                    daemon=True,
+                )
+            )
+        if self._fname is not None:
+            logger.info("Metrics: writing to '%s'.", self._fname)
+            self._threads.append(
+                threading.Thread(target=self._write, daemon=True)
+            )
+        for thread in self._threads:
+            thread.start()
+
+    def _payload(self) -> bytes:
+        """Format the snapshots as JSON."""
+        payload = dict(time=time.time(), pid=os.getpid())
+        payload["streams"] = self._snapshots()
+        return json.dumps(_replace_nan(payload)).encode("utf-8")
+
+    def _write(self) -> None:
+        """Append the snapshots to the file every 'interval' seconds."""
+        while not self._stop.wait(self._interval):
+            try:
+                with open(self._fname, "ab") as file:
+                    file.write(self._payload() + b"\n")
+            except OSError:
+                logger.warning(
+                    "Metrics: could not write to '%s'.", self._fname
+                )
+
+    def close(self) -> None:
+        """Stop the HTTP server and the writer."""
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+
+    # ------------------------------------------------------------------------
+    @property
+    def port(self) -> Optional[int]:
+        """Port of the HTTP server, None if disabled.
+
+        :type: int | None
+        """
+        return None if self._server is None else self._server.server_port
+
+
+def _bind(host: str, port: int, payload: Callable[[], bytes]):
+    """Bind an HTTP server serving the payload on the first free port."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = payload()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("Metrics: " + format, *args)
+
+    # the workers of rt_topo share the port requested, the next ports are
+    # used by the other workers
+    for offset in range(16 if port != 0 else 1):
+        try:
+            return ThreadingHTTPServer((host, port + offset), Handler)
+        except OSError:
+            continue
+    raise RuntimeError(
+        f"The metrics server could not bind a port between {port} and "
+        f"{port + 15}."
+    )
+
+
+def _replace_nan(obj: Any) -> Any:
+    """Replace the undefined values by None, as NaN is not valid JSON."""
+    if isinstance(obj, dict):
+        return {key: _replace_nan(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_replace_nan(value) for value in obj]
+    if isinstance(obj, float) and not np.isfinite(obj):
+        return None
+    return obj
+
+
+def _start_metrics(
+    metrics: List[_Metrics], options: Optional[Dict[str, Any]]
+) -> Optional[_MetricsExporter]:
+    """Start the export of the metrics.
+
+    Parameters
+    ----------
+    metrics : list of _Metrics
+        The metrics of each stream.
+    options : dict | None
+        Keyword arguments of `_MetricsExporter`. None to disable the export.
+
+    Returns
+    -------
+    exporter : _MetricsExporter | None
+        The exporter, None if disabled.
+    """
+    if options is None:
+        return None
+    return _MetricsExporter(
+        lambda: [metric.snapshot() for metric in metrics], **options
+    )
@@ -0,0 +1,196 @@
+"""Data-quality counters of the acquired streams."""
+
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .utils._logs import _RateLimit, logger
+
+
+class _StreamQuality:
+    """Counters of the samples received from a stream.
+
+    The counters are computed from the timestamps of the new samples only,
+    thus each sample is accounted for once:
+
+    * the number of samples received and expected from the nominal sampling
+      frequency between the first and the last sample;
+    * the gaps, i.e. intervals between 2 consecutive samples longer than
+      'gap_factor' sampling periods, and the number of samples missing;
+    * the jitter, i.e. the standard deviation of the intervals between 2
+      consecutive samples outside of the gaps;
+    * the effective sampling rate, and the drift of the sampling rate outside
+      of the gaps from the nominal sampling frequency;
+    * the longest interval without new samples, measured on the clock of
+      this computer, e.g. when the chunks stop arriving.
+
+    Parameters
+    ----------
+    stream_name : str
+        Name of the stream, used in the logs and in the snapshot.
+    sfreq : float
+        Nominal sampling frequency in Hz.
+    gap_factor : float
+        Minimum interval between 2 consecutive samples, in sampling periods,
+        counted as a gap.
+    log_interval : float | None
+        Interval between 2 logs of the counters, in seconds. None to disable.
+    """
+
+    def __init__(
+        self,
+        stream_name: str,
+        sfreq: float,
+        gap_factor: float = 1.5,
+        log_interval: Optional[float] = 10.0,
+    ):
+        self._stream_name = stream_name
+        self._sfreq = sfreq
+        self._gap = gap_factor / sfreq
+        self._log_interval = log_interval
+        self._gap_log_rate = _RateLimit(1.0)
+        self.reset()
+
+    def update(self, timestamps: NDArray[float]) -> int:
+        """Account for the new samples of a window.
+
+        Parameters
+        ----------
+        timestamps : array
+            1D array containing the timestamps of a window, in increasing
+            order. The timestamps older than the last timestamp of the
+            previous call are ignored.
+
+        Returns
+        -------
+        n_new : int
+            Number of new samples.
+        """
+        now = time.perf_counter()
+        start = np.searchsorted(timestamps, self._last_timestamp, "right")
+        new = timestamps[start:]
+        if new.size == 0:
+            if self._n_received != 0:
+                self._stall = max(self._stall, now - self._last_arrival)
+            self._log(now)
+            return 0
+        if self._n_received == 0:
+            self._first_timestamp = new[0]
+            intervals = np.diff(new)
+        else:
+            self._stall = max(self._stall, now - self._last_arrival)
+            intervals = np.diff(new, prepend=self._last_timestamp)
+        is_gap = self._gap < intervals
+        gaps = intervals[is_gap]
+        if gaps.size != 0:
+            missing = int(np.sum(np.round(gaps * self._sfreq) - 1))
+            self._n_gaps += gaps.size
+            self._n_missing += missing
+            if self._gap_log_rate():
+                logger.warning(
+                    "Quality: %i gap(s) in '%s', %i sample(s) missing, %i "
+                    "gap(s) in total.",
+                    gaps.size,
+                    self._stream_name,
+                    missing,
+                    self._n_gaps,
+                )
+        # the jitter and the drift are computed without the gaps
+        intervals = intervals[~is_gap]
+        self._n_intervals += intervals.size
+        self._sum += np.sum(intervals)
+        self._sum_squares += np.sum(intervals**2)
+        self._n_received += new.size
+        self._last_timestamp = new[-1]
+        self._last_arrival = now
+        self._log(now)
+        return new.size
+
+    def reset(self) -> None:
+        """Reset the counters."""
+        self._n_received = 0
+        self._n_gaps = 0
+        self._n_missing = 0
+        self._n_intervals = 0
+        self._sum = 0.0
+        self._sum_squares = 0.0
+        self._first_timestamp = np.nan
+        self._last_timestamp = -np.inf
+        self._stall = 0.0
+        self._last_arrival = time.perf_counter()
+        self._last_log = self._last_arrival
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current value of the counters.
+
+        Returns
+        -------
+        snapshot : dict
+            The counters, with the keys:
+
+            * ``stream``: name of the stream.
+            * ``sfreq``: nominal sampling frequency in Hz.
+            * ``received``: number of samples received.
+            * ``expected``: number of samples expected between the first and
+              the last sample received.
+            * ``gaps``: number of gaps.
+            * ``missing``: number of samples missing in the gaps.
+            * ``jitter``: standard deviation of the intervals between 2
+              consecutive samples, gaps excluded, in seconds.
+            * ``effective_sfreq``: number of samples received per second, in
+              Hz.
+            * ``drift``: relative drift of the sampling rate from the nominal
+              sampling frequency, gaps excluded, in parts per million.
+            * ``max_stall``: longest interval without new samples on the
+              clock of this computer, in seconds.
+        """
+        duration = self._last_timestamp - self._first_timestamp
+        if 0 < duration:
+            expected = int(round(duration * self._sfreq)) + 1
+            effective_sfreq = (self._n_received - 1) / duration
+        else:
+            expected = self._n_received
+            effective_sfreq = np.nan
+        if self._n_intervals != 0:
+            mean = self._sum / self._n_intervals
+            variance = self._sum_squares / self._n_intervals - mean**2
+            jitter = float(np.sqrt(max(variance, 0.0)))
+            drift = (1 / mean - self._sfreq) / self._sfreq * 1e6
+        else:
+            jitter = drift = np.nan
+        return dict(
+            stream=self._stream_name,
+            sfreq=self._sfreq,
+            received=self._n_received,
+            expected=expected,
+            gaps=self._n_gaps,
+            missing=self._n_missing,
+            jitter=jitter,
+            effective_sfreq=effective_sfreq,
+            drift=drift,
+            max_stall=self._stall,
+        )
+
+    def _log(self, now: float) -> None:
+        """Log the counters every 'log_interval' seconds."""
+        if (
+            self._log_interval is None
+            or now - self._last_log < self._log_interval
+        ):
+            return
+        self._last_log = now
+        snapshot = self.snapshot()
+        logger.info(
+            "Quality: '%s' %i / %i samples, %i gap(s), jitter %.2f ms, "
+            "rate %.2f Hz (%+.0f ppm), max stall %.2f s.",
+            snapshot["stream"],
+            snapshot["received"],
+            snapshot["expected"],
+            snapshot["gaps"],
+            snapshot["jitter"] * 1e3,
+            snapshot["effective_sfreq"],
+            snapshot["drift"],
+            snapshot["max_stall"],
+        )
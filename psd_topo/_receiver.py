@@ -0,0 +1,482 @@
+"""Acquisition of the windows of the streams."""
+
+import logging
+import math
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ._quality import _StreamQuality
+from .utils._checks import _check_type
+from .utils._logs import logger
+
+
+class _PartialWindowFilter(logging.Filter):
+    """Drop the warnings of bsl about a partially filled or empty buffer."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        msg = str(record.msg)
+        return (
+            "does not contain enough samples" not in msg
+            and "did not return any data" not in msg
+        )
+
+
+class _Receiver:
+    """Receiver of the windows of one stream.
+
+    The windows are retrieved with a ``bsl.StreamReceiver``. Until the buffer
+    is full, the windows are shorter than the acquisition window and their
+    duration is tracked by the receiver.
+
+    Parameters
+    ----------
+    stream_name : str
+        Name of the LSL stream.
+    winsize : float
+        Duration of the acquisition window in seconds.
+    warmup : float | None
+        Minimum duration in seconds of the provisional windows returned while
+        the buffer fills. None to wait for a full buffer.
+    band : tuple | None
+        Frequency band of interest. If provided, the provisional windows are
+        long enough to resolve at least 2 frequencies in the band.
+    """
+
+    def __init__(
+        self,
+        stream_name: str,
+        winsize: float,
+        warmup: Optional[float] = None,
+        band: Optional[Tuple[float, float]] = None,
+    ):
+        from bsl import StreamReceiver
+
+        self._sr = StreamReceiver(
+            bufsize=winsize, winsize=winsize, stream_name=stream_name
+        )
+        self._stream = self._sr.streams[stream_name]
+        self._n_times = self._stream.buffer.winsize
+        if warmup is None:
+            n_min = self._n_times
+        else:
+            n_min = int(round(warmup * self.sfreq))
+            if band is not None:
+                # frequency resolution of at least half the band width
+                n_min = max(
+                    n_min, math.ceil(2 * self.sfreq / (band[1] - band[0]))
+                )
+        self._n_min = min(max(n_min, 1), self._n_times)
+        self._n_samples = 0
+        self._n_new = 0
+        self._start = time.perf_counter()
+        self._quality = _StreamQuality(stream_name, self.sfreq)
+        # bsl warns on every window retrieved from a partially filled buffer
+        self._filter = _PartialWindowFilter()
+        logging.getLogger("bsl").addFilter(self._filter)
+
+    def get_window(self) -> Tuple[NDArray[float], NDArray[float]]:
+        """Acquire and return the latest window.
+
+        Returns
+        -------
+        data : array
+            2D array of shape (n_samples, n_channels) with n_samples between
+            'n_min' and 'n_times', or 0 if the buffer does not contain 'n_min'
+            samples yet.
+        timestamps : array
+            1D array of shape (n_samples,).
+        """
+        self._sr.acquire()
+        data, timestamps = self._sr.get_window()
+        self._n_new = self._quality.update(timestamps)
+        if not self.is_full:
+            self._n_samples = timestamps.size
+            if self.is_full:
+                logging.getLogger("bsl").removeFilter(self._filter)
+                logger.info(
+                    "Buffer: full after %.2f s.",
+                    time.perf_counter() - self._start,
+                )
+            elif self._n_samples < self._n_min:
+                return data[:0], timestamps[:0]
+        return data, timestamps
+
+    # ------------------------------------------------------------------------
+    @property
+    def ch_names(self) -> List[str]:
+        """Name of the channels.
+
+        :type: list of str
+        """
+        return self._stream.ch_list
+
+    @property
+    def sfreq(self) -> float:
+        """Sampling frequency in Hz.
+
+        :type: float
+        """
+        return self._stream.sample_rate
+
+    @property
+    def n_times(self) -> int:
+        """Number of samples in a full window.
+
+        :type: int
+        """
+        return self._n_times
+
+    @property
+    def n_min(self) -> int:
+        """Minimum number of samples in a provisional window.
+
+        :type: int
+        """
+        return self._n_min
+
+    @property
+    def n_new(self) -> int:
+        """Number of new samples in the last window retrieved.
+
+        :type: int
+        """
+        return self._n_new
+
+    @property
+    def quality(self) -> _StreamQuality:
+        """Data-quality counters of the stream.
+
+        :type: _StreamQuality
+        """
+        return self._quality
+
+    @property
+    def fill(self) -> float:
+        """Fill ratio of the buffer, between 0 and 1.
+
+        :type: float
+        """
+        return self._n_samples / self._n_times
+
+    @property
+    def is_full(self) -> bool:
+        """True once the buffer contains a full window.
+
+        :type: bool
+        """
+        return self._n_samples == self._n_times
+
+
+class _RingBuffer:
+    """Ring buffer of the samples of a stream and of their timestamps.
+
+    The samples are written twice, at 'idx' and at 'idx + size', thus the
+    latest samples are always contiguous in memory and the windows are
+    returned as views, without copy.
+
+    Parameters
+    ----------
+    size : int
+        Number of samples in the buffer.
+    n_channels : int
+        Number of channels.
+    """
+
+    def __init__(self, size: int, n_channels: int):
+        self._size = size
+        self._data = np.zeros((2 * size, n_channels))
+        self._timestamps = np.full(2 * size, -np.inf)
+        self._idx = 0  # position of the next sample
+        self._n_samples = 0
+
+    def push(self, data: NDArray[float], timestamps: NDArray[float]) -> None:
+        """Add samples to the buffer.
+
+        Parameters
+        ----------
+        data : array
+            2D array of shape (n_samples, n_channels).
+        timestamps : array
+            1D array of shape (n_samples,), in increasing order.
+        """
+        data = data[-self._size :]
+        timestamps = timestamps[-self._size :]
+        idx = (self._idx + np.arange(timestamps.size)) % self._size
+        for offset in (0, self._size):
+            self._data[idx + offset] = data
+            self._timestamps[idx + offset] = timestamps
+        self._idx = (self._idx + data.shape[0]) % self._size
+        self._n_samples = min(self._n_samples + data.shape[0], self._size)
+
+    def window(
+        self, tmax: float, n_times: int
+    ) -> Tuple[Optional[NDArray[float]], Optional[NDArray[float]]]:
+        """Get the window of the last samples acquired before 'tmax'.
+
+        Parameters
+        ----------
+        tmax : float
+            Timestamp of the end of the window, included.
+        n_times : int
+            Number of samples in the window.
+
+        Returns
+        -------
+        data : array | None
+            2D array of shape (n_times, n_channels). None if the buffer does
+            not contain 'n_times' samples before 'tmax'.
+        timestamps : array | None
+            1D array of shape (n_times,). None if the buffer does not contain
+            'n_times' samples before 'tmax'.
+        """
+        stop = self._idx + self._size
+        start = stop - self._n_samples
+        stop = start + np.searchsorted(
+            self._timestamps[start:stop], tmax, side="right"
+        )
+        if stop - start < n_times:
+            return None, None
+        return (
+            self._data[stop - n_times : stop],
+            self._timestamps[stop - n_times : stop],
+        )
+
+    # ------------------------------------------------------------------------
+    @property
+    def last_timestamp(self) -> float:
+        """Timestamp of the last sample, -inf if the buffer is empty.
+
+        :type: float
+        """
+        if self._n_samples == 0:
+            return -np.inf
+        return self._timestamps[self._idx + self._size - 1]
+
+    @property
+    def n_samples(self) -> int:
+        """Number of samples in the buffer.
+
+        :type: int
+        """
+        return self._n_samples
+
+
+class _MultiReceiver:
+    """Receiver of time-aligned windows from several streams.
+
+    The samples of each stream are pulled in a ring buffer with their LSL
+    timestamps, corrected for the clock offset of each stream, thus all the
+    timestamps are on the clock of this computer. The windows are extracted
+    on a common time grid: each frame ends at a multiple of 'step' and the
+    window of each stream contains the samples received up to this time.
+
+    Parameters
+    ----------
+    stream_names : list of str
+        Name of the LSL streams.
+    winsize : float
+        Duration of the acquisition window in seconds.
+    step : float
+        Interval between the end of two frames in seconds.
+    bufsize : float | None
+        Duration of the ring buffers in seconds. None to use twice the window
+        duration.
+    timeout : float
+        Maximum time to wait for each stream, in seconds.
+    """
+
+    def __init__(
+        self,
+        stream_names: List[str],
+        winsize: float,
+        step: float = 0.1,
+        bufsize: Optional[float] = None,
+        timeout: float = 10.0,
+    ):
+        from bsl.externals.pylsl import (
+            StreamInlet,
+            proc_clocksync,
+            proc_dejitter,
+            proc_monotonize,
+            resolve_byprop,
+        )
+
+        _check_type(winsize, ("numeric",), "winsize")
+        _check_type(step, ("numeric",), "step")
+        _check_type(bufsize, ("numeric", None), "bufsize")
+        for value, name in ((winsize, "winsize"), (step, "step")):
+            if value <= 0:
+                raise ValueError(
+                    f"The duration '{name}' must be a strictly positive "
+                    f"number. {value} is invalid."
+                )
+        bufsize = 2 * winsize if bufsize is None else bufsize
+        if bufsize < winsize:
+            raise ValueError(
+                "The buffer duration 'bufsize' must be longer than the "
+                "window duration 'winsize'."
+            )
+
+        self._stream_names = list(stream_names)
+        self._quality = list()
+        self._inlets = list()
+        self._buffers = list()
+        self._ch_names = list()
+        self._sfreqs = list()
+        self._n_times = list()
+        self._n_new = [0] * len(self._stream_names)
+        self._n_pending = [0] * len(self._stream_names)
+        for stream_name in self._stream_names:
+            streams = resolve_byprop("name", stream_name, 1, timeout)
+            if len(streams) == 0:
+                raise RuntimeError(
+                    f"The stream '{stream_name}' was not found."
+                )
+            inlet = StreamInlet(
+                streams[0],
+                processing_flags=proc_clocksync
+                | proc_dejitter
+                | proc_monotonize,
+            )
+            info = inlet.info()
+            sfreq = info.nominal_srate()
+            self._inlets.append(inlet)
+            self._sfreqs.append(sfreq)
+            self._ch_names.append(_get_ch_names(info))
+            self._n_times.append(int(round(winsize * sfreq)))
+            self._quality.append(_StreamQuality(stream_name, sfreq))
+            self._buffers.append(
+                _RingBuffer(int(round(bufsize * sfreq)), info.channel_count())
+            )
+        self._step = step
+        self._tmax = -np.inf
+
+    def acquire(self) -> None:
+        """Pull the new samples of each stream in its buffer."""
+        for k, (inlet, buffer, quality) in enumerate(
+            zip(self._inlets, self._buffers, self._quality)
+        ):
+            while True:
+                data, timestamps = inlet.pull_chunk(timeout=0.0)
+                if len(timestamps) == 0:
+                    break
+                timestamps = np.array(timestamps)
+                self._n_pending[k] += quality.update(timestamps)
+                buffer.push(np.array(data), timestamps)
+
+    def get_windows(
+        self,
+    ) -> Tuple[Optional[float], Optional[List[NDArray[float]]]]:
+        """Get the windows of the next frame of the time grid.
+
+        Returns
+        -------
+        tmax : float | None
+            Time of the end of the frame, on the clock of this computer. None
+            if a new frame is not available yet.
+        windows : list of array | None
+            2D arrays of shape (n_times, n_channels), one per stream. None if
+            a new frame is not available yet.
+        """
+        # the frame ends on the grid, before the last sample of each stream
+        last = min(buffer.last_timestamp for buffer in self._buffers)
+        if not np.isfinite(last):
+            return None, None
+        tmax = np.floor(last / self._step) * self._step
+        if tmax <= self._tmax:
+            return None, None
+        windows = list()
+        for buffer, n_times in zip(self._buffers, self._n_times):
+            data, _ = buffer.window(tmax, n_times)
+            if data is None:
+                return None, None
+            windows.append(data)
+        self._tmax = tmax
+        self._n_new = self._n_pending
+        self._n_pending = [0] * len(self._stream_names)
+        return tmax, windows
+
+    def time_to_next_frame(self) -> float:
+        """Time until the end of the next frame of the time grid.
+
+        Returns
+        -------
+        delay : float
+            Time in seconds until the end of the next frame on the clock of
+            this computer, between a tenth of 'step' and 'step'. The frame is
+            available once its samples are received, thus the delay is a
+            lower bound.
+        """
+        from bsl.externals.pylsl import local_clock
+
+        if np.isfinite(self._tmax):
+            delay = self._tmax + self._step - local_clock()
+        else:
+            delay = self._step
+        return min(max(delay, self._step / 10), self._step)
+
+    # ------------------------------------------------------------------------
+    @property
+    def stream_names(self) -> List[str]:
+        """Name of the streams.
+
+        :type: list of str
+        """
+        return self._stream_names
+
+    @property
+    def ch_names(self) -> List[List[str]]:
+        """Name of the channels of each stream.
+
+        :type: list of list of str
+        """
+        return self._ch_names
+
+    @property
+    def n_new(self) -> List[int]:
+        """Number of new samples of each stream in the last frame.
+
+        The samples acquired since the previous frame are counted, i.e. the
+        samples of all the acquisitions which did not complete a frame.
+
+        :type: list of int
+        """
+        return self._n_new
+
+    @property
+    def quality(self) -> List[_StreamQuality]:
+        """Data-quality counters of each stream.
+
+        :type: list of _StreamQuality
+        """
+        return self._quality
+
+    @property
+    def sfreqs(self) -> List[float]:
+        """Sampling frequency of each stream in Hz.
+
+        :type: list of float
+        """
+        return self._sfreqs
+
+    @property
+    def n_times(self) -> List[int]:
+        """Number of samples in the window of each stream.
+
+        :type: list of int
+        """
+        return self._n_times
+
+
+def _get_ch_names(info) -> List[str]:
+    """Get the channel names from the description of a stream."""
+    channel = info.desc().child("channels").child("channel")
+    ch_names = list()
+    for k in range(info.channel_count()):
+        label = channel.child_value("label")
+        ch_names.append(label if label != "" else str(k))
+        channel = channel.next_sibling()
+    return ch_names
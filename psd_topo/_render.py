@@ -0,0 +1,400 @@
+"""Render topographic maps with precomputed geometry and colormap LUT.
+
+The interpolation of the channel values on the image grid, performed by
+``mne.viz.plot_topomap``, is linear in the channel values. Thus, it is
+precomputed once as a matrix of shape (n_pixels, n_channels) and each frame
+only requires a matrix-vector product, a quantization and a lookup in a
+precomputed uint8 RGBA colormap table.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from matplotlib import colormaps
+from mne import Info
+from mne.utils.check import _check_sphere
+from mne.viz.topomap import (
+    _check_extrapolate,
+    _find_topomap_coords,
+    _make_head_outlines,
+    _setup_interp,
+)
+from numpy.typing import NDArray
+from scipy.interpolate import CloughTocher2DInterpolator
+
+from ._geometry_cache import _get_key, _read_geometry, _write_geometry
+
+# number of colors in the lookup table, the last entry is transparent
+_N_COLORS = 256
+# resolutions of the cubic rendering used by the adaptive resolution
+_RESOLUTIONS = (128, 96, 64, 48, 32)
+
+
+def _load_geometry(
+    info: Info, res: int, image_interp: str = "cubic", margin: int = 2
+) -> Dict[str, NDArray]:
+    """Load the geometry of a topomap from the cache, or compute it.
+
+    The geometry is cached on disk, keyed by the channels, their position and
+    the rendering parameters, see ``psd_topo._geometry_cache``. The
+    parameters are described in ``_compute_geometry``.
+    """
+    key = _get_key(info, res, image_interp, margin)
+    geometry = _read_geometry(key)
+    if geometry is None:
+        geometry = _compute_geometry(info, res, image_interp, margin)
+        _write_geometry(key, geometry)
+    return geometry
+
+
+def _compute_geometry(
+    info: Info, res: int, image_interp: str = "cubic", margin: int = 2
+) -> Dict[str, NDArray]:
+    """Compute the interpolation matrix and the head mask of a topomap.
+
+    The geometry matches the one of ``mne.viz.plot_topomap`` with
+    ``outlines="head"``, ``extrapolate="auto"`` and ``border="mean"``.
+
+    Parameters
+    ----------
+    info : Info
+        MNE Info instance with a montage.
+    res : int
+        Resolution of the image, in pixels per side.
+    image_interp : str
+        "cubic" for the Clough-Tocher interpolation of MNE or "nearest" for
+        the nearest channel (Voronoi) rendering.
+    margin : int
+        Number of pixels kept outside of the head, for backends which clip the
+        image with the head outline after a smooth interpolation.
+
+    Returns
+    -------
+    geometry : dict
+        Dictionary with the keys:
+
+        * 'interpolation': 2D array of shape (n_pixels, n_channels) mapping
+          the channel values to the pixels within the head, None for the
+          nearest rendering.
+        * 'nearest': 1D array of shape (n_pixels,) containing the index of
+          the nearest channel of each pixel within the head, None for the
+          cubic rendering.
+        * 'mask': 1D array of shape (n_pixels,) containing the flat index of
+          the pixels within the head in the (res, res) image.
+        * 'extent': the image extent (xmin, xmax, ymin, ymax).
+        * 'pos': 2D array of shape (n_channels, 2) containing the position of
+          the channels.
+        * 'outlines': the outlines of the head to draw.
+        * 'clip_origin', 'clip_radius': the ellipse clipping the image.
+    """
+    sphere = _check_sphere(None, info)
+    picks = list(range(len(info["ch_names"])))
+    pos = _find_topomap_coords(info, picks=picks, sphere=sphere)[:, :2]
+    outlines = _make_head_outlines(sphere, pos, "head", (0.0, 0.0))
+    extrapolate = _check_extrapolate("auto", "eeg")
+    extent, Xi, Yi, interp = _setup_interp(
+        pos, res, "cubic", extrapolate, outlines, "mean"
+    )
+
+    if image_interp == "cubic":
+        interpolation = _cubic_interpolation(pos, Xi, Yi, interp)
+    else:
+        interpolation = None
+
+    # keep the pixels within the head and the margin
+    clip_origin = outlines["clip_origin"]
+    clip_radius = np.array(outlines["clip_radius"])
+    pixel = np.array([extent[1] - extent[0], extent[3] - extent[2]]) / res
+    radius = clip_radius + margin * pixel
+    inside = (
+        ((Xi.ravel() - clip_origin[0]) / radius[0]) ** 2
+        + ((Yi.ravel() - clip_origin[1]) / radius[1]) ** 2
+    ) <= 1
+    if interpolation is not None:
+        inside &= np.all(np.isfinite(interpolation), axis=1)
+        interpolation = np.ascontiguousarray(interpolation[inside])
+        nearest = None
+    else:
+        pixels = np.c_[Xi.ravel()[inside], Yi.ravel()[inside]]
+        distances = np.linalg.norm(
+            pixels[:, np.newaxis] - pos[np.newaxis], axis=-1
+        )
+        nearest = np.argmin(distances, axis=1)
+    mask = np.flatnonzero(inside)
+    outlines = {
+        key: value
+        for key, value in outlines.items()
+        if key != "patch" and "mask" not in key and "clip" not in key
+    }
+    return dict(
+        interpolation=interpolation,
+        nearest=nearest,
+        mask=mask,
+        extent=np.array(extent),
+        pos=pos,
+        outlines=outlines,
+        clip_origin=np.array(clip_origin),
+        clip_radius=clip_radius,
+    )
+
+
+def _cubic_interpolation(
+    pos: NDArray[float], Xi: NDArray[float], Yi: NDArray[float], interp
+) -> NDArray[float]:
+    """Compute the cubic interpolation matrix of shape (res**2, n_channels).
+
+    The values of the extra points added around the head are the linear
+    combinations of the channel values given by ``_GridData.set_values`` with
+    ``border="mean"``. Then, each channel basis vector is interpolated on the
+    grid at once.
+    """
+    n_channels = pos.shape[0]
+    extra = np.zeros((interp.n_extra, n_channels))
+    indices, indptr = interp.tri.vertex_neighbor_vertices
+    used = np.zeros(interp.n_extra, dtype=bool)
+    for k in range(interp.n_extra):
+        neighbors = indptr[
+            indices[n_channels + k] : indices[n_channels + k + 1]
+        ]
+        neighbors = neighbors[neighbors < n_channels]
+        if len(neighbors) != 0:
+            used[k] = True
+            extra[k, neighbors] = 1.0 / len(neighbors)
+    if not used.all() and used.any():
+        extra[~used] = np.mean(extra[used], axis=0)
+    values = np.vstack((np.eye(n_channels), extra))
+
+    interpolator = CloughTocher2DInterpolator(interp.tri, values)
+    return interpolator(Xi.ravel(), Yi.ravel())
+
+
+def _make_lut(cmap: str) -> NDArray[np.uint8]:
+    """Create the uint8 RGBA lookup table of a matplotlib colormap.
+
+    The table has _N_COLORS + 1 entries, the last one is transparent and used
+    for the pixels outside of the head.
+    """
+    lut = np.zeros((_N_COLORS + 1, 4), dtype=np.uint8)
+    colors = colormaps[cmap](np.linspace(0, 1, _N_COLORS))
+    lut[:-1] = np.round(colors * 255)
+    return lut
+
+
+class _LUTRenderer:
+    """Render a topographic map into a preallocated RGBA image.
+
+    Parameters
+    ----------
+    info : Info
+        MNE Info instance with a montage.
+    cmap : str
+        The matplotlib color map name.
+    res : int
+        Resolution of the image, in pixels per side.
+    image_interp : str
+        "cubic" for the Clough-Tocher interpolation of MNE or "nearest" for
+        the nearest channel (Voronoi) rendering.
+    margin : int
+        Number of pixels rendered outside of the head.
+    """
+
+    def __init__(
+        self,
+        info: Info,
+        cmap: str,
+        res: int = 64,
+        image_interp: str = "cubic",
+        margin: int = 2,
+    ):
+        geometry = _load_geometry(info, res, image_interp, margin)
+        self._interpolation = geometry["interpolation"]
+        self._nearest = geometry["nearest"]
+        self._mask = geometry["mask"]
+        self._extent = tuple(geometry["extent"])
+        self._outlines = geometry["outlines"]
+        self._clip = (geometry["clip_origin"], geometry["clip_radius"])
+        self._res = res
+        self._image_interp = image_interp
+        self._lut = _make_lut(cmap)
+        # preallocated buffers, the pixels outside of the head are baked as
+        # the transparent entry of the LUT
+        self._values = np.empty(self._mask.size)
+        self._indices = np.full(res * res, _N_COLORS, dtype=np.intp)
+        self._pixels = np.empty(self._mask.size, dtype=np.intp)
+        self._invalid = np.empty(self._mask.size, dtype=bool)
+        self._image = np.zeros((res, res, 4), dtype=np.uint8)
+
+    def render(
+        self, topodata: NDArray[float], vmin: float, vmax: float
+    ) -> NDArray[np.uint8]:
+        """Render the topographic map.
+
+        Parameters
+        ----------
+        topodata : array
+            1D array of shape (n_channels,) containing the values to plot.
+        vmin : float
+            Value mapped to the first color of the colormap.
+        vmax : float
+            Value mapped to the last color of the colormap.
+
+        Returns
+        -------
+        image : array
+            3D array of shape (res, res, 4) containing the RGBA image, with the
+            origin in the lower left corner. The array is a buffer overwritten
+            by the next call.
+        """
+        if self._nearest is not None:
+            values = np.take(topodata, self._nearest, out=self._values)
+        else:
+            values = np.matmul(self._interpolation, topodata, out=self._values)
+        # non-finite values, e.g. the log-power of a flat channel, are mapped
+        # to the transparent entry of the LUT
+        np.isfinite(values, out=self._invalid)
+        np.logical_not(self._invalid, out=self._invalid)
+        if np.isfinite(vmin) and np.isfinite(vmax) and vmin < vmax:
+            scale = (_N_COLORS - 1) / (vmax - vmin)
+        else:
+            vmin, scale = 0.0, 0.0
+        with np.errstate(invalid="ignore"):
+            values -= vmin
+            values *= scale
+            np.clip(values, 0, _N_COLORS - 1, out=values)
+        np.copyto(values, _N_COLORS, where=self._invalid)
+        np.copyto(self._pixels, values, casting="unsafe")
+        self._indices[self._mask] = self._pixels
+        np.take(
+            self._lut, self._indices, axis=0, out=self._image.reshape(-1, 4)
+        )
+        return self._image
+
+    # ------------------------------------------------------------------------
+    @property
+    def extent(self) -> Tuple[float, float, float, float]:
+        """Extent of the image (xmin, xmax, ymin, ymax)."""
+        return self._extent
+
+    @property
+    def clip(self) -> Tuple[NDArray[float], NDArray[float]]:
+        """Origin and radius of the ellipse clipping the image."""
+        return self._clip
+
+    @property
+    def outlines(self) -> dict:
+        """Outlines of the head to draw."""
+        return self._outlines
+
+    @property
+    def image_interp(self) -> str:
+        """Interpolation method, "cubic" or "nearest"."""
+        return self._image_interp
+
+    @property
+    def res(self) -> int:
+        """Resolution of the image, in pixels per side."""
+        return self._res
+
+
+class _AdaptiveResolution:
+    """Select the rendering level from the measured frame time.
+
+    The levels are ordered from the most to the least expensive. The frame
+    time is smoothed with an exponential moving average. When it exceeds the
+    budget ``1 / target_fps``, the next cheaper level is selected. When it is
+    below half of the budget, the previous more expensive level is selected.
+    After a switch, the frame time of the new level is measured for
+    'n_frames' frames before the next switch. If a more expensive level is
+    immediately abandoned, the number of frames waited before trying it again
+    is doubled to avoid oscillating between two levels.
+
+    Parameters
+    ----------
+    target_fps : float
+        Target number of frames per second.
+    levels : list of tuple
+        Rendering levels as (image_interp, res), from the most to the least
+        expensive.
+    level : int
+        Index of the initial level.
+    n_frames : int
+        Number of frames measured before a switch.
+    """
+
+    def __init__(
+        self,
+        target_fps: float,
+        levels: List[Tuple[str, int]],
+        level: int,
+        n_frames: int = 20,
+    ):
+        self._target_fps = target_fps
+        self._budget = 1.0 / target_fps
+        self._levels = levels
+        self._level = level
+        self._n_frames = n_frames
+        self._n_frames_up = n_frames
+        self._last_switch_up = False
+        self._count = 0
+        self._frame_time = None
+
+    def step(self, frame_time: float) -> Optional[int]:
+        """Add a frame time measurement.
+
+        Parameters
+        ----------
+        frame_time : float
+            Duration of the last frame in seconds.
+
+        Returns
+        -------
+        level : int | None
+            Index of the new level if the level should be switched, else None.
+        """
+        self._frame_time = (
+            frame_time
+            if self._count == 0
+            else 0.9 * self._frame_time + 0.1 * frame_time
+        )
+        self._count += 1
+        if self._count < self._n_frames:
+            return None
+        if self._budget < self._frame_time:
+            if self._level == len(self._levels) - 1:
+                return None
+            if self._last_switch_up and self._count == self._n_frames:
+                self._n_frames_up = min(
+                    2 * self._n_frames_up, 64 * self._n_frames
+                )
+            self._last_switch_up = False
+            self._level += 1
+        elif (
+            self._frame_time < 0.5 * self._budget
+            and self._n_frames_up <= self._count
+            and self._level != 0
+        ):
+            self._last_switch_up = True
+            self._level -= 1
+        else:
+            return None
+        self._count = 0
+        return self._level
+
+    # ------------------------------------------------------------------------
+    @property
+    def frame_time(self) -> Optional[float]:
+        """Smoothed frame time in seconds.
+
+        Right after a switch, the frame time is the one of the previous level.
+        """
+        return self._frame_time
+
+    @property
+    def target_fps(self) -> float:
+        """Target number of frames per second."""
+        return self._target_fps
+
+    @property
+    def level(self) -> int:
+        """Index of the current level."""
+        return self._level
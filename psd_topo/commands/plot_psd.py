@@ -1,8 +1,6 @@
 import argparse
 
 from psd_topo import set_log_level
-from psd_topo.io import read_raw_xdf
-from psd_topo.psd import plot_psd
 
 
 def run():
@@ -24,6 +22,10 @@ def run():
     verbose = "DEBUG" if args.verbose else "INFO"
     set_log_level(verbose)
 
+    # mne and matplotlib are imported after the arguments are parsed
+    from psd_topo.io import read_raw_xdf
+    from psd_topo.psd import plot_psd
+
     raws, streams = read_raw_xdf(args.fname)
     fig, ax = plot_psd(
         raws,
@@ -1,7 +1,7 @@
 import argparse
-import multiprocessing as mp
 
-from psd_topo import nfb, set_log_level
+from psd_topo import nfb, nfb_sync, set_log_level
+from psd_topo._launcher import _launch, _Supervisor
 from psd_topo.utils import search_amplifiers
 
 
@@ -45,6 +45,36 @@ def run():
         nargs=2,
         help="figure size for the matplotlib backend",
     )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        choices=("matplotlib", "pyqtgraph"),
+        help="backend used to display the topographic map",
+        default="matplotlib",
+    )
+    parser.add_argument(
+        "--target-fps",
+        type=float,
+        metavar="float",
+        help="frame rate sustained by adapting the resolution of the map",
+    )
+    parser.add_argument(
+        "--sync",
+        help="process the amplifiers in one process on time-aligned windows",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="int",
+        help="serve the metrics as JSON on http://127.0.0.1:<port>/metrics",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        metavar="path",
+        help="append the metrics as JSON lines to a file",
+    )
     parser.add_argument(
         "--verbose", help="enable debug logs", action="store_true"
     )
@@ -54,25 +84,57 @@ def run():
     verbose = "DEBUG" if args.verbose else "INFO"
     set_log_level(verbose)
 
-    # start individual processes
-    print("\n>> Press ENTER to stop.\n")
-    stream_names = search_amplifiers(args.n)
-    processes = list()
-    for stream_name in stream_names:
-        process = mp.Process(
-            target=nfb,
-            args=(
-                stream_name,
-                (args.fmin, args.fmax),
-                args.winsize,
-                args.figsize,
-                verbose,
+    # export the metrics of the online loops
+    metrics = None
+    if args.metrics_port is not None or args.metrics_file is not None:
+        metrics = dict(port=args.metrics_port, fname=args.metrics_file)
+
+    if args.sync:
+        # start one process for all the amplifiers
+        print("\n>> Press ENTER to stop.\n")
+        processes, _ = _launch(
+            nfb_sync,
+            [
+                (
+                    search_amplifiers(args.n),
+                    (args.fmin, args.fmax),
+                    args.winsize,
+                    args.figsize,
+                )
+            ],
+            kwargs=dict(
+                backend=args.backend,
+                target_fps=args.target_fps,
+                metrics=metrics,
+                verbose=verbose,
             ),
         )
-        process.start()
-        processes.append(process)
+        input()
+        for process in processes:
+            process.kill()
+        return
+
+    # start one process per amplifier, attached as soon as the amplifier is
+    # found and restarted if the amplifier reconnects
+    print("\n>> Press ENTER to stop.\n")
+    supervisor = _Supervisor(
+        nfb,
+        lambda stream_name: (
+            stream_name,
+            (args.fmin, args.fmax),
+            args.winsize,
+            args.figsize,
+        ),
+        kwargs=dict(
+            backend=args.backend,
+            target_fps=args.target_fps,
+            metrics=metrics,
+            verbose=verbose,
+        ),
+        n=args.n,
+    )
+    supervisor.start()
 
     # stop
     input()
-    for process in processes:
-        process.kill()
+    supervisor.stop()
@@ -1,7 +1,5 @@
 import argparse
 
-from bsl.triggers import LSLTrigger
-
 from psd_topo import set_log_level
 from psd_topo.config import load_config, load_triggers
 
@@ -20,6 +18,9 @@ def run():
     verbose = "DEBUG" if args.verbose else "INFO"
     set_log_level(verbose)
 
+    # bsl is imported after the arguments are parsed
+    from bsl.triggers import LSLTrigger
+
     # set trigger
     _, trigger_stream_name = load_config()
     trigger = LSLTrigger(trigger_stream_name, verbose=True)
@@ -1,7 +1,7 @@
 import argparse
-import multiprocessing as mp
 
 from psd_topo import set_log_level, weather_map
+from psd_topo._launcher import _launch
 
 
 def run():
@@ -43,6 +43,31 @@ def run():
         nargs=2,
         help="figure size for the matplotlib backend",
     )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        choices=("matplotlib", "pyqtgraph"),
+        help="backend used to display the topographic map",
+        default="matplotlib",
+    )
+    parser.add_argument(
+        "--target-fps",
+        type=float,
+        metavar="float",
+        help="frame rate sustained by adapting the resolution of the map",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="int",
+        help="serve the metrics as JSON on http://127.0.0.1:<port>/metrics",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        metavar="path",
+        help="append the metrics as JSON lines to a file",
+    )
     parser.add_argument(
         "--verbose", help="enable debug logs", action="store_true"
     )
@@ -52,19 +77,24 @@ def run():
     verbose = "DEBUG" if args.verbose else "INFO"
     set_log_level(verbose)
 
+    # export the metrics of the online loops
+    metrics = None
+    if args.metrics_port is not None or args.metrics_file is not None:
+        metrics = dict(port=args.metrics_port, fname=args.metrics_file)
+
     # start individual processes
     print("\n>> Press ENTER to stop.\n")
-    process = mp.Process(
-        target=weather_map,
-        args=(
-            args.stream,
-            (args.fmin, args.fmax),
-            args.winsize,
-            args.figsize,
-            verbose,
+    processes, _ = _launch(
+        weather_map,
+        [(args.stream, (args.fmin, args.fmax), args.winsize, args.figsize)],
+        kwargs=dict(
+            backend=args.backend,
+            target_fps=args.target_fps,
+            metrics=metrics,
+            verbose=verbose,
         ),
     )
-    process.start()
     # stop
     input()
-    process.kill()
+    for process in processes:
+        process.kill()
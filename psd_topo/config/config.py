@@ -1,20 +1,45 @@
+import os
 from configparser import ConfigParser
+from copy import deepcopy
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Callable, Dict, List, Tuple
 
-from bsl.triggers import TriggerDef
+from ..utils._logs import logger
+
+# memoized configurations, indexed by file name, with the signature of the
+# files they were read from
+_cache: Dict[str, Tuple[Tuple[Tuple[str, int, int], ...], Any]] = dict()
 
 
 def load_triggers():
     """Load triggers from triggers.ini into a TriggerDef instance.
 
+    The triggers are read from the file ``triggers.ini`` of the package,
+    overridden by the file ``psd_topo/triggers.ini`` in the user configuration
+    directory and by the file set in the environment variable
+    ``PSD_TOPO_TRIGGERS``. The trigger definition is parsed once and reused as
+    long as the files are not modified. A copy is returned, thus it can be
+    modified without altering the memoized definition.
+
     Returns
     -------
     tdef : TriggerDef
         Trigger definitiopn containing: eye_open, eye_close and lecture.
     """
-    directory = Path(__file__).parent
-    tdef = TriggerDef(directory / "triggers.ini")
+    files = _get_files("triggers.ini", "PSD_TOPO_TRIGGERS")
+    return deepcopy(_memoize("triggers.ini", files, _read_triggers))
+
+
+def _read_triggers(files: List[Path]):
+    """Parse the trigger files into a TriggerDef instance."""
+    from bsl.triggers import TriggerDef
+
+    config = _read_ini(files)
+    if not config.has_section("events"):
+        raise ValueError("Key 'events' is missing from trigger definition.")
+    tdef = TriggerDef()
+    for name, value in config["events"].items():
+        tdef.add(name, int(value), overwrite=True)
 
     keys = (
         "eye_open",
@@ -33,6 +58,14 @@ def load_triggers():
 def load_config() -> Tuple[str, str]:
     """Load config from config.ini.
 
+    The configuration is read from the file ``config.ini`` of the package,
+    overridden by the file ``psd_topo/config.ini`` in the user configuration
+    directory and by the file set in the environment variable
+    ``PSD_TOPO_CONFIG``. The files are parsed once and reused as long as they
+    are not modified. Finally, the environment variables
+    ``PSD_TOPO_AMPLIFIER_PREFIX`` and ``PSD_TOPO_TRIGGER_STREAM_NAME``
+    override the values of the files.
+
     Returns
     -------
     amplifier_prefix : str
@@ -40,10 +73,22 @@ def load_config() -> Tuple[str, str]:
     trigger_stream_name : str
         Name of the LSL outlet of the software trigger.
     """
-    directory = Path(__file__).parent
-    config = ConfigParser(inline_comment_prefixes=("#", ";"))
-    config.optionxform = str
-    config.read(str(directory / "config.ini"))
+    files = _get_files("config.ini", "PSD_TOPO_CONFIG")
+    amplifier_prefix, trigger_stream_name = _memoize(
+        "config.ini", files, _read_config
+    )
+    amplifier_prefix = os.environ.get(
+        "PSD_TOPO_AMPLIFIER_PREFIX", amplifier_prefix
+    )
+    trigger_stream_name = os.environ.get(
+        "PSD_TOPO_TRIGGER_STREAM_NAME", trigger_stream_name
+    )
+    return amplifier_prefix, trigger_stream_name
+
+
+def _read_config(files: List[Path]) -> Tuple[str, str]:
+    """Parse the configuration files."""
+    config = _read_ini(files)
 
     keys = ("amplifier", "trigger")
     for key in keys:
@@ -54,3 +99,71 @@ def load_config() -> Tuple[str, str]:
     trigger_stream_name = config["trigger"]["stream_name"]
 
     return amplifier_prefix, trigger_stream_name
+
+
+def _get_config_directory() -> Path:
+    """Get the user configuration directory."""
+    root = os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config")
+    return Path(root).expanduser() / "psd_topo"
+
+
+def _get_files(fname: str, env: str) -> List[Path]:
+    """Get the files to read, by increasing priority.
+
+    Parameters
+    ----------
+    fname : str
+        Name of the file in the package and in the user configuration
+        directory.
+    env : str
+        Environment variable which can be set to the path of an additional
+        file.
+
+    Returns
+    -------
+    files : list of Path
+        The file of the package, followed by the existing user files.
+    """
+    files = [Path(__file__).parent / fname]
+    user = _get_config_directory() / fname
+    if user.exists():
+        files.append(user)
+    fname = os.environ.get(env)
+    if fname is not None:
+        fname = Path(fname).expanduser()
+        if not fname.exists():
+            raise FileNotFoundError(
+                f"The file '{fname}' set in the environment variable '{env}' "
+                "does not exist."
+            )
+        files.append(fname)
+    return files
+
+
+def _memoize(key: str, files: List[Path], read: Callable[[List[Path]], Any]):
+    """Read the files or return the cached result if they did not change.
+
+    The signature of the files is the path, the modification time and the
+    size of each file.
+    """
+    signature = list()
+    for file in files:
+        stat = file.stat()
+        signature.append((str(file), stat.st_mtime_ns, stat.st_size))
+    signature = tuple(signature)
+    if key in _cache and _cache[key][0] == signature:
+        return _cache[key][1]
+    logger.debug(
+        "Config: reading %s.", ", ".join(f"'{file}'" for file in files)
+    )
+    value = read(files)
+    _cache[key] = (signature, value)
+    return value
+
+
+def _read_ini(files: List[Path]) -> ConfigParser:
+    """Read the files into a single configuration, the last file wins."""
+    config = ConfigParser(inline_comment_prefixes=("#", ";"))
+    config.optionxform = str
+    config.read([str(file) for file in files])
+    return config
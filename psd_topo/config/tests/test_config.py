@@ -0,0 +1,88 @@
+"""Test config.py"""
+
+import os
+
+import pytest
+
+from .. import config as config_module
+from ..config import load_config, load_triggers
+
+
+def test_load_config(tmp_path, monkeypatch):
+    """Test the loading of the configuration and its overrides."""
+    assert load_config() == ("WS-", "PSD-markers")
+
+    # user configuration directory
+    directory = tmp_path / "config" / "psd_topo"
+    directory.mkdir(parents=True)
+    with open(directory / "config.ini", "w") as file:
+        file.write("[amplifier]\nprefix = eego-  # comment\n")
+    assert load_config() == ("eego-", "PSD-markers")
+
+    # file set in the environment
+    fname = tmp_path / "override.ini"
+    with open(fname, "w") as file:
+        file.write("[trigger]\nstream_name = markers\n")
+    monkeypatch.setenv("PSD_TOPO_CONFIG", str(fname))
+    assert load_config() == ("eego-", "markers")
+
+    # environment variables
+    monkeypatch.setenv("PSD_TOPO_AMPLIFIER_PREFIX", "AMP-")
+    monkeypatch.setenv("PSD_TOPO_TRIGGER_STREAM_NAME", "triggers")
+    assert load_config() == ("AMP-", "triggers")
+
+    monkeypatch.setenv("PSD_TOPO_CONFIG", str(tmp_path / "missing.ini"))
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        load_config()
+
+
+def test_load_config_cache(tmp_path, monkeypatch):
+    """Test that the configuration is parsed again only if modified."""
+    calls = list()
+    read_config = config_module._read_config
+
+    def _read_config(files):
+        calls.append(files)
+        return read_config(files)
+
+    monkeypatch.setattr(config_module, "_read_config", _read_config)
+    monkeypatch.setattr(config_module, "_cache", dict())
+    load_config()
+    load_config()
+    assert len(calls) == 1
+
+    fname = tmp_path / "override.ini"
+    with open(fname, "w") as file:
+        file.write("[amplifier]\nprefix = eego-\n")
+    monkeypatch.setenv("PSD_TOPO_CONFIG", str(fname))
+    assert load_config()[0] == "eego-"
+    assert load_config()[0] == "eego-"
+    assert len(calls) == 2
+
+    # modification of the file
+    with open(fname, "w") as file:
+        file.write("[amplifier]\nprefix = AMP-\n")
+    stat = fname.stat()
+    os.utime(fname, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_config()[0] == "AMP-"
+    assert len(calls) == 3
+
+
+def test_load_triggers(tmp_path, monkeypatch):
+    """Test the loading of the trigger definition and its overrides."""
+    tdef = load_triggers()
+    assert (tdef.eye_open, tdef.eye_close, tdef.lecture) == (1, 2, 3)
+    # the memoized definition is not altered by the caller
+    tdef.add("rest", 5)
+    tdef2 = load_triggers()
+    assert tdef2 is not tdef
+    assert not hasattr(tdef2, "rest")
+    assert tdef2.by_name == dict(eye_open=1, eye_close=2, lecture=3)
+
+    fname = tmp_path / "triggers.ini"
+    with open(fname, "w") as file:
+        file.write("[events]\nlecture = 4\nrest = 5\n")
+    monkeypatch.setenv("PSD_TOPO_TRIGGERS", str(fname))
+    tdef = load_triggers()
+    assert (tdef.eye_open, tdef.eye_close, tdef.lecture) == (1, 2, 4)
+    assert tdef.rest == 5
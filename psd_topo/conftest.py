@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from mne import create_info
+
+
+@pytest.fixture(autouse=True)
+def geometry_cache(tmp_path_factory, monkeypatch):
+    """Store the topomap geometries in a temporary cache directory."""
+    directory = tmp_path_factory.getbasetemp() / "geometry"
+    monkeypatch.setenv("PSD_TOPO_CACHE", str(directory))
+
+
+@pytest.fixture(autouse=True)
+def user_config(tmp_path, monkeypatch):
+    """Ignore the configuration files and variables of the user."""
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    for env in (
+        "PSD_TOPO_CONFIG",
+        "PSD_TOPO_TRIGGERS",
+        "PSD_TOPO_AMPLIFIER_PREFIX",
+        "PSD_TOPO_TRIGGER_STREAM_NAME",
+    ):
+        monkeypatch.delenv(env, raising=False)
+
+
+@pytest.fixture(scope="session")
+def ch_names():
+    """Names of the EEG channels of the test info."""
+    return ["Fp1", "Fp2", "F3", "Fz", "F4", "C3", "Cz", "C4", "O1", "O2"]
+
+
+@pytest.fixture(scope="session")
+def info(ch_names):
+    """Create an info with a montage, sampled at 300 Hz."""
+    info = create_info(ch_names, 300, "eeg")
+    info.set_montage("standard_1020")
+    return info
+
+
+@pytest.fixture
+def data(ch_names):
+    """Create one second of random data (n_channels, n_times) for the info."""
+    return np.random.default_rng(101).normal(size=(len(ch_names), 300))
@@ -1,4 +1,5 @@
-from typing import Tuple
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 import numpy as np
 from numpy.typing import NDArray
@@ -34,26 +35,152 @@ def fft(data: NDArray[float], fs: float, band: Tuple[float, float], dB: bool):
             "(n_channels, n_times)."
         )
     _check_type(fs, ("numeric",), "fs")
-    if 0 <= fs:
+    if fs <= 0:
         raise ValueError(
             "The sampling frequency 'fs' must be strictly positive."
         )
-    _check_band(band)
+    band = _check_band(band)
     _check_type(dB, (bool,), "dB")
     return _fft(data, fs, band, dB)
 
 
 @copy_doc(fft)
-def _fft(data: NDArray[float], fs: float, band: Tuple[float, float], dB: bool):
-    winsize = data.shape[-1]
+def _fft(
+    data: NDArray[float],
+    fs: float,
+    band: Tuple[float, float],
+    dB: bool,
+    operator: Optional[NDArray[float]] = None,
+    normalize: bool = False,
+):
     # multiply the data with a window
-    window = np.hamming(winsize)
+    window, band_idx, scale = _fft_setup(data.shape[-1], fs, band)
     data = data * window
     # retrieve fft
-    frequencies = np.fft.rfftfreq(winsize, 1 / fs)
-    band_idx = np.where((band[0] <= frequencies) & (frequencies <= band[1]))[0]
-    fftval = np.abs(np.fft.rfft(data, axis=-1)[:, band_idx])
+    spectrum = np.fft.rfft(data, axis=-1)[..., band_idx]
+    return _band_power(spectrum, operator, scale, dB, normalize)
+
+
+def _band_power(
+    spectrum: NDArray[complex],
+    operator: Optional[NDArray[float]],
+    scale: float,
+    dB: bool,
+    normalize: bool,
+) -> NDArray[float]:
+    """Average the power of the frequency bins of the band."""
+    if operator is not None:
+        # linear spatial operators commute with the FFT, thus they can be
+        # applied on the frequency bins of the band instead of the samples
+        spectrum = operator @ spectrum
+    fftval = np.abs(spectrum)
     fftval = np.power(fftval, 2)
-    fftval = np.average(fftval, axis=1)
+    fftval = np.average(fftval, axis=-1)
+    if normalize:
+        # power spectral density, independent of the number of samples, thus
+        # comparable between windows of different durations
+        fftval *= scale
     fftval = 10 * np.log10(fftval) if dB else fftval
     return fftval
+
+
+@lru_cache(maxsize=32)
+def _fft_setup(
+    winsize: int, fs: float, band: Tuple[float, float]
+) -> Tuple[NDArray[float], NDArray[int], float]:
+    """Compute the hamming window, the band indices and the density scale.
+
+    The scale converts the power of the windowed signal to a power spectral
+    density.
+
+    The result is cached as it only depends on the window size, the sampling
+    frequency and the frequency band, which are fixed in the online loops once
+    the buffer is full.
+    """
+    window = np.hamming(winsize)
+    frequencies = np.fft.rfftfreq(winsize, 1 / fs)
+    band_idx = np.where((band[0] <= frequencies) & (frequencies <= band[1]))[0]
+    scale = 1.0 / (fs * np.sum(window**2))
+    window.flags.writeable = False
+    band_idx.flags.writeable = False
+    return window, band_idx, scale
+
+
+@lru_cache(maxsize=8)
+def _dft_setup(
+    winsize: int, fs: float, band: Tuple[float, float]
+) -> NDArray[float]:
+    """Compute the DFT matrix of the frequency bins of the band.
+
+    The hamming window is folded in the matrix of shape (n_times, 2 * n_bins)
+    which contains the real parts of the DFT coefficients followed by their
+    imaginary parts.
+    """
+    window, band_idx, _ = _fft_setup(winsize, fs, band)
+    times = np.arange(winsize)
+    coefs = np.exp(-2j * np.pi * np.outer(times, band_idx) / winsize)
+    coefs *= window[:, np.newaxis]
+    matrix = np.ascontiguousarray(np.hstack((coefs.real, coefs.imag)))
+    matrix.flags.writeable = False
+    return matrix
+
+
+@fill_doc
+def _fft_batch(
+    data: List[NDArray[float]],
+    fs: List[float],
+    band: Tuple[float, float],
+    dB: bool,
+    operators: Optional[List[NDArray[float]]] = None,
+    normalize: bool = False,
+) -> List[NDArray[float]]:
+    """Apply _fft to the windows of several streams at once.
+
+    Only the frequency bins of the band are needed, thus the windows with the
+    same number of samples and sampling frequency as the first window are
+    stacked and their band-limited DFT is computed with a single matrix
+    product. Other windows are processed one by one with _fft.
+
+    Parameters
+    ----------
+    data : list of array
+        2D arrays of shape (n_channels, n_times), one per stream.
+    fs : list of float
+        Sampling frequency of each stream in Hz.
+    %(band)s
+    dB : bool
+        If True, the fftval are converted to dB with 10 * np.log10(fftval).
+    operators : list of array | None
+        Spatial operator of each stream, see ``_fft``.
+    normalize : bool
+        If True, the power is converted to a power spectral density.
+
+    Returns
+    -------
+    fftval : list of array
+        1D arrays of shape (n_channels, ), one per stream.
+    """
+    operators = [None] * len(data) if operators is None else operators
+    n_times = data[0].shape[-1]
+    batch = [
+        k
+        for k in range(len(data))
+        if data[k].shape[-1] == n_times and fs[k] == fs[0]
+    ]
+    matrix = _dft_setup(n_times, fs[0], band)
+    _, _, scale = _fft_setup(n_times, fs[0], band)
+    n_bins = matrix.shape[1] // 2
+    # (n_channels_total, n_times) @ (n_times, 2 * n_bins)
+    product = np.concatenate([data[k] for k in batch]) @ matrix
+    spectrum = product[:, :n_bins] + 1j * product[:, n_bins:]
+    fftval = [None] * len(data)
+    start = 0
+    for k in batch:
+        stop = start + data[k].shape[0]
+        fftval[k] = _band_power(
+            spectrum[start:stop], operators[k], scale, dB, normalize
+        )
+        start = stop
+    for k in set(range(len(data))) - set(batch):
+        fftval[k] = _fft(data[k], fs[k], band, dB, operators[k], normalize)
+    return fftval
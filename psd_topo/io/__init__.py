@@ -1,4 +1,6 @@
 """I/O module."""
 
+from ._xdf import iter_xdf_chunks  # noqa: F401
 from .read_raw_egi import read_raw_egi  # noqa: F401
 from .read_raw_xdf import read_raw_xdf  # noqa: F401
+from .read_raw_xdf_memmap import read_raw_xdf_memmap  # noqa: F401
@@ -0,0 +1,118 @@
+"""Sidecar cache storing the raw instances converted from an XDF file."""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from mne.io import BaseRaw, read_raw_fif
+
+from ..utils._logs import logger
+
+# increment when the layout of the sidecar directory changes
+_CACHE_VERSION = 2
+_METADATA = "metadata.json"
+
+
+def _get_cache_directory(fname: Path) -> Path:
+    """Get the sidecar directory associated with an XDF file."""
+    return fname.parent / f"{fname.stem}.xdf-cache"
+
+
+def _get_signature(fname: Path) -> dict:
+    """Get the signature used to validate the cache of an XDF file."""
+    stat = os.stat(fname)
+    return dict(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+
+
+def _read_cache(
+    fname: Path, key: Optional[dict] = None
+) -> Optional[Tuple[List[BaseRaw], List[str]]]:
+    """Load the raw instances from the sidecar cache if it is valid.
+
+    Parameters
+    ----------
+    fname : Path
+        Path to the .xdf file.
+    key : dict | None
+        Additional JSON-serializable parameters which must match the ones used
+        to create the cache.
+
+    Returns
+    -------
+    raws : list of Raw | None
+        List of MNE raw instances, not preloaded. None if the cache is missing
+        or out of date.
+    stream_names : list of str | None
+        List of stream names. None if the cache is missing or out of date.
+    """
+    directory = _get_cache_directory(fname)
+    try:
+        with open(directory / _METADATA, "r") as file:
+            metadata = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(metadata, dict)
+        or metadata.get("version") != _CACHE_VERSION
+        or metadata.get("signature") != _get_signature(fname)
+        or metadata.get("key") != (dict() if key is None else key)
+    ):
+        logger.info("Cache: '%s' is out of date.", directory)
+        return None
+    try:
+        raws = [
+            read_raw_fif(directory / file, preload=False, verbose="ERROR")
+            for file in metadata["files"]
+        ]
+        stream_names = list(metadata["stream_names"])
+    except Exception:  # corrupted files raise various errors
+        logger.warning("Cache: '%s' could not be read.", directory)
+        return None
+    logger.info("Cache: loaded '%s'.", directory)
+    return raws, stream_names
+
+
+def _write_cache(
+    fname: Path,
+    raws: List[BaseRaw],
+    stream_names: List[str],
+    key: Optional[dict] = None,
+) -> None:
+    """Write the raw instances to the sidecar cache of an XDF file.
+
+    Parameters
+    ----------
+    fname : Path
+        Path to the .xdf file.
+    raws : list of Raw
+        List of MNE raw instances loaded from the .xdf file.
+    stream_names : list of str
+        List of stream names.
+    key : dict | None
+        Additional JSON-serializable parameters used to create the raws.
+    """
+    directory = _get_cache_directory(fname)
+    # remove the previous cache, including the files of the streams which are
+    # not selected anymore
+    if directory.exists():
+        shutil.rmtree(directory)
+    os.makedirs(directory)
+    metadata_fname = directory / _METADATA
+    files = list()
+    for k, raw in enumerate(raws):
+        file = f"stream-{k}-raw.fif"
+        # double precision, for the cache to be lossless
+        raw.save(directory / file, fmt="double", verbose="ERROR")
+        files.append(file)
+    metadata = dict(
+        version=_CACHE_VERSION,
+        signature=_get_signature(fname),
+        key=dict() if key is None else key,
+        stream_names=list(stream_names),
+        files=files,
+    )
+    with open(metadata_fname, "w") as file:
+        json.dump(metadata, file, indent=4)
+    logger.info("Cache: written '%s'.", directory)
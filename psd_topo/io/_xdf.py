@@ -0,0 +1,266 @@
+"""Chunk-by-chunk XDF parser.
+
+Format specification: https://github.com/sccn/xdf/wiki/Specifications
+"""
+
+import struct
+from collections import defaultdict
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Sequence, Tuple
+from xml.etree.ElementTree import Element, fromstring
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..utils._checks import _check_type
+
+# chunk tags
+_STREAM_HEADER = 2
+_SAMPLES = 3
+_CLOCK_OFFSET = 4
+_STREAM_FOOTER = 6
+
+_DTYPES = {
+    "int8": np.dtype("<i1"),
+    "int16": np.dtype("<i2"),
+    "int32": np.dtype("<i4"),
+    "int64": np.dtype("<i8"),
+    "float32": np.dtype("<f4"),
+    "double64": np.dtype("<f8"),
+}
+
+
+def iter_xdf_chunks(
+    fname, stream_ids: Optional[Sequence[int]] = None
+) -> Iterator[Tuple[int, NDArray[float], NDArray]]:
+    """Iterate over the samples of an XDF file one chunk at a time.
+
+    Contrary to ``pyxdf.load_xdf``, only one chunk is held in memory at a time.
+    The timestamps are returned as recorded, i.e. without clock
+    synchronization or dejittering.
+
+    Parameters
+    ----------
+    fname : file-like
+        Path to the .xdf file to read.
+    stream_ids : list of int | None
+        ID of the streams to read. The samples chunks of the other streams are
+        skipped without being decoded. None to read all streams.
+
+    Yields
+    ------
+    stream_id : int
+        ID of the stream to which the chunk belongs.
+    timestamps : array
+        1D array of shape (n_samples,) containing the timestamps of the
+        samples.
+    samples : array
+        2D array of shape (n_samples, n_channels) containing the samples. The
+        dtype is the one of the stream, and object for string streams.
+    """
+    _check_type(fname, ("path-like",), "fname")
+    if stream_ids is not None:
+        stream_ids = set(stream_ids)
+    headers = dict()
+    last_timestamps = dict()
+    with _open_xdf(fname) as file:
+        for tag, stream_id, nbytes in _iter_chunk_headers(file):
+            if tag == _STREAM_HEADER:
+                headers[stream_id] = _parse_stream_header(file.read(nbytes))
+                last_timestamps[stream_id] = 0.0
+            elif tag == _SAMPLES and (
+                stream_ids is None or stream_id in stream_ids
+            ):
+                header = headers[stream_id]
+                body = file.read(nbytes)
+                timestamps, samples = _parse_samples(
+                    body, header, last_timestamps[stream_id]
+                )
+                if timestamps.size != 0:
+                    last_timestamps[stream_id] = timestamps[-1]
+                yield stream_id, timestamps, samples
+            else:
+                file.seek(nbytes, 1)
+
+
+def _scan_xdf(fname) -> Dict[int, dict]:
+    """Read the headers, the clock offsets and count the samples of a file.
+
+    The samples chunks are skipped except for their sample count, thus the
+    scan does not decode any sample.
+
+    Parameters
+    ----------
+    fname : file-like
+        Path to the .xdf file to read.
+
+    Returns
+    -------
+    streams : dict
+        Dictionary mapping each stream ID to a dictionary with the keys
+        'info' (the stream header, formatted as in pyxdf), 'stream_id',
+        'name', 'n_samples', 'clock_times' and 'clock_values'.
+    """
+    streams = dict()
+    with _open_xdf(fname) as file:
+        for tag, stream_id, nbytes in _iter_chunk_headers(file):
+            if tag == _STREAM_HEADER:
+                info = _parse_stream_header(file.read(nbytes))
+                streams[stream_id] = dict(
+                    stream_id=stream_id,
+                    name=info["name"][0],
+                    info=info,
+                    n_samples=0,
+                    clock_times=list(),
+                    clock_values=list(),
+                )
+            elif tag == _SAMPLES:
+                start = file.tell()
+                streams[stream_id]["n_samples"] += _read_varlen_int(file)
+                file.seek(start + nbytes)
+            elif tag == _CLOCK_OFFSET:
+                collection_time, offset = struct.unpack("<dd", file.read(16))
+                streams[stream_id]["clock_times"].append(collection_time)
+                streams[stream_id]["clock_values"].append(offset)
+            else:
+                file.seek(nbytes, 1)
+    return streams
+
+
+def _open_xdf(fname) -> BinaryIO:
+    """Open an XDF file and check the magic bytes."""
+    file = open(Path(fname), "rb")
+    if file.read(4) != b"XDF:":
+        file.close()
+        raise IOError(f"Invalid XDF file {fname}.")
+    return file
+
+
+def _iter_chunk_headers(file: BinaryIO) -> Iterator[Tuple[int, int, int]]:
+    """Iterate over the chunks, yielding (tag, stream_id, nbytes).
+
+    The file is positioned at the start of the chunk content (after the stream
+    ID) and 'nbytes' is the size of the remaining content. The consumer must
+    read or seek over those 'nbytes' before requesting the next chunk.
+    stream_id is None for chunks which are not associated to a stream.
+    """
+    while True:
+        try:
+            nbytes = _read_varlen_int(file)
+        except EOFError:
+            return
+        (tag,) = struct.unpack("<H", file.read(2))
+        nbytes -= 2
+        if tag in (_STREAM_HEADER, _SAMPLES, _CLOCK_OFFSET, _STREAM_FOOTER):
+            (stream_id,) = struct.unpack("<I", file.read(4))
+            nbytes -= 4
+        else:
+            stream_id = None
+        yield tag, stream_id, nbytes
+
+
+def _read_varlen_int(file: BinaryIO) -> int:
+    """Read a variable-length integer."""
+    nbytes = file.read(1)
+    if len(nbytes) == 0:
+        raise EOFError
+    if nbytes == b"\x01":
+        return file.read(1)[0]
+    elif nbytes == b"\x04":
+        return struct.unpack("<I", file.read(4))[0]
+    elif nbytes == b"\x08":
+        return struct.unpack("<Q", file.read(8))[0]
+    raise RuntimeError("Invalid variable-length integer encountered.")
+
+
+def _parse_stream_header(content: bytes) -> dict:
+    """Parse the XML stream header into a dictionary formatted as in pyxdf."""
+    xml = fromstring(content.decode("utf-8", "replace"))
+    return _xml2dict(xml)["info"]
+
+
+def _xml2dict(element: Element) -> dict:
+    """Convert an attribute-less XML element into a dictionary."""
+    children = defaultdict(list)
+    for child in map(_xml2dict, list(element)):
+        for key, value in child.items():
+            children[key].append(value)
+    return {element.tag: children or element.text}
+
+
+def _parse_samples(
+    body: bytes, header: dict, last_timestamp: float
+) -> Tuple[NDArray[float], NDArray]:
+    """Parse the content of a samples chunk.
+
+    Parameters
+    ----------
+    body : bytes
+        Content of the chunk, after the stream ID.
+    header : dict
+        Stream header, formatted as in pyxdf.
+    last_timestamp : float
+        Timestamp of the last sample of the previous chunk, used to deduce the
+        timestamps which are omitted.
+
+    Returns
+    -------
+    timestamps : array
+        1D array of shape (n_samples,).
+    samples : array
+        2D array of shape (n_samples, n_channels).
+    """
+    n_channels = int(header["channel_count"][0])
+    fmt = header["channel_format"][0]
+    srate = float(header["nominal_srate"][0])
+    tdiff = 1.0 / srate if srate > 0 else 0.0
+    # read [NumSampleBytes] [NumSamples]
+    offset = 1 + body[0]
+    n_samples = int.from_bytes(body[1:offset], "little")
+
+    if fmt != "string":
+        # fast path when all the timestamps are present
+        dtype = np.dtype(
+            [
+                ("flag", "u1"),
+                ("timestamp", "<f8"),
+                ("values", _DTYPES[fmt], (n_channels,)),
+            ]
+        )
+        if len(body) - offset == n_samples * dtype.itemsize:
+            records = np.frombuffer(body, dtype=dtype, offset=offset)
+            if np.all(records["flag"] == 8):
+                return records["timestamp"].copy(), records["values"].copy()
+        samples = np.empty((n_samples, n_channels), dtype=_DTYPES[fmt])
+        itemsize = n_channels * _DTYPES[fmt].itemsize
+    else:
+        samples = np.empty((n_samples, n_channels), dtype=object)
+
+    timestamps = np.empty(n_samples)
+    for k in range(n_samples):
+        # read or deduce the timestamp
+        if body[offset] != 0:
+            (timestamps[k],) = struct.unpack_from("<d", body, offset + 1)
+            offset += 9
+        else:
+            timestamps[k] = last_timestamp + tdiff
+            offset += 1
+        last_timestamp = timestamps[k]
+        # read the values
+        if fmt != "string":
+            samples[k] = np.frombuffer(
+                body, dtype=_DTYPES[fmt], count=n_channels, offset=offset
+            )
+            offset += itemsize
+        else:
+            for ch in range(n_channels):
+                nbytes = body[offset]
+                length = int.from_bytes(
+                    body[offset + 1 : offset + 1 + nbytes], "little"
+                )
+                offset += 1 + nbytes
+                samples[k, ch] = body[offset : offset + length].decode(
+                    errors="replace"
+                )
+                offset += length
+    return timestamps, samples
@@ -1,27 +1,51 @@
 import re
+from typing import List, Union
 
 import mne
 import numpy as np
-from mne import create_info
 from mne.io import BaseRaw, RawArray
+from numpy.typing import NDArray
 
+from ..utils._checks import _check_type
+from ..utils._logs import logger
 
-def read_raw_egi(fname) -> BaseRaw:
+# number of samples read at once while loading the kept channels
+_CHUNK_SIZE = 100000
+
+
+def read_raw_egi(fname, preload: Union[bool, str] = True) -> BaseRaw:
     """Read raw MFF file saved with the EGI software.
 
+    The bad channels, the diode and the synthetic trigger channel are dropped
+    before the data is read, and the event channels are summed in a single
+    TRIGGER channel while the data is read chunk by chunk. Thus, the memory
+    footprint scales with the number of kept channels.
+
     Parameters
     ----------
     fname : file-like
         Path to the .mff file to load.
+    preload : bool | str
+        If True, the kept channels are loaded in memory. If a path-like, the
+        kept channels are loaded in a memory-mapped file at this path, e.g. to
+        handle long recordings which do not fit in memory. The data can not be
+        left on the .mff file (False) because the TRIGGER channel is created.
 
     Returns
     -------
     raw : Raw
         MNE raw instance.
     """
-    raw = mne.io.read_raw_egi(fname, preload=True)
+    _check_type(preload, (bool, "path-like"), "preload")
+    if isinstance(preload, bool) and not preload:
+        raise ValueError(
+            "The argument 'preload' must be True or a path to a "
+            "memory-mapped file. The data has to be loaded to create the "
+            "TRIGGER channel."
+        )
+    raw = mne.io.read_raw_egi(fname, preload=False)
 
-    # drop bad channels
+    # drop bad channels and synthetic trigger channel, before reading the data
     bads = (
         "31 67 73 82 91 92 102 111 120 133 145 165 174 187 199 208 209 "
         + "216 217 218 219 225 226 227 228 229 230 231 232 233 234 235 "
@@ -30,18 +54,21 @@ def read_raw_egi(fname) -> BaseRaw:
     )
     bads = bads.split(" ")
     bads = [f"E{k}" for k in bads]
-    raw.drop_channels(bads + ["diode"])
+    # the diode is absent from some recordings, e.g. in simple binary files
+    drop = bads + ["diode", "STI 014"]
+    raw.drop_channels([ch for ch in drop if ch in raw.ch_names])
 
-    # drop synthetic trigger channel and reconstruct trigger channel
-    raw.drop_channels(["STI 014"])
+    # reconstruct trigger channel
     ch_pattern = re.compile(r"(E\d{1,3})")
     trigger_chs = [ch for ch in raw.ch_names if not re.match(ch_pattern, ch)]
-    stim = raw.get_data(picks=trigger_chs)
-    stim = np.sum(stim, axis=0).reshape(1, -1)
-    info = create_info(["TRIGGER"], sfreq=raw.info["sfreq"], ch_types="stim")
-    stim = RawArray(stim, info)
-    raw.add_channels([stim], force_update_info=True)
-    raw.drop_channels(trigger_chs)
+    assert len(trigger_chs) != 0  # sanity-check
+    eeg_chs = [ch for ch in raw.ch_names if ch not in trigger_chs]
+    data = _read_data(raw, eeg_chs, trigger_chs, preload)
+    # the first trigger channel is kept to hold the TRIGGER channel info
+    raw.pick(eeg_chs + trigger_chs[:1])
+    raw = RawArray(data, raw.info, copy="auto")
+    raw.rename_channels({trigger_chs[0]: "TRIGGER"})
+    raw.set_channel_types({"TRIGGER": "stim"})
 
     # set montage
     raw.rename_channels({"E257": "Cz"})
@@ -49,3 +76,26 @@ def read_raw_egi(fname) -> BaseRaw:
     raw.rename_channels({"Cz": "E257"})
 
     return raw
+
+
+def _read_data(
+    raw: BaseRaw,
+    eeg_chs: List[str],
+    trigger_chs: List[str],
+    preload: Union[bool, str],
+) -> NDArray[float]:
+    """Read the EEG channels and sum the trigger channels chunk by chunk."""
+    n_times = raw.n_times
+    shape = (len(eeg_chs) + 1, n_times)
+    if isinstance(preload, bool):
+        data = np.empty(shape, dtype=np.float64)
+    else:
+        logger.info("Loading the data in the memory-mapped file %s", preload)
+        data = np.memmap(preload, dtype=np.float64, mode="w+", shape=shape)
+    picks = eeg_chs + trigger_chs
+    for start in range(0, n_times, _CHUNK_SIZE):
+        stop = min(start + _CHUNK_SIZE, n_times)
+        chunk = raw.get_data(picks=picks, start=start, stop=stop)
+        data[:-1, start:stop] = chunk[: len(eeg_chs)]
+        np.sum(chunk[len(eeg_chs) :], axis=0, out=data[-1, start:stop])
+    return data
@@ -1,15 +1,29 @@
-from typing import List, Tuple
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
 
 import mne
 import numpy as np
 from mne.io import BaseRaw
 from mne.io.pick import _DATA_CH_TYPES_ORDER_DEFAULT
-from pyxdf import load_xdf
+from numpy.typing import NDArray
+from pyxdf import load_xdf, resolve_streams
 
 from ..config import load_config
+from ..utils._checks import _check_type
+from ._cache import _read_cache, _write_cache
 
+# increment when the raw instances created from the streams change
+_RAW_VERSION = 1
 
-def read_raw_xdf(fname) -> Tuple[List[BaseRaw], List[str]]:
+
+def read_raw_xdf(
+    fname,
+    cache: bool = False,
+    select_streams: Optional[Union[str, List[str], Tuple[str, ...]]] = None,
+    n_jobs: int = 1,
+) -> Tuple[List[BaseRaw], List[str]]:
     """Read raw XDF files saved with the LabRecorder.
 
     All streams that have "WS-" in their name will be loaded in a separate
@@ -20,6 +34,25 @@ def read_raw_xdf(fname) -> Tuple[List[BaseRaw], List[str]]:
     ----------
     fname : file-like
         Path to the .xdf file to load.
+    cache : bool
+        If True, the raw instances are converted once and stored in a sidecar
+        directory ``<stem>.xdf-cache`` next to the .xdf file, where ``<stem>``
+        is the file name without extension. Subsequent calls load the raw
+        instances from the sidecar without preloading the data, as long as
+        the modification time and the size of the .xdf file, the stream
+        selection and the amplifier prefix and marker stream name of the
+        configuration match the ones recorded in the sidecar. The data is
+        stored in double precision, thus the cache is lossless.
+    select_streams : str | list of str | tuple of str | None
+        Selection of the amplifier streams to load. An amplifier stream is
+        selected if its name contains one of the provided strings. If None, all
+        the "WS-" streams are loaded. The marker stream is always loaded. The
+        selection is resolved from the stream headers before loading, thus the
+        samples of the other streams (e.g. video or audio) are not decoded.
+    n_jobs : int
+        Number of worker threads used to create the raw instances of the
+        amplifier streams in parallel. If -1, all CPU cores are used. The raws
+        are returned in the same order regardless of the number of jobs.
 
     Returns
     -------
@@ -28,8 +61,55 @@ def read_raw_xdf(fname) -> Tuple[List[BaseRaw], List[str]]:
     stream_names = list of str
         List of stream names.
     """
-    streams, _ = load_xdf(fname)
+    _check_type(fname, ("path-like",), "fname")
+    _check_type(cache, (bool,), "cache")
+    if select_streams is not None:
+        _check_type(select_streams, (str, list, tuple), "select_streams")
+        if isinstance(select_streams, str):
+            select_streams = [select_streams]
+        for elt in select_streams:
+            _check_type(elt, (str,), "select_streams")
+        select_streams = sorted(set(select_streams))
+    _check_type(n_jobs, ("int",), "n_jobs")
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    elif n_jobs <= 0:
+        raise ValueError(
+            "The number of jobs 'n_jobs' must be a strictly positive integer "
+            f"or -1 to use all CPU cores. {n_jobs} is invalid."
+        )
+    fname = Path(fname)
+    # the configuration selects the streams, it can change between 2 calls
+    amp_prefix, trigger_stream_name = load_config()
+    key = dict(
+        raw_version=_RAW_VERSION,
+        select_streams=select_streams,
+        amplifier_prefix=amp_prefix,
+        trigger_stream_name=trigger_stream_name,
+    )
+    if cache:
+        cached = _read_cache(fname, key)
+        if cached is not None:
+            return cached
+    raws, stream_names = _read_raw_xdf(fname, select_streams, n_jobs)
+    if cache:
+        _write_cache(fname, raws, stream_names, key)
+    return raws, stream_names
+
+
+def _read_raw_xdf(
+    fname: Path, select_streams: Optional[List[str]], n_jobs: int
+) -> Tuple[List[BaseRaw], List[str]]:
+    """Read raw XDF files saved with the LabRecorder."""
     amp_prefix, trigger_stream_name = load_config()
+    stream_ids = _select_stream_ids(
+        resolve_streams(fname),
+        amp_prefix,
+        trigger_stream_name,
+        select_streams,
+        fname,
+    )
+    streams, _ = load_xdf(fname, select_streams=stream_ids)
     eeg_streams = _find_streams(streams, stream_name=amp_prefix)
     assert len(eeg_streams) != 0  # sanity-check
     marker_stream = _find_streams(streams, stream_name=trigger_stream_name)
@@ -41,54 +121,117 @@ def read_raw_xdf(fname) -> Tuple[List[BaseRaw], List[str]]:
     del stream
 
     # create the raw instances
+    eeg_streams = [stream for _, stream in eeg_streams]
+    n_jobs = min(n_jobs, len(eeg_streams))
+    if n_jobs == 1:
+        results = [_create_raw(stream, marker) for stream in eeg_streams]
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(
+                executor.map(
+                    _create_raw, eeg_streams, [marker] * len(eeg_streams)
+                )
+            )
     raws = list()
     stream_names = list()
-    for _, stream in eeg_streams:
-        # retrieve information
-        ch_names, ch_types, units = _get_eeg_ch_info(stream)
-        sfreq = int(eval(stream["info"]["nominal_srate"][0]))
-        data = stream["time_series"].T
-        if any(elt == 0 for elt in data.shape):
-            continue  # skip empty streams
-
-        # create MNE raw
-        info = mne.create_info(ch_names, sfreq, ch_types)
-        raw = mne.io.RawArray(data, info, first_samp=0)
-
-        # drop AUX and reference channels
-        raw.drop_channels(["X1", "X2", "X3", "A2"])
-
-        # rename trigger channel
-        raw.rename_channels(mapping=dict(TRG="TRIGGER"))
-        assert raw.ch_names[-1] == "TRIGGER"  # sanity-check
-        raw.reorder_channels([raw.ch_names[-1]] + raw.ch_names[:-1])
-
-        # scaling the EEG channels
-        def uVolt2Volt(timearr):
-            """Convert from uV to Volts."""
-            return timearr * 1e-6
-
-        raw.apply_function(uVolt2Volt, picks="eeg", channel_wise=True)
-
-        # add marker on trigger channel
-        events = list()
-        for ts, value in zip(*marker):
-            next_index = np.searchsorted(stream["time_stamps"], ts)
-            events.append([next_index, 0, value])
-        events = np.array(events)
-        try:
-            raw.add_events(events, stim_channel="TRIGGER", replace=True)
-        except ValueError:
+    for stream, raw in zip(eeg_streams, results):
+        if raw is None:
             continue
-
-        # save and clean-up
         stream_names.append(stream["info"]["name"][0])
         raws.append(raw)
-        del stream
 
     return raws, stream_names
 
 
+def _create_raw(
+    stream: dict, marker: Tuple[NDArray[float], NDArray[int]]
+) -> Optional[BaseRaw]:
+    """Create the raw instance of an amplifier stream.
+
+    Parameters
+    ----------
+    stream : dict
+        Amplifier stream dictionary loaded by pyxdf.
+    marker : tuple of array
+        Timestamps and values of the marker stream.
+
+    Returns
+    -------
+    raw : Raw | None
+        MNE raw instance. None if the stream is empty or if the markers could
+        not be added to the TRIGGER channel.
+    """
+    # retrieve information
+    ch_names, ch_types, units = _get_eeg_ch_info(stream)
+    sfreq = int(eval(stream["info"]["nominal_srate"][0]))
+    time_series = stream["time_series"]
+    if any(elt == 0 for elt in time_series.shape):
+        return None  # skip empty streams
+
+    picks, ch_names, ch_types, scalings = _get_picks(ch_names, ch_types)
+
+    # copy the channels to keep in a channel-major array, scaling the EEG
+    # channels from uV to Volts on the fly
+    data = np.empty((len(picks), time_series.shape[0]), dtype=np.float64)
+    for k, (pick, scale) in enumerate(zip(picks, scalings)):
+        np.multiply(time_series[:, pick], scale, out=data[k], dtype=np.float64)
+
+    # create MNE raw
+    info = mne.create_info(ch_names, sfreq, ch_types)
+    raw = mne.io.RawArray(data, info, first_samp=0, copy="auto")
+
+    # add marker on trigger channel
+    try:
+        _add_events(raw, stream["time_stamps"], marker)
+    except ValueError:
+        return None
+
+    return raw
+
+
+def _get_picks(
+    ch_names: List[str], ch_types: List[str]
+) -> Tuple[List[int], List[str], List[str], NDArray[float]]:
+    """Select the channels to keep and their scaling.
+
+    The AUX and reference channels are dropped and the trigger channel is moved
+    first and renamed to TRIGGER.
+
+    Returns
+    -------
+    picks : list of int
+        Index of the channels to keep.
+    ch_names : list of str
+        Name of the channels to keep.
+    ch_types : list of str
+        Type of the channels to keep.
+    scalings : array
+        Scaling factor of the channels to keep, from uV to Volts for the EEG
+        channels.
+    """
+    ch2remove = ("X1", "X2", "X3", "A2", "TRG")
+    assert "TRG" in ch_names  # sanity-check
+    picks = [ch_names.index("TRG")] + [
+        k for k, ch in enumerate(ch_names) if ch not in ch2remove
+    ]
+    ch_names = ["TRIGGER"] + [ch_names[k] for k in picks[1:]]
+    ch_types = [ch_types[k] for k in picks]
+    scalings = np.array([1e-6 if elt == "eeg" else 1.0 for elt in ch_types])
+    return picks, ch_names, ch_types, scalings
+
+
+def _add_events(
+    raw: BaseRaw,
+    timestamps: NDArray[float],
+    marker: Tuple[NDArray[float], NDArray[int]],
+) -> None:
+    """Add the markers on the TRIGGER channel, in-place."""
+    events = np.zeros((marker[0].size, 3), dtype=np.int64)
+    events[:, 0] = np.searchsorted(timestamps, marker[0])
+    events[:, 2] = marker[1]
+    raw.add_events(events, stim_channel="TRIGGER", replace=True)
+
+
 def _find_streams(
     streams: List[dict], stream_name: str
 ) -> List[Tuple[int, dict]]:
@@ -114,6 +257,58 @@ def _find_streams(
     ]
 
 
+def _select_stream_ids(
+    stream_infos: List[dict],
+    amp_prefix: str,
+    trigger_stream_name: str,
+    select_streams: Optional[List[str]],
+    fname: Path,
+) -> List[int]:
+    """Select the ID of the streams to load from the stream headers.
+
+    Parameters
+    ----------
+    stream_infos : list of dict
+        List of stream information, with at least the keys 'stream_id' and
+        'name'.
+    amp_prefix : str
+        Prefix of the amplifier streams.
+    trigger_stream_name : str
+        Name of the marker stream.
+    select_streams : list of str | None
+        Substrings of which one has to be present in the name attribute of the
+        amplifier streams. None to select all amplifier streams.
+    fname : Path
+        Path to the .xdf file.
+
+    Returns
+    -------
+    stream_ids : list of int
+        ID of the amplifier and marker streams to load.
+    """
+    amp_ids = [
+        info["stream_id"]
+        for info in stream_infos
+        if info["name"] is not None
+        and amp_prefix in info["name"]
+        and (
+            select_streams is None
+            or any(elt in info["name"] for elt in select_streams)
+        )
+    ]
+    if len(amp_ids) == 0:
+        raise ValueError(
+            f"No amplifier stream matching the prefix '{amp_prefix}' and the "
+            f"selection {select_streams} was found in '{fname}'."
+        )
+    marker_ids = [
+        info["stream_id"]
+        for info in stream_infos
+        if info["name"] is not None and trigger_stream_name in info["name"]
+    ]
+    return amp_ids + marker_ids
+
+
 def _get_eeg_ch_info(stream: dict) -> Tuple[List, List, List]:
     """Extract the info for each eeg channels (label, type and unit)."""
     ch_names, ch_types, units = [], [], []
@@ -0,0 +1,209 @@
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import mne
+import numpy as np
+from mne.io import BaseRaw
+from numpy.typing import NDArray
+
+from ..config import load_config
+from ..utils._checks import _check_type
+from ..utils._logs import logger
+from ._xdf import _scan_xdf, iter_xdf_chunks
+from .read_raw_xdf import (
+    _add_events,
+    _get_eeg_ch_info,
+    _get_picks,
+    _select_stream_ids,
+)
+
+
+def read_raw_xdf_memmap(
+    fname,
+    directory=None,
+    select_streams: Optional[Union[str, List[str], Tuple[str, ...]]] = None,
+) -> Tuple[List[BaseRaw], List[str]]:
+    """Read raw XDF files larger than the memory with memory-mapped arrays.
+
+    Equivalent to `psd_topo.io.read_raw_xdf`, except that the file is read
+    one chunk at a time and that the amplifier streams are written directly
+    to memory-mapped arrays on disk. The returned raw instances are backed by
+    those memory-mapped arrays, thus the memory footprint does not scale with
+    the duration of the recording.
+
+    Parameters
+    ----------
+    fname : file-like
+        Path to the .xdf file to load.
+    directory : path-like | None
+        Directory in which the memory-mapped arrays are created. If None, the
+        directory ``<stem>.xdf-memmap`` next to the .xdf file is used, where
+        ``<stem>`` is the file name without extension.
+    select_streams : str | list of str | tuple of str | None
+        Selection of the amplifier streams to load. An amplifier stream is
+        selected if its name contains one of the provided strings. If None, all
+        the "WS-" streams are loaded. The marker stream is always loaded.
+
+    Returns
+    -------
+    raws : list of Raw
+        List of loaded MNE raw instances.
+    stream_names = list of str
+        List of stream names.
+
+    Notes
+    -----
+    The timestamps are corrected with the clock offsets linearly interpolated
+    between the clock measurements, and dejittered as in ``pyxdf.load_xdf``
+    such that the markers fall on the same samples as with
+    `psd_topo.io.read_raw_xdf`. Contrary to ``pyxdf.load_xdf``, clock resets
+    are not handled.
+    """
+    _check_type(fname, ("path-like",), "fname")
+    _check_type(directory, ("path-like", None), "directory")
+    if select_streams is not None:
+        _check_type(select_streams, (str, list, tuple), "select_streams")
+        if isinstance(select_streams, str):
+            select_streams = [select_streams]
+        for elt in select_streams:
+            _check_type(elt, (str,), "select_streams")
+    fname = Path(fname)
+    directory = (
+        fname.parent / f"{fname.stem}.xdf-memmap"
+        if directory is None
+        else Path(directory)
+    )
+    os.makedirs(directory, exist_ok=True)
+
+    # first pass: headers, clock offsets and sample counts
+    streams = _scan_xdf(fname)
+    amp_prefix, trigger_stream_name = load_config()
+    stream_ids = _select_stream_ids(
+        list(streams.values()),
+        amp_prefix,
+        trigger_stream_name,
+        select_streams,
+        fname,
+    )
+    marker_ids = [
+        idx
+        for idx in stream_ids
+        if trigger_stream_name in streams[idx]["name"]
+    ]
+    assert len(marker_ids) == 1  # sanity-check
+    marker_id = marker_ids[0]
+    amp_ids = [
+        idx
+        for idx in stream_ids
+        if idx != marker_id and streams[idx]["n_samples"] != 0
+    ]
+
+    # allocate the memory-mapped arrays of the amplifier streams
+    buffers = dict()
+    for idx in amp_ids:
+        stream = streams[idx]
+        ch_names, ch_types, _ = _get_eeg_ch_info(stream)
+        picks, ch_names, ch_types, scalings = _get_picks(ch_names, ch_types)
+        fname_data = directory / f"stream-{idx}.dat"
+        logger.info("Memmap: allocating '%s'.", fname_data)
+        buffers[idx] = dict(
+            ch_names=ch_names,
+            ch_types=ch_types,
+            picks=picks,
+            scalings=scalings[:, np.newaxis],
+            data=np.memmap(
+                fname_data,
+                dtype=np.float64,
+                mode="w+",
+                shape=(len(picks), stream["n_samples"]),
+            ),
+            timestamps=np.empty(stream["n_samples"]),
+            pos=0,
+        )
+
+    # second pass: decode the selected streams chunk by chunk
+    marker = (list(), list())
+    for idx, timestamps, samples in iter_xdf_chunks(fname, stream_ids):
+        if idx == marker_id:
+            marker[0].append(timestamps)
+            marker[1].append(samples[:, 0])
+            continue
+        elif idx not in buffers:
+            continue
+        buffer = buffers[idx]
+        start, stop = buffer["pos"], buffer["pos"] + timestamps.size
+        buffer["timestamps"][start:stop] = timestamps
+        np.multiply(
+            samples[:, buffer["picks"]].T,
+            buffer["scalings"],
+            out=buffer["data"][:, start:stop],
+            dtype=np.float64,
+        )
+        buffer["pos"] = stop
+    marker = (
+        _synchronize_clock(
+            np.concatenate(marker[0]) if len(marker[0]) else np.empty(0),
+            streams[marker_id],
+        ),
+        (
+            np.concatenate(marker[1]).astype(np.int64)
+            if len(marker[1])
+            else np.empty(0, dtype=np.int64)
+        ),
+    )
+
+    # create the raw instances
+    raws = list()
+    stream_names = list()
+    for idx, buffer in buffers.items():
+        stream = streams[idx]
+        sfreq = int(eval(stream["info"]["nominal_srate"][0]))
+        info = mne.create_info(buffer["ch_names"], sfreq, buffer["ch_types"])
+        raw = mne.io.RawArray(buffer["data"], info, copy="auto")
+        timestamps = _synchronize_clock(buffer["timestamps"], stream)
+        timestamps = _dejitter(timestamps, sfreq)
+        try:
+            _add_events(raw, timestamps, marker)
+        except ValueError:
+            continue
+        buffer["data"].flush()
+        stream_names.append(stream["name"])
+        raws.append(raw)
+
+    return raws, stream_names
+
+
+def _synchronize_clock(
+    timestamps: NDArray[float], stream: dict
+) -> NDArray[float]:
+    """Correct the timestamps with the stream clock offsets, in-place."""
+    if len(stream["clock_times"]) == 0:
+        return timestamps
+    timestamps += np.interp(
+        timestamps, stream["clock_times"], stream["clock_values"]
+    )
+    return timestamps
+
+
+def _dejitter(
+    timestamps: NDArray[float],
+    sfreq: float,
+    threshold_seconds: float = 1.0,
+    threshold_samples: int = 500,
+) -> NDArray[float]:
+    """Replace the timestamps with a linear fit per segment, in-place.
+
+    The segments are delimited by the breaks longer than the thresholds, and
+    the fit is the same as ``pyxdf.load_xdf`` with its default arguments.
+    """
+    threshold = max(threshold_seconds, threshold_samples / sfreq)
+    breaks = np.nonzero(np.abs(np.diff(timestamps)) > threshold)[0]
+    starts = np.hstack(([0], breaks + 1))
+    stops = np.hstack((breaks + 1, [timestamps.size]))
+    for start, stop in zip(starts, stops):
+        idx = np.arange(start, stop)[:, np.newaxis]
+        X = np.concatenate((np.ones_like(idx), idx), axis=1)
+        mapping = np.linalg.lstsq(X, timestamps[idx], rcond=-1)[0]
+        timestamps[idx] = mapping[0] + mapping[1] * idx
+    return timestamps
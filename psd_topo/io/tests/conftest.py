@@ -0,0 +1,79 @@
+import struct
+
+import numpy as np
+import pytest
+
+
+def _chunk(tag, content):
+    """Create a chunk with a 4-bytes length."""
+    return struct.pack("<BIH", 4, len(content) + 2, tag) + content
+
+
+def _header(stream_id, name, fmt, srate, channels):
+    """Create a stream header chunk with the (label, type, unit) channels."""
+    desc = "".join(
+        f"<channel><label>{label}</label><type>{kind}</type>"
+        f"<unit>{unit}</unit></channel>"
+        for label, kind, unit in channels
+    )
+    xml = (
+        f"<?xml version='1.0'?><info><name>{name}</name><type>EEG</type>"
+        f"<channel_count>{len(channels)}</channel_count>"
+        f"<nominal_srate>{srate}</nominal_srate>"
+        f"<channel_format>{fmt}</channel_format>"
+        f"<desc><channels>{desc}</channels></desc></info>"
+    )
+    return _chunk(2, struct.pack("<I", stream_id) + xml.encode())
+
+
+def _samples(stream_id, timestamps, data, dtype="<f4"):
+    """Create a samples chunk with all timestamps."""
+    body = struct.pack("<IBB", stream_id, 1, len(timestamps))
+    for timestamp, row in zip(timestamps, data):
+        body += struct.pack("<Bd", 8, timestamp)
+        body += np.asarray(row, dtype=dtype).tobytes()
+    return _chunk(3, body)
+
+
+# channels of the amplifier streams, AUX and reference channels included
+_CHANNELS = [
+    ("Fz", "EEG", "microvolts"),
+    ("Cz", "EEG", "microvolts"),
+    ("Pz", "EEG", "microvolts"),
+    ("X1", "AUX", "microvolts"),
+    ("A2", "EEG", "microvolts"),
+    ("TRG", "TRG", "none"),
+]
+
+
+@pytest.fixture(scope="session")
+def xdf_fname(tmp_path_factory):
+    """Create an XDF file with 3 amplifier streams, a marker and a video.
+
+    The amplifier streams 'WS-1' and 'WS-2' are sampled at 100 Hz for 2
+    seconds. The markers of 'WS-late' are after its last sample, thus this
+    stream is skipped by the readers.
+    """
+    rng = np.random.default_rng(101)
+    content = b"XDF:" + _chunk(1, b"<info><version>1.0</version></info>")
+    content += _header(1, "WS-1", "float32", 100, _CHANNELS)
+    content += _header(2, "Video", "float32", 30, [("R", "misc", "none")])
+    content += _header(3, "PSD-markers", "int32", 0, [("M", "Markers", "")])
+    content += _header(4, "WS-late", "float32", 100, _CHANNELS)
+    content += _header(5, "WS-2", "float32", 100, _CHANNELS)
+    timestamps = 10 + np.arange(200) / 100
+    for stream_id, times in ((1, timestamps), (4, timestamps[:40])):
+        data = rng.normal(size=(times.size, len(_CHANNELS))) * 10
+        data[:, -1] = 0
+        content += _samples(stream_id, times[:120], data[:120])
+        content += _samples(stream_id, times[120:], data[120:])
+    content += _samples(2, timestamps[::3][:20], rng.normal(size=(20, 1)))
+    markers = np.array([[1], [2], [1]])
+    content += _samples(3, [10.5, 11.004, 11.5], markers, dtype="<i4")
+    data = rng.normal(size=(200, len(_CHANNELS))) * 10
+    data[:, -1] = 0
+    content += _samples(5, timestamps, data)
+    fname = tmp_path_factory.mktemp("xdf") / "recording.xdf"
+    with open(fname, "wb") as file:
+        file.write(content)
+    return fname
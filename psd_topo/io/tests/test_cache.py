@@ -0,0 +1,95 @@
+"""Test _cache.py"""
+
+import json
+import os
+
+import numpy as np
+from mne import create_info
+from mne.io import RawArray
+
+from .._cache import _get_cache_directory, _read_cache, _write_cache
+
+
+def _raw(seed):
+    """Create a small raw instance."""
+    data = np.random.default_rng(seed).normal(size=(2, 100))
+    return RawArray(data, create_info(["Fz", "Cz"], 100, "eeg"), verbose=False)
+
+
+def _write(tmp_path):
+    """Create a fake XDF file and its cache."""
+    fname = tmp_path / "recording.xdf"
+    fname.write_bytes(b"XDF:" + bytes(100))
+    raws = [_raw(0), _raw(1)]
+    _write_cache(fname, raws, ["WS-1", "WS-2"], dict(select_streams=None))
+    return fname, raws
+
+
+def test_cache_hit(tmp_path):
+    """Test that the raws are loaded from the cache."""
+    fname, raws = _write(tmp_path)
+    assert (_get_cache_directory(fname) / "metadata.json").exists()
+    cached = _read_cache(fname, dict(select_streams=None))
+    assert cached is not None
+    raws_, stream_names = cached
+    assert stream_names == ["WS-1", "WS-2"]
+    for raw, raw_ in zip(raws, raws_):
+        assert not raw_.preload
+        assert np.array_equal(raw.get_data(), raw_.get_data())
+
+
+def test_cache_overwrite(tmp_path):
+    """Test that the files of a previous cache are removed."""
+    fname, raws = _write(tmp_path)
+    directory = _get_cache_directory(fname)
+    assert (directory / "stream-1-raw.fif").exists()
+    _write_cache(fname, raws[:1], ["WS-1"], dict(select_streams=["WS-1"]))
+    assert sorted(elt.name for elt in directory.iterdir()) == [
+        "metadata.json",
+        "stream-0-raw.fif",
+    ]
+    raws_, stream_names = _read_cache(fname, dict(select_streams=["WS-1"]))
+    assert stream_names == ["WS-1"]
+    assert np.array_equal(raws[0].get_data(), raws_[0].get_data())
+
+
+def test_cache_invalidation(tmp_path):
+    """Test that the cache is invalidated when the file changes."""
+    fname, _ = _write(tmp_path)
+    stat = os.stat(fname)
+    os.utime(fname, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert _read_cache(fname, dict(select_streams=None)) is None
+
+    fname, _ = _write(tmp_path)
+    with open(fname, "ab") as file:
+        file.write(b"\x00")
+    os.utime(fname, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert _read_cache(fname, dict(select_streams=None)) is None
+
+
+def test_cache_key(tmp_path):
+    """Test that the cache is invalidated when the key changes."""
+    fname, _ = _write(tmp_path)
+    assert _read_cache(fname, dict(select_streams=["WS-1"])) is None
+    assert _read_cache(fname) is None
+    assert _read_cache(fname, dict(select_streams=None)) is not None
+
+
+def test_cache_corrupted(tmp_path):
+    """Test that a corrupted cache is ignored."""
+    fname, _ = _write(tmp_path)
+    directory = _get_cache_directory(fname)
+    (directory / "stream-1-raw.fif").write_bytes(b"corrupted")
+    assert _read_cache(fname, dict(select_streams=None)) is None
+
+    fname, _ = _write(tmp_path)
+    (directory / "metadata.json").write_text("{corrupted")
+    assert _read_cache(fname, dict(select_streams=None)) is None
+
+    fname, _ = _write(tmp_path)
+    with open(directory / "metadata.json") as file:
+        metadata = json.load(file)
+    del metadata["files"]
+    with open(directory / "metadata.json", "w") as file:
+        json.dump(metadata, file)
+    assert _read_cache(fname, dict(select_streams=None)) is None
@@ -0,0 +1,73 @@
+"""Test read_raw_egi.py"""
+
+import struct
+import sys
+
+import mne
+import numpy as np
+import pytest
+
+from ..read_raw_egi import read_raw_egi
+
+
+@pytest.fixture(scope="module")
+def egi_fname(tmp_path_factory):
+    """Create an EGI simple binary file with 257 EEG and 2 event channels.
+
+    The data is stored as big-endian int16 with a calibration of 1 µV. The
+    event channels 'DIN1' and 'DIN2' have 3 and 2 events.
+    """
+    n_channels, n_samples = 257, 1000
+    rng = np.random.default_rng(101)
+    data = rng.integers(-1000, 1000, size=(n_samples, n_channels + 2))
+    data[:, -2:] = 0
+    data[[100, 400, 700], -2] = 1
+    data[[250, 850], -1] = 1
+    date = (2022, 1, 1, 0, 0, 0, 0)  # year to millisecond
+    # version 2: unsegmented, int16 precision
+    # sampling rate, channels, gain, bits, range, samples and events
+    header = struct.pack(">i6hi", 2, *date)
+    header += struct.pack(">5hih", 250, n_channels, 0, 0, 0, n_samples, 2)
+    header += b"DIN1DIN2"
+    fname = tmp_path_factory.mktemp("egi") / "recording.raw"
+    with open(fname, "wb") as file:
+        file.write(header + data.astype(">i2").tobytes())
+    return fname
+
+
+@pytest.mark.parametrize("memmap", (False, True))
+def test_read_raw_egi(egi_fname, tmp_path, monkeypatch, memmap):
+    """Test the chunked read against the data read by MNE."""
+    # the module is shadowed by the function in the package namespace, and
+    # the last chunk is partial
+    module = sys.modules[read_raw_egi.__module__]
+    monkeypatch.setattr(module, "_CHUNK_SIZE", 300)
+    preload = tmp_path / "data.dat" if memmap else True
+    raw = read_raw_egi(egi_fname, preload=preload)
+    raw_mne = mne.io.read_raw_egi(egi_fname, preload=True)
+
+    # the 53 bad channels are dropped, the order is preserved
+    eeg_chs = [ch for ch in raw_mne.ch_names[:257] if ch in raw.ch_names]
+    assert len(eeg_chs) == 204
+    assert "E31" not in eeg_chs and "E256" not in eeg_chs
+    assert "E257" in eeg_chs
+    assert raw.ch_names == eeg_chs + ["TRIGGER"]
+    assert raw.get_channel_types(picks="TRIGGER") == ["stim"]
+    assert raw.get_montage() is not None
+    if memmap:
+        assert isinstance(raw._data, np.memmap)
+        assert raw._data.filename == preload
+    assert np.allclose(
+        raw.get_data(picks=eeg_chs), raw_mne.get_data(picks=eeg_chs)
+    )
+    trigger = raw.get_data(picks="TRIGGER")[0]
+    assert np.array_equal(
+        trigger, raw_mne.get_data(picks=["DIN1", "DIN2"]).sum(axis=0)
+    )
+    assert np.array_equal(np.nonzero(trigger)[0], [100, 250, 400, 700, 850])
+
+
+def test_read_raw_egi_preload(egi_fname):
+    """Test that the data can not be left on disk."""
+    with pytest.raises(ValueError, match="must be True or a path"):
+        read_raw_egi(egi_fname, preload=False)
@@ -0,0 +1,78 @@
+"""Test read_raw_xdf.py"""
+
+import shutil
+
+import numpy as np
+import pytest
+
+from ..read_raw_xdf import _select_stream_ids, read_raw_xdf
+
+
+def test_select_stream_ids(tmp_path):
+    """Test the selection of the streams from their headers."""
+    stream_infos = [
+        dict(stream_id=1, name="WS-1"),
+        dict(stream_id=2, name="Video"),
+        dict(stream_id=3, name="PSD-markers"),
+        dict(stream_id=4, name=None),
+        dict(stream_id=5, name="WS-2"),
+    ]
+    args = ("WS-", "PSD-markers")
+    assert _select_stream_ids(stream_infos, *args, None, tmp_path) == [1, 5, 3]
+    assert _select_stream_ids(stream_infos, *args, ["2"], tmp_path) == [5, 3]
+    with pytest.raises(ValueError, match="No amplifier stream"):
+        _select_stream_ids(stream_infos, *args, ["WS-3"], tmp_path)
+
+
+def test_read_raw_xdf_select_streams(xdf_fname):
+    """Test the selection of the amplifier streams."""
+    raws, stream_names = read_raw_xdf(xdf_fname)
+    assert stream_names == ["WS-1", "WS-2"]  # 'WS-late' is skipped
+    assert raws[0].ch_names == ["TRIGGER", "Fz", "Cz", "Pz"]
+    raws, stream_names = read_raw_xdf(xdf_fname, select_streams="WS-2")
+    assert stream_names == ["WS-2"]
+    assert len(raws) == 1
+    with pytest.raises(ValueError, match="No amplifier stream"):
+        read_raw_xdf(xdf_fname, select_streams=["WS-3"])
+
+
+def test_read_raw_xdf_events(xdf_fname):
+    """Test the markers added on the TRIGGER channel."""
+    (raw,), _ = read_raw_xdf(xdf_fname, select_streams="WS-1")
+    # markers mapped one by one on the next sample
+    times = 10 + np.arange(raw.n_times) / 100
+    expected = np.zeros(raw.n_times)
+    for timestamp, value in ((10.5, 1), (11.004, 2), (11.5, 1)):
+        expected[np.searchsorted(times, timestamp)] = value
+    trigger = raw.get_data(picks="TRIGGER")[0]
+    assert np.array_equal(trigger, expected)
+    assert np.array_equal(np.nonzero(trigger)[0], [50, 101, 150])
+
+
+def test_read_raw_xdf_n_jobs(xdf_fname):
+    """Test that the raws are returned in the same order with n_jobs."""
+    raws, stream_names = read_raw_xdf(xdf_fname, n_jobs=1)
+    raws_, stream_names_ = read_raw_xdf(xdf_fname, n_jobs=2)
+    assert stream_names == stream_names_ == ["WS-1", "WS-2"]
+    for raw, raw_ in zip(raws, raws_):
+        assert np.array_equal(raw.get_data(), raw_.get_data())
+    with pytest.raises(ValueError, match="strictly positive"):
+        read_raw_xdf(xdf_fname, n_jobs=0)
+
+
+def test_read_raw_xdf_cache(xdf_fname, tmp_path, monkeypatch):
+    """Test that the cache is invalidated when the configuration changes."""
+    fname = tmp_path / xdf_fname.name
+    shutil.copy(xdf_fname, fname)
+    raws, stream_names = read_raw_xdf(fname, cache=True)
+    assert raws[0].preload
+    raws_, stream_names_ = read_raw_xdf(fname, cache=True)
+    assert not raws_[0].preload  # loaded from the cache
+    assert stream_names_ == stream_names
+    for raw, raw_ in zip(raws, raws_):
+        assert np.array_equal(raw.get_data(), raw_.get_data())
+
+    monkeypatch.setenv("PSD_TOPO_AMPLIFIER_PREFIX", "WS-2")
+    raws, stream_names = read_raw_xdf(fname, cache=True)
+    assert raws[0].preload
+    assert stream_names == ["WS-2"]
@@ -0,0 +1,75 @@
+"""Test read_raw_xdf_memmap.py"""
+
+import numpy as np
+import pytest
+from mne import find_events
+
+from ..read_raw_xdf import read_raw_xdf
+from ..read_raw_xdf_memmap import read_raw_xdf_memmap
+from .conftest import _CHANNELS, _chunk, _header, _samples
+
+
+@pytest.fixture(scope="module")
+def jittered_fname(tmp_path_factory):
+    """Create an XDF file with jittered timestamps.
+
+    The markers are on the jittered timestamps of the samples 50, 100 and 150,
+    which are after the dejittered timestamps.
+    """
+    rng = np.random.default_rng(101)
+    timestamps = 10 + np.arange(200) / 100
+    timestamps += rng.uniform(-1e-3, 1e-3, size=timestamps.size)
+    timestamps[[50, 100, 150]] += 2e-3
+    content = b"XDF:" + _chunk(1, b"<info><version>1.0</version></info>")
+    content += _header(1, "WS-1", "float32", 100, _CHANNELS)
+    content += _header(2, "PSD-markers", "int32", 0, [("M", "Markers", "")])
+    data = rng.normal(size=(200, len(_CHANNELS))) * 10
+    data[:, -1] = 0
+    content += _samples(1, timestamps, data)
+    markers = np.array([[1], [2], [1]])
+    content += _samples(2, timestamps[[50, 100, 150]], markers, dtype="<i4")
+    fname = tmp_path_factory.mktemp("xdf") / "jittered.xdf"
+    with open(fname, "wb") as file:
+        file.write(content)
+    return fname
+
+
+def test_read_raw_xdf_memmap(xdf_fname, tmp_path):
+    """Test that the raws are backed by memory-mapped arrays."""
+    raws, stream_names = read_raw_xdf_memmap(xdf_fname, tmp_path)
+    raws_ref, stream_names_ref = read_raw_xdf(xdf_fname)
+    assert stream_names == stream_names_ref == ["WS-1", "WS-2"]
+    for raw, raw_ref in zip(raws, raws_ref):
+        assert isinstance(raw._data, np.memmap)
+        assert raw._data.filename.parent == tmp_path
+        assert raw.ch_names == raw_ref.ch_names
+        assert raw.info["sfreq"] == raw_ref.info["sfreq"]
+        assert np.allclose(raw.get_data(), raw_ref.get_data())
+    assert sorted(elt.name for elt in tmp_path.iterdir()) == [
+        "stream-1.dat",
+        "stream-5.dat",
+    ]
+
+
+def test_read_raw_xdf_memmap_select_streams(xdf_fname, tmp_path):
+    """Test the selection of the amplifier streams."""
+    raws, stream_names = read_raw_xdf_memmap(
+        xdf_fname, tmp_path, select_streams="WS-2"
+    )
+    assert stream_names == ["WS-2"]
+    assert len(raws) == 1
+    assert [elt.name for elt in tmp_path.iterdir()] == ["stream-5.dat"]
+    with pytest.raises(ValueError, match="No amplifier stream"):
+        read_raw_xdf_memmap(xdf_fname, tmp_path, select_streams=["WS-3"])
+
+
+def test_read_raw_xdf_memmap_dejitter(jittered_fname, tmp_path):
+    """Test that the markers fall on the same samples as read_raw_xdf."""
+    raw = read_raw_xdf_memmap(jittered_fname, tmp_path)[0][0]
+    raw_ref = read_raw_xdf(jittered_fname)[0][0]
+    events = find_events(raw, stim_channel="TRIGGER")
+    events_ref = find_events(raw_ref, stim_channel="TRIGGER")
+    assert np.array_equal(events, events_ref)
+    # the markers are after the dejittered timestamps of their samples
+    assert np.array_equal(events[:, 0], [51, 101, 151])
+    assert np.array_equal(events[:, 2], [1, 2, 1])
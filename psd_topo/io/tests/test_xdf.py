@@ -0,0 +1,63 @@
+"""Test _xdf.py"""
+
+import struct
+
+import numpy as np
+
+from .._xdf import _parse_samples, _scan_xdf, iter_xdf_chunks
+from .conftest import _CHANNELS, _chunk, _header, _samples
+
+
+def test_iter_xdf_chunks(tmp_path):
+    """Test iteration over the samples chunks of an XDF file."""
+    rng = np.random.default_rng(101)
+    data = rng.normal(size=(20, 3)).astype(np.float32)
+    timestamps = 10 + np.arange(20) / 100
+    content = b"XDF:" + _chunk(1, b"<info><version>1.0</version></info>")
+    content += _header(1, "WS-test", "float32", 100, _CHANNELS[:3])
+    content += _header(2, "Video", "float32", 30, _CHANNELS[:2])
+    content += _samples(1, timestamps[:12], data[:12])
+    content += _samples(2, timestamps[:2], data[:2, :2])
+    content += _samples(1, timestamps[12:], data[12:])
+    content += _chunk(4, struct.pack("<Idd", 1, 10.0, 0.5))
+    fname = tmp_path / "test.xdf"
+    with open(fname, "wb") as file:
+        file.write(content)
+
+    streams = _scan_xdf(fname)
+    assert sorted(streams) == [1, 2]
+    assert streams[1]["name"] == "WS-test"
+    assert streams[1]["n_samples"] == 20
+    assert streams[2]["n_samples"] == 2
+    assert streams[1]["clock_values"] == [0.5]
+
+    chunks = list(iter_xdf_chunks(fname, stream_ids=[1]))
+    assert len(chunks) == 2
+    assert all(stream_id == 1 for stream_id, _, _ in chunks)
+    assert np.array_equal(
+        np.concatenate([elt[1] for elt in chunks]), timestamps
+    )
+    assert np.array_equal(np.concatenate([elt[2] for elt in chunks]), data)
+    assert len(list(iter_xdf_chunks(fname))) == 3
+
+
+def test_parse_samples():
+    """Test parsing of samples with omitted timestamps and strings."""
+    header = dict(
+        channel_count=["2"], channel_format=["int16"], nominal_srate=["10"]
+    )
+    body = struct.pack("<BBBd2h", 1, 2, 8, 1.0, 1, 2)
+    body += struct.pack("<B2h", 0, 3, 4)
+    timestamps, samples = _parse_samples(body, header, 0.0)
+    assert np.allclose(timestamps, [1.0, 1.1])
+    assert np.array_equal(samples, [[1, 2], [3, 4]])
+    assert samples.dtype == np.int16
+
+    header = dict(
+        channel_count=["1"], channel_format=["string"], nominal_srate=["0"]
+    )
+    body = struct.pack("<BBB", 1, 2, 0) + struct.pack("<BB", 1, 3) + b"abc"
+    body += struct.pack("<Bd", 8, 5.0) + struct.pack("<BB", 1, 1) + b"d"
+    timestamps, samples = _parse_samples(body, header, 4.0)
+    assert np.allclose(timestamps, [4.0, 5.0])
+    assert samples.tolist() == [["abc"], ["d"]]
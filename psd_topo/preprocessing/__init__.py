@@ -0,0 +1,25 @@
+"""Preprocessing module."""
+
+import importlib
+
+# lazy imports, the preprocessing classes depend on mne and scipy
+_classes = dict(
+    ArtifactDetector="artifact",
+    ExponentialSmoothing="smoothing",
+    OnlineFilter="filter",
+    Reference="reference",
+    SpatialFilter="spatial_filter",
+)
+
+
+def __getattr__(name: str):
+    """Lazy import of the preprocessing classes."""
+    if name in _classes:
+        module = importlib.import_module(f".{_classes[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Add the lazy imported classes to the module attributes."""
+    return sorted(list(globals()) + list(_classes))
@@ -0,0 +1,211 @@
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+from mne import Info
+from numpy.typing import NDArray
+
+from ..utils._checks import _check_type
+from ..utils._docs import fill_doc
+from ..utils._logs import _RateLimit, logger
+from .spatial_filter import _get_neighbors
+
+
+@fill_doc
+class ArtifactDetector:
+    """Per-window detection of the contaminated channels.
+
+    The peak-to-peak amplitude, the standard deviation and the robust z-score
+    of the log-variance across channels are computed at once for all the
+    channels of a window. A channel is bad if:
+
+    * its peak-to-peak amplitude is above 'ptp';
+    * its standard deviation is below 'flat';
+    * the robust z-score of its log-variance is above 'zscore'.
+
+    A window with more than 'max_bad' bad channels is rejected. Otherwise, the
+    bad channels can be interpolated from their closest good neighbors with
+    the matrix returned by `~ArtifactDetector.interpolation`.
+
+    Parameters
+    ----------
+    %(info)s
+    ptp : float | None
+        Maximum peak-to-peak amplitude of a channel, in the unit of the data.
+        None to disable.
+    flat : float | None
+        Minimum standard deviation of a channel, in the unit of the data.
+        None to disable.
+    zscore : float | None
+        Maximum robust z-score of the log-variance of a channel, computed
+        across channels with the median and the median absolute deviation.
+        None to disable.
+    max_bad : float
+        Maximum ratio of bad channels, between 0 and 1, above which the window
+        is rejected.
+    n_neighbors : int
+        Number of neighbors used to interpolate a bad channel.
+    """
+
+    def __init__(
+        self,
+        info: Info,
+        ptp: Optional[float] = None,
+        flat: Optional[float] = None,
+        zscore: Optional[float] = 5.0,
+        max_bad: float = 0.2,
+        n_neighbors: int = 4,
+    ):
+        _check_type(info, (Info,), "info")
+        for value, name in (
+            (ptp, "ptp"),
+            (flat, "flat"),
+            (zscore, "zscore"),
+        ):
+            _check_type(value, ("numeric", None), name)
+            if value is not None and value <= 0:
+                raise ValueError(
+                    f"The threshold '{name}' must be a strictly positive "
+                    f"number. {value} is invalid."
+                )
+        _check_type(max_bad, ("numeric",), "max_bad")
+        if not 0 <= max_bad <= 1:
+            raise ValueError(
+                "The ratio of bad channels 'max_bad' must be between 0 and 1. "
+                f"{max_bad} is invalid."
+            )
+        _check_type(n_neighbors, ("int",), "n_neighbors")
+        if n_neighbors <= 0:
+            raise ValueError(
+                "The number of neighbors 'n_neighbors' must be a strictly "
+                f"positive integer. {n_neighbors} is invalid."
+            )
+        self._info = info
+        self._ptp = ptp
+        self._flat = flat
+        self._zscore = zscore
+        self._max_bad = max_bad
+        self._neighbors = _get_neighbors(info, n_neighbors)
+        # cache of the last interpolation matrix
+        self._interpolation_bads = None
+        self._interpolation = None
+        self._log_rate = _RateLimit(1.0)
+        self.reset()
+
+    def detect(self, data: NDArray[float]) -> Tuple[NDArray[bool], bool]:
+        """Detect the bad channels of a window.
+
+        Parameters
+        ----------
+        data : array
+            2D array of shape (n_channels, n_times).
+
+        Returns
+        -------
+        bads : array
+            1D boolean array of shape (n_channels,), True for bad channels.
+        reject : bool
+            True if the window is rejected.
+        """
+        n_channels = data.shape[0]
+        bads = np.zeros(n_channels, dtype=bool)
+        if self._ptp is not None:
+            bads |= self._ptp < np.ptp(data, axis=1)
+        variance = np.var(data, axis=1)
+        if self._flat is not None:
+            bads |= variance < self._flat**2
+        if self._zscore is not None:
+            logvar = np.log(np.maximum(variance, np.finfo(float).tiny))
+            median = np.median(logvar)
+            # 1.4826 scales the MAD to the standard deviation of a normal
+            mad = 1.4826 * np.median(np.abs(logvar - median))
+            if mad != 0:
+                bads |= self._zscore < (logvar - median) / mad
+        reject = self._max_bad * n_channels < np.count_nonzero(bads)
+
+        # update counters
+        self._n_frames += 1
+        self._bad_counts += bads
+        if reject:
+            self._n_rejected += 1
+            if logger.isEnabledFor(logging.DEBUG) and self._log_rate():
+                logger.debug(
+                    "Artifact: window rejected, %i / %i bad channels.",
+                    np.count_nonzero(bads),
+                    n_channels,
+                )
+        elif bads.any():
+            self._n_interpolated += 1
+        return bads, reject
+
+    def interpolation(self, bads: NDArray[bool]) -> NDArray[float]:
+        """Matrix replacing the bad channels with their good neighbors.
+
+        Parameters
+        ----------
+        bads : array
+            1D boolean array of shape (n_channels,), True for bad channels.
+
+        Returns
+        -------
+        matrix : array
+            2D array of shape (n_channels, n_channels). Each bad channel is
+            replaced by the average of its good neighbors, or by the average of
+            all the good channels if all its neighbors are bad. The matrix is
+            cached and reused as long as the bad channels do not change.
+        """
+        if self._interpolation_bads is not None and np.array_equal(
+            bads, self._interpolation_bads
+        ):
+            return self._interpolation
+        matrix = np.eye(bads.size)
+        good = np.flatnonzero(~bads)
+        for k in np.flatnonzero(bads):
+            neighbors = self._neighbors[k][~bads[self._neighbors[k]]]
+            if neighbors.size == 0:
+                neighbors = good
+            matrix[k] = 0
+            matrix[k, neighbors] = 1.0 / neighbors.size
+        self._interpolation_bads = bads.copy()
+        self._interpolation = matrix
+        return matrix
+
+    def reset(self) -> None:
+        """Reset the counters."""
+        self._n_frames = 0
+        self._n_rejected = 0
+        self._n_interpolated = 0
+        self._bad_counts = np.zeros(len(self._info["ch_names"]), dtype=int)
+
+    # ------------------------------------------------------------------------
+    @property
+    def n_frames(self) -> int:
+        """Number of windows processed.
+
+        :type: int
+        """
+        return self._n_frames
+
+    @property
+    def n_rejected(self) -> int:
+        """Number of windows rejected.
+
+        :type: int
+        """
+        return self._n_rejected
+
+    @property
+    def n_interpolated(self) -> int:
+        """Number of windows with interpolated bad channels.
+
+        :type: int
+        """
+        return self._n_interpolated
+
+    @property
+    def bad_counts(self) -> NDArray[int]:
+        """Number of windows in which each channel was bad.
+
+        :type: array
+        """
+        return self._bad_counts
@@ -0,0 +1,170 @@
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.signal import butter, iirnotch, sosfilt, sosfilt_zi, tf2sos
+
+from ..utils._checks import _check_type
+
+# quality factor of the notch filters, i.e. a -3 dB bandwidth of f0 / 30, about
+# 1.7 Hz at 50 Hz
+_NOTCH_Q = 30
+
+
+class OnlineFilter:
+    """Causal IIR filter applied to the new samples of each window.
+
+    The filter state is carried between windows, thus each sample is filtered
+    once, when it is received. The filtered samples are stored in a buffer of
+    the size of the acquisition window, which is returned in place of the
+    window received.
+
+    Parameters
+    ----------
+    sfreq : float
+        Sampling frequency in Hz.
+    n_channels : int
+        Number of channels.
+    n_times : int
+        Number of samples in the acquisition window.
+    l_freq : float | None
+        Low cut-off frequency in Hz. None to disable the high-pass.
+    h_freq : float | None
+        High cut-off frequency in Hz. None to disable the low-pass.
+    notch : float | tuple of float | None
+        Frequency or frequencies in Hz removed with a notch filter, e.g. the
+        line noise frequency and its harmonics. None to disable.
+    order : int
+        Order of the Butterworth band-pass, high-pass or low-pass filter.
+    """
+
+    def __init__(
+        self,
+        sfreq: float,
+        n_channels: int,
+        n_times: int,
+        l_freq: Optional[float] = None,
+        h_freq: Optional[float] = None,
+        notch: Optional[Union[float, Tuple[float, ...]]] = None,
+        order: int = 4,
+    ):
+        _check_type(sfreq, ("numeric",), "sfreq")
+        if sfreq <= 0:
+            raise ValueError(
+                "The sampling frequency 'sfreq' must be strictly positive."
+            )
+        _check_type(n_channels, ("int",), "n_channels")
+        _check_type(n_times, ("int",), "n_times")
+        _check_type(l_freq, ("numeric", None), "l_freq")
+        _check_type(h_freq, ("numeric", None), "h_freq")
+        _check_type(notch, ("numeric", tuple, list, None), "notch")
+        if notch is None:
+            notch = tuple()
+        elif isinstance(notch, (tuple, list)):
+            notch = tuple(notch)
+        else:
+            notch = (notch,)
+        for freq in (l_freq, h_freq) + notch:
+            _check_type(freq, ("numeric", None), "frequency")
+            if freq is not None and not 0 < freq < sfreq / 2:
+                raise ValueError(
+                    "The frequencies must be strictly positive and below the "
+                    f"Nyquist frequency {sfreq / 2} Hz. {freq} is invalid."
+                )
+        if l_freq is not None and h_freq is not None and h_freq <= l_freq:
+            raise ValueError(
+                "The high cut-off frequency 'h_freq' must be above the low "
+                "cut-off frequency 'l_freq'."
+            )
+        _check_type(order, ("int",), "order")
+
+        self._sos = _design_filter(sfreq, l_freq, h_freq, notch, order)
+        self._zi = None  # initialized on the first sample
+        self._buffer = np.zeros((n_times, n_channels))
+        self._n_filled = 0
+        self._last_timestamp = -np.inf
+
+    def apply(
+        self, data: NDArray[float], timestamps: NDArray[float]
+    ) -> NDArray[float]:
+        """Filter the new samples of a window.
+
+        Parameters
+        ----------
+        data : array
+            2D array of shape (n_times, n_channels) containing the received
+            data, as returned by ``StreamReceiver.get_window``.
+        timestamps : array
+            1D array of shape (n_times,) containing the timestamps of the
+            samples. The samples more recent than the last sample of the
+            previous call are filtered.
+
+        Returns
+        -------
+        data : array
+            2D array of shape (n_times, n_channels) containing the filtered
+            data. The array is a buffer updated in-place by the next call.
+        """
+        start = np.searchsorted(timestamps, self._last_timestamp, "right")
+        new = data[start:]
+        if new.shape[0] == 0:
+            return self._buffer[self._buffer.shape[0] - self._n_filled :]
+        self._last_timestamp = timestamps[-1]
+        if self._zi is None:
+            # steady-state initial conditions for the first sample
+            self._zi = sosfilt_zi(self._sos)[:, :, np.newaxis] * new[0]
+        new, self._zi = sosfilt(self._sos, new, axis=0, zi=self._zi)
+        # shift the buffer and append the new samples
+        n_new = min(new.shape[0], self._buffer.shape[0])
+        self._buffer[:-n_new] = self._buffer[n_new:]
+        self._buffer[-n_new:] = new[-n_new:]
+        self._n_filled = min(self._n_filled + n_new, self._buffer.shape[0])
+        return self._buffer[self._buffer.shape[0] - self._n_filled :]
+
+    def reset(self) -> None:
+        """Reset the filter state and the buffer."""
+        self._zi = None
+        self._buffer.fill(0)
+        self._n_filled = 0
+        self._last_timestamp = -np.inf
+
+    # ------------------------------------------------------------------------
+    @property
+    def sos(self) -> NDArray[float]:
+        """Second-order sections of the filter.
+
+        :type: array
+        """
+        return self._sos
+
+
+@lru_cache(maxsize=32)
+def _design_filter(
+    sfreq: float,
+    l_freq: Optional[float],
+    h_freq: Optional[float],
+    notch: Tuple[float, ...],
+    order: int,
+) -> NDArray[float]:
+    """Design the filter second-order sections.
+
+    The design is cached as it only depends on the sampling frequency and the
+    frequencies, which are fixed in the online loops.
+    """
+    sos = list()
+    if l_freq is not None and h_freq is not None:
+        sos.append(
+            butter(order, (l_freq, h_freq), "bandpass", output="sos", fs=sfreq)
+        )
+    elif l_freq is not None:
+        sos.append(butter(order, l_freq, "highpass", output="sos", fs=sfreq))
+    elif h_freq is not None:
+        sos.append(butter(order, h_freq, "lowpass", output="sos", fs=sfreq))
+    for freq in notch:
+        sos.append(tf2sos(*iirnotch(freq, _NOTCH_Q, fs=sfreq)))
+    if len(sos) == 0:
+        raise ValueError(
+            "At least one of 'l_freq', 'h_freq' or 'notch' must be provided."
+        )
+    return np.vstack(sos)
@@ -0,0 +1,145 @@
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..utils._checks import _check_type, _check_value
+
+
+class Reference:
+    """Channel selection and re-referencing applied as one linear operator.
+
+    The selection of the channels of interest and the re-referencing are
+    combined in a single precomputed matrix of shape (n_outputs, n_channels),
+    applied with one matrix product per window. The output is written in a
+    preallocated channel-major buffer, ready for `psd_topo.fft`.
+
+    Parameters
+    ----------
+    ch_names : list of str
+        Name of the channels in the acquired data, e.g. all the channels of the
+        LSL stream.
+    picks : list of str | None
+        Name of the channels to keep, in the output order. If None, all the
+        channels are kept.
+    reference : str | list of str | list of tuple | None
+        Reference applied to the selected channels. "average" applies a common
+        average reference across the selected channels. A channel name or a
+        list of channel names re-references to the (average of the)
+        channel(s), which do not need to be selected. A list of
+        (anode, cathode) tuples defines a bipolar montage, in which case
+        'picks' is ignored and the output channels are named
+        ``anode-cathode``. None to only select the channels.
+    """
+
+    def __init__(
+        self,
+        ch_names: List[str],
+        picks: Optional[List[str]] = None,
+        reference: Optional[
+            Union[str, List[str], List[Tuple[str, str]]]
+        ] = "average",
+    ):
+        _check_type(ch_names, (list, tuple), "ch_names")
+        for ch in ch_names:
+            _check_type(ch, (str,), "ch_name")
+        ch_names = list(ch_names)
+        if picks is None:
+            picks = ch_names
+        _check_type(picks, (list, tuple), "picks")
+        for ch in picks:
+            _check_value(ch, ch_names, "picks")
+        picks = [ch_names.index(ch) for ch in picks]
+
+        n_channels = len(ch_names)
+        if Reference._is_bipolar(reference):
+            operator = np.zeros((len(reference), n_channels))
+            self._ch_names = list()
+            for k, (anode, cathode) in enumerate(reference):
+                _check_value(anode, ch_names, "anode")
+                _check_value(cathode, ch_names, "cathode")
+                operator[k, ch_names.index(anode)] = 1.0
+                operator[k, ch_names.index(cathode)] -= 1.0
+                self._ch_names.append(f"{anode}-{cathode}")
+        else:
+            operator = np.zeros((len(picks), n_channels))
+            operator[np.arange(len(picks)), picks] = 1.0
+            self._ch_names = [ch_names[k] for k in picks]
+            if reference == "average":
+                operator[:, picks] -= 1.0 / len(picks)
+            elif reference is not None:
+                if isinstance(reference, str):
+                    reference = [reference]
+                _check_type(reference, (list, tuple), "reference")
+                if len(reference) == 0:
+                    raise ValueError(
+                        "The reference 'reference' must contain at least one "
+                        "channel."
+                    )
+                for ch in reference:
+                    _check_value(ch, ch_names, "reference")
+                ref_idx = [ch_names.index(ch) for ch in reference]
+                operator[:, ref_idx] -= 1.0 / len(ref_idx)
+        self._reference = reference
+        self._operator = operator
+        self._buffer = None
+
+    def apply(self, data: NDArray[float]) -> NDArray[float]:
+        """Select and re-reference the channels of a window.
+
+        Parameters
+        ----------
+        data : array
+            2D array of shape (n_times, n_channels) containing the received
+            data, as returned by ``StreamReceiver.get_window``.
+
+        Returns
+        -------
+        data : array
+            2D array of shape (n_outputs, n_times) containing the selected and
+            re-referenced data. The array is a buffer reused between calls,
+            thus it is overwritten by the next call.
+        """
+        n_times = data.shape[0]
+        if self._buffer is None or self._buffer.shape[1] != n_times:
+            self._buffer = np.empty((self._operator.shape[0], n_times))
+        np.matmul(self._operator, data.T, out=self._buffer)
+        return self._buffer
+
+    # ------------------------------------------------------------------------
+    @property
+    def ch_names(self) -> List[str]:
+        """Name of the output channels.
+
+        :type: list of str
+        """
+        return self._ch_names
+
+    @property
+    def operator(self) -> NDArray[float]:
+        """Linear operator of shape (n_outputs, n_channels).
+
+        :type: array
+        """
+        return self._operator
+
+    @property
+    def reference(self) -> Optional[Union[str, List[str], List[tuple]]]:
+        """Reference applied.
+
+        :type: str | list | None
+        """
+        return self._reference
+
+    # ------------------------------------------------------------------------
+    @staticmethod
+    def _is_bipolar(reference) -> bool:
+        """Check if the reference defines a bipolar montage."""
+        return (
+            isinstance(reference, (list, tuple))
+            and len(reference) != 0
+            and all(
+                isinstance(elt, (list, tuple)) and len(elt) == 2
+                for elt in reference
+            )
+        )
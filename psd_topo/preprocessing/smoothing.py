@@ -0,0 +1,85 @@
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..utils._checks import _check_type
+
+
+class ExponentialSmoothing:
+    """Exponential moving average of the band power across windows.
+
+    The smoothed value of each channel is updated with a one-pole low-pass
+    filter ``state += alpha * (value - state)``, where
+    ``alpha = 1 - exp(-dt / tau)`` depends on the time ``dt`` elapsed since the
+    last update. Thus, the time constant is independent of the rate at which
+    the online loop runs.
+
+    Parameters
+    ----------
+    tau : float
+        Time constant in seconds.
+    """
+
+    def __init__(self, tau: float):
+        _check_type(tau, ("numeric",), "tau")
+        if tau <= 0:
+            raise ValueError(
+                "The time constant 'tau' must be a strictly positive number. "
+                f"{tau} is invalid."
+            )
+        self._tau = tau
+        self._state = None
+        self._last_timestamp = None
+
+    def apply(
+        self, values: NDArray[float], timestamp: float
+    ) -> NDArray[float]:
+        """Update the smoothed values with a new frame.
+
+        Parameters
+        ----------
+        values : array
+            1D array of shape (n_channels,) containing the new values.
+        timestamp : float
+            Time of the new values in seconds, e.g. the timestamp of the last
+            sample of the window.
+
+        Returns
+        -------
+        state : array
+            1D array of shape (n_channels,) containing the smoothed values. The
+            array is updated in-place by the next call.
+        """
+        if self._state is None or self._state.shape != values.shape:
+            self._state = np.array(values, dtype=np.float64)
+            self._last_timestamp = timestamp
+            return self._state
+        dt = max(timestamp - self._last_timestamp, 0)
+        self._last_timestamp = timestamp
+        alpha = 1 - np.exp(-dt / self._tau)
+        # state += alpha * (values - state), in-place
+        self._state += alpha * (values - self._state)
+        return self._state
+
+    def reset(self) -> None:
+        """Reset the smoothed values."""
+        self._state = None
+        self._last_timestamp = None
+
+    # ------------------------------------------------------------------------
+    @property
+    def tau(self) -> float:
+        """Time constant in seconds.
+
+        :type: float
+        """
+        return self._tau
+
+    @property
+    def state(self) -> Optional[NDArray[float]]:
+        """Smoothed values, None before the first update.
+
+        :type: array | None
+        """
+        return self._state
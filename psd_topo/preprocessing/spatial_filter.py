@@ -0,0 +1,203 @@
+from typing import List, Optional
+
+import numpy as np
+from mne import Info
+from mne.io.proj import make_projector
+from mne.preprocessing import ICA
+from numpy.typing import NDArray
+from scipy import sparse
+
+from ..utils._checks import _check_type, _check_value
+from ..utils._docs import fill_doc
+
+
+@fill_doc
+class SpatialFilter:
+    """Spatial filter applied as a precomputed matrix.
+
+    The filter is defined once from the measurement information and stored as
+    a (n_channels, n_channels) matrix, applied with one matrix product per
+    window. Since the filter is linear, it can also be folded in the band
+    power computation with ``psd_topo.fft._fft(..., operator=matrix)``, in
+    which case it is applied on the frequency bins of the band of interest
+    instead of on the time samples.
+
+    Parameters
+    ----------
+    %(info)s
+    method : str | None
+        The spatial filter to apply:
+
+        * ``"laplacian"``: surface Laplacian (Hjorth) computed from the
+          'n_neighbors' closest channels of the montage.
+        * ``"average"``: common average reference.
+        * ``"ssp"``: removal of the SSP projectors in ``info["projs"]``.
+        * ``"ica"``: removal of the components ``ica.exclude`` of a fitted
+          ICA.
+        * None: identity.
+    n_neighbors : int
+        Number of neighbors used by the surface Laplacian.
+    ica : ICA | None
+        Fitted ICA, required for the ``"ica"`` method.
+    """
+
+    def __init__(
+        self,
+        info: Info,
+        method: Optional[str] = "laplacian",
+        n_neighbors: int = 4,
+        ica: Optional[ICA] = None,
+    ):
+        _check_type(info, (Info,), "info")
+        _check_value(
+            method, ("laplacian", "average", "ssp", "ica", None), "method"
+        )
+        _check_type(n_neighbors, ("int",), "n_neighbors")
+        if n_neighbors <= 0:
+            raise ValueError(
+                "The number of neighbors 'n_neighbors' must be a strictly "
+                f"positive integer. {n_neighbors} is invalid."
+            )
+        self._info = info
+        self._method = method
+        n_channels = len(info["ch_names"])
+        if method == "laplacian":
+            matrix = _laplacian(info, n_neighbors)
+        elif method == "average":
+            matrix = np.eye(n_channels) - 1.0 / n_channels
+        elif method == "ssp":
+            if len(info["projs"]) == 0:
+                raise ValueError(
+                    "The SSP spatial filter requires SSP projectors in "
+                    "info['projs']."
+                )
+            matrix, _, _ = make_projector(
+                info["projs"], info["ch_names"], include_active=True
+            )
+        elif method == "ica":
+            _check_type(ica, (ICA,), "ica")
+            matrix = _ica_projector(ica, info["ch_names"])
+        else:
+            matrix = np.eye(n_channels)
+        self._matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+        # a sparse representation is faster only for sparse large matrices
+        density = np.count_nonzero(self._matrix) / self._matrix.size
+        self._sparse = (
+            sparse.csr_matrix(self._matrix)
+            if 64 <= n_channels and density < 0.1
+            else None
+        )
+        self._buffer = None
+
+    def apply(self, data: NDArray[float]) -> NDArray[float]:
+        """Apply the spatial filter.
+
+        Parameters
+        ----------
+        data : array
+            2D array of shape (n_channels, n_times).
+
+        Returns
+        -------
+        data : array
+            2D array of shape (n_channels, n_times) containing the filtered
+            data. The array is a buffer reused between calls, thus it is
+            overwritten by the next call.
+        """
+        if self._sparse is not None:
+            return self._sparse @ data
+        if self._buffer is None or self._buffer.shape != data.shape:
+            self._buffer = np.empty(data.shape)
+        np.matmul(self._matrix, data, out=self._buffer)
+        return self._buffer
+
+    # ------------------------------------------------------------------------
+    @property
+    def ch_names(self) -> List[str]:
+        """Name of the channels.
+
+        :type: list of str
+        """
+        return self._info["ch_names"]
+
+    @property
+    def matrix(self) -> NDArray[float]:
+        """Spatial filter of shape (n_channels, n_channels).
+
+        :type: array
+        """
+        return self._matrix
+
+    @property
+    def method(self) -> Optional[str]:
+        """Spatial filter method.
+
+        :type: str | None
+        """
+        return self._method
+
+
+def _laplacian(info: Info, n_neighbors: int) -> NDArray[float]:
+    """Compute a surface Laplacian from the closest neighbors."""
+    neighbors = _get_neighbors(info, n_neighbors)
+    n_channels = neighbors.shape[0]
+    matrix = np.eye(n_channels)
+    rows = np.repeat(np.arange(n_channels), n_neighbors)
+    matrix[rows, neighbors.ravel()] = -1.0 / n_neighbors
+    return matrix
+
+
+def _get_neighbors(info: Info, n_neighbors: int) -> NDArray[int]:
+    """Find the closest neighbors of each channel from the montage.
+
+    Returns
+    -------
+    neighbors : array
+        2D array of shape (n_channels, n_neighbors) containing the index of the
+        neighbors, sorted by increasing distance.
+    """
+    pos = np.array([ch["loc"][:3] for ch in info["chs"]])
+    if np.any(np.isnan(pos)) or np.allclose(pos, 0):
+        raise ValueError(
+            "The search for the closest neighbors requires a montage with "
+            "the position of all channels."
+        )
+    n_channels = pos.shape[0]
+    if n_channels <= n_neighbors:
+        raise ValueError(
+            f"The search for {n_neighbors} neighbors requires at least "
+            f"{n_neighbors + 1} channels."
+        )
+    distances = np.linalg.norm(pos[:, np.newaxis] - pos[np.newaxis], axis=-1)
+    np.fill_diagonal(distances, np.inf)
+    return np.argsort(distances, axis=1)[:, :n_neighbors]
+
+
+def _ica_projector(ica: ICA, ch_names: List[str]) -> NDArray[float]:
+    """Compute the projector removing the excluded ICA components."""
+    if ica.current_fit == "unfitted":
+        raise ValueError("The ICA must be fitted.")
+    for ch in ica.ch_names:
+        _check_value(ch, ch_names, "ICA channel")
+    n_pca = ica.pca_components_.shape[0]
+    n_components = ica.n_components_
+    unmixing = np.eye(n_pca)
+    unmixing[:n_components, :n_components] = ica.unmixing_matrix_
+    unmixing = unmixing @ ica.pca_components_
+    mixing = np.eye(n_pca)
+    mixing[:n_components, :n_components] = ica.mixing_matrix_
+    mixing = ica.pca_components_.T @ mixing
+    exclude = np.array(ica.exclude, dtype=int)
+    projector = np.eye(len(ica.ch_names))
+    projector -= mixing[:, exclude] @ unmixing[exclude, :]
+    # projector is defined on pre-whitened data
+    if ica.pre_whitener_.shape[1] == 1:
+        whitener = np.diag(1.0 / ica.pre_whitener_[:, 0])
+    else:
+        whitener = ica.pre_whitener_
+    projector = np.linalg.pinv(whitener) @ projector @ whitener
+    # embed in the channels of info, channels not used by ICA are unchanged
+    picks = [ch_names.index(ch) for ch in ica.ch_names]
+    matrix = np.eye(len(ch_names))
+    matrix[np.ix_(picks, picks)] = projector
+    return matrix
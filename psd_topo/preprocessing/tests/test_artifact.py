@@ -0,0 +1,60 @@
+"""Test artifact.py"""
+
+import numpy as np
+import pytest
+
+from ..artifact import ArtifactDetector
+
+
+def test_detect(info, ch_names, data):
+    """Test the detection of bad channels."""
+    detector = ArtifactDetector(info, ptp=20, flat=0.1, zscore=5)
+    bads, reject = detector.detect(data)
+    assert not bads.any()
+    assert not reject
+
+    # blink on Fp1, flat O2
+    data[0, 100:150] += 50
+    data[-1] = 0
+    bads, reject = detector.detect(data)
+    assert np.flatnonzero(bads).tolist() == [0, len(ch_names) - 1]
+    assert not reject
+    # rejected window
+    data[:5] *= 100
+    bads, reject = detector.detect(data)
+    assert reject
+
+    assert detector.n_frames == 3
+    assert detector.n_rejected == 1
+    assert detector.n_interpolated == 1
+    assert detector.bad_counts[0] == 2
+    detector.reset()
+    assert detector.n_frames == 0
+    assert np.all(detector.bad_counts == 0)
+
+    # invalid
+    with pytest.raises(ValueError, match="strictly positive"):
+        ArtifactDetector(info, ptp=-1)
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        ArtifactDetector(info, max_bad=2)
+
+
+def test_interpolation(info, ch_names):
+    """Test the interpolation of bad channels."""
+    detector = ArtifactDetector(info, n_neighbors=3)
+    bads = np.zeros(len(ch_names), dtype=bool)
+    bads[ch_names.index("Cz")] = True
+    matrix = detector.interpolation(bads)
+    assert np.allclose(matrix.sum(axis=1), 1)
+    assert matrix[ch_names.index("Cz"), ch_names.index("Cz")] == 0
+    assert np.count_nonzero(matrix[ch_names.index("Cz")]) == 3
+    # good channels are unchanged
+    good = np.flatnonzero(~bads)
+    assert np.allclose(matrix[good], np.eye(len(ch_names))[good])
+    # cached
+    assert detector.interpolation(bads.copy()) is matrix
+    # all neighbors are bad
+    bads[:] = True
+    bads[0] = False
+    matrix = detector.interpolation(bads)
+    assert np.allclose(matrix[:, 0], 1)
@@ -0,0 +1,49 @@
+"""Test filter.py"""
+
+import numpy as np
+import pytest
+from scipy.signal import sosfilt, sosfilt_zi
+
+from ..filter import OnlineFilter, _design_filter
+
+
+def test_online_filter():
+    """Test that overlapping windows are equivalent to an offline filter."""
+    rng = np.random.default_rng(101)
+    sfreq, n_times, n_channels = 256, 128, 3
+    data = rng.normal(size=(1000, n_channels)) + 10  # DC offset
+    timestamps = np.arange(data.shape[0]) / sfreq
+    online_filter = OnlineFilter(
+        sfreq, n_channels, n_times, l_freq=1, h_freq=40, notch=50
+    )
+    # offline filter with the same initial conditions
+    sos = online_filter.sos
+    zi = sosfilt_zi(sos)[:, :, np.newaxis] * data[0]
+    expected, _ = sosfilt(sos, data, axis=0, zi=zi)
+
+    # windows growing until the buffer is full, then sliding by 40 samples
+    for stop in (50, 100, 128, 168, 208, 208, 300):
+        start = max(0, stop - n_times)
+        out = online_filter.apply(data[start:stop], timestamps[start:stop])
+        assert out.shape == (min(stop, n_times), n_channels)
+        assert np.allclose(out, expected[start:stop])
+
+    online_filter.reset()
+    out = online_filter.apply(data[:10], timestamps[:10])
+    assert np.allclose(out, expected[:10])
+
+
+def test_design_filter():
+    """Test the filter design and its validation."""
+    sos = _design_filter(256, 1, None, (50, 100), 4)
+    assert sos.shape == (4, 6)  # 2 high-pass sections and 2 notch sections
+    assert _design_filter(256, 1, None, (50, 100), 4) is sos
+    # numpy scalars
+    for notch in (np.float32(50), np.int64(50)):
+        assert OnlineFilter(256, 3, 128, notch=notch).sos.shape == (1, 6)
+    with pytest.raises(ValueError, match="At least one"):
+        OnlineFilter(256, 3, 128)
+    with pytest.raises(ValueError, match="Nyquist"):
+        OnlineFilter(256, 3, 128, h_freq=200)
+    with pytest.raises(ValueError, match="above the low"):
+        OnlineFilter(256, 3, 128, l_freq=30, h_freq=10)
@@ -0,0 +1,50 @@
+"""Test reference.py"""
+
+import numpy as np
+import pytest
+
+from ..reference import Reference
+
+
+def test_reference():
+    """Test the channel selection and re-referencing operator."""
+    rng = np.random.default_rng(101)
+    ch_names = ["TRIGGER", "Fp1", "Fp2", "O1", "O2", "A2"]
+    data = rng.normal(size=(256, len(ch_names)))  # (n_times, n_channels)
+    picks = ["Fp1", "Fp2", "O1", "O2"]
+    eeg = data[:, 1:5].T
+
+    # selection only
+    ref = Reference(ch_names, picks, reference=None)
+    assert ref.ch_names == picks
+    assert np.allclose(ref.apply(data), eeg)
+
+    # common average reference
+    ref = Reference(ch_names, picks, reference="average")
+    out = ref.apply(data)
+    assert out.shape == (4, 256)
+    assert np.allclose(out, eeg - np.average(eeg, axis=0))
+    # the output buffer is reused
+    assert ref.apply(data) is out
+    assert ref.apply(data[:128]).shape == (4, 128)
+
+    # reference to channel(s) which are not selected
+    ref = Reference(ch_names, picks, reference="A2")
+    assert np.allclose(ref.apply(data), eeg - data[:, 5])
+    ref = Reference(ch_names, picks, reference=["O1", "A2"])
+    expected = eeg - np.average(data[:, [3, 5]], axis=1)
+    assert np.allclose(ref.apply(data), expected)
+
+    # bipolar montage
+    ref = Reference(ch_names, reference=[("Fp1", "O1"), ("Fp2", "O2")])
+    assert ref.ch_names == ["Fp1-O1", "Fp2-O2"]
+    assert np.allclose(ref.apply(data)[0], data[:, 1] - data[:, 3])
+    assert np.allclose(ref.apply(data)[1], data[:, 2] - data[:, 4])
+
+    # invalid
+    with pytest.raises(ValueError, match="Invalid value"):
+        Reference(ch_names, ["Cz"])
+    with pytest.raises(ValueError, match="Invalid value"):
+        Reference(ch_names, picks, reference="Cz")
+    with pytest.raises(ValueError, match="at least one channel"):
+        Reference(ch_names, picks, reference=[])
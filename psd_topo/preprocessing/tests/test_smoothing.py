@@ -0,0 +1,29 @@
+"""Test smoothing.py"""
+
+import numpy as np
+import pytest
+
+from ..smoothing import ExponentialSmoothing
+
+
+def test_exponential_smoothing():
+    """Test the exponential moving average."""
+    smoothing = ExponentialSmoothing(tau=1.0)
+    assert smoothing.state is None
+    state = smoothing.apply(np.zeros(3), 0.0)
+    assert np.allclose(state, 0)
+    # after one time constant, 1 - 1/e of a step is reached
+    out = smoothing.apply(np.ones(3), 1.0)
+    assert out is state
+    assert np.allclose(state, 1 - np.exp(-1))
+    # the time constant does not depend on the tick rate
+    smoothing.reset()
+    smoothing.apply(np.zeros(3), 0.0)
+    for timestamp in np.linspace(0.1, 1.0, 10):
+        state = smoothing.apply(np.ones(3), timestamp)
+    assert np.allclose(state, 1 - np.exp(-1))
+    # no elapsed time, no update
+    assert np.allclose(smoothing.apply(np.full(3, 10.0), 1.0), state)
+
+    with pytest.raises(ValueError, match="strictly positive"):
+        ExponentialSmoothing(0)
@@ -0,0 +1,54 @@
+"""Test spatial_filter.py"""
+
+import numpy as np
+import pytest
+from mne import create_info
+
+from ...fft import _fft
+from ..reference import Reference
+from ..spatial_filter import SpatialFilter
+
+
+def test_spatial_filter(info, ch_names, data):
+    """Test the spatial filter matrices."""
+    spatial_filter = SpatialFilter(info, None)
+    assert np.allclose(spatial_filter.apply(data), data)
+
+    spatial_filter = SpatialFilter(info, "average")
+    assert np.allclose(
+        spatial_filter.apply(data), data - np.average(data, axis=0)
+    )
+
+    spatial_filter = SpatialFilter(info, "laplacian", n_neighbors=3)
+    matrix = spatial_filter.matrix
+    assert np.allclose(np.diag(matrix), 1)
+    assert np.allclose(matrix.sum(axis=1), 0)
+    assert np.all(np.count_nonzero(matrix, axis=1) == 4)
+    # Cz neighbors are central channels
+    neighbors = np.nonzero(matrix[ch_names.index("Cz")])[0]
+    assert {ch_names[k] for k in neighbors} <= {"Cz", "Fz", "C3", "C4"}
+    assert np.allclose(spatial_filter.apply(data), matrix @ data)
+
+    # invalid
+    with pytest.raises(ValueError, match="requires a montage"):
+        SpatialFilter(create_info(ch_names, 300, "eeg"), "laplacian")
+    with pytest.raises(ValueError, match="requires SSP projectors"):
+        SpatialFilter(info, "ssp")
+    with pytest.raises(ValueError, match="Invalid value"):
+        SpatialFilter(info, "101")
+
+
+def test_fold_in_fft(info, ch_names):
+    """Test that the spatial operator can be folded in the FFT."""
+    rng = np.random.default_rng(101)
+    all_ch_names = ["TRIGGER"] + ch_names + ["A2"]
+    data = rng.normal(size=(600, len(all_ch_names)))  # (n_times, n_channels)
+    reference = Reference(all_ch_names, ch_names, "A2")
+    spatial_filter = SpatialFilter(info, "laplacian")
+    operator = spatial_filter.matrix @ reference.operator
+
+    expected = _fft(
+        spatial_filter.apply(reference.apply(data)), 300, (8, 13), True
+    )
+    folded = _fft(data.T, 300, (8, 13), True, operator=operator)
+    assert np.allclose(expected, folded)
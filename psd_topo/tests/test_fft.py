@@ -0,0 +1,49 @@
+"""Test fft.py"""
+
+import numpy as np
+import pytest
+
+from ..fft import _fft, _fft_batch, fft
+
+
+def test_fft():
+    """Test the band power computation."""
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((3, 500))
+    fftval = fft(data, 100, (8, 13), dB=False)
+    assert fftval.shape == (3,)
+    assert np.allclose(10 * np.log10(fftval), fft(data, 100, (8, 13), True))
+
+    with pytest.raises(ValueError, match="strictly positive"):
+        fft(data, 0, (8, 13), True)
+    with pytest.raises(ValueError, match="2D array"):
+        fft(data[0], 100, (8, 13), True)
+
+
+def test_fft_normalize():
+    """Test that the normalized power does not depend on the duration."""
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((64, 10000))
+    short = _fft(data[:, :100], 200, (8, 13), True, normalize=True)
+    long = _fft(data, 200, (8, 13), True, normalize=True)
+    # white noise of unit variance, density of 1 / (fs / 2) over 2 sides
+    assert abs(np.mean(long) - 10 * np.log10(1 / 200)) < 0.5
+    assert abs(np.mean(short) - np.mean(long)) < 1
+    # without normalization, the power scales with the number of samples
+    short = _fft(data[:, :100], 200, (8, 13), True)
+    long = _fft(data, 200, (8, 13), True)
+    assert abs(np.mean(long) - np.mean(short) - 20) < 1
+
+
+def test_fft_batch():
+    """Test the batched band power across streams."""
+    rng = np.random.default_rng(0)
+    data = [rng.standard_normal((4, 300)) for _ in range(3)]
+    data.append(rng.standard_normal((5, 200)))  # not batched
+    fs = [100, 100, 100, 100]
+    operators = [rng.standard_normal((3, 4)) for _ in range(3)]
+    operators.append(rng.standard_normal((3, 5)))
+    fftvals = _fft_batch(data, fs, (8, 13), True, operators, normalize=True)
+    for k in range(4):
+        expected = _fft(data[k], fs[k], (8, 13), True, operators[k], True)
+        assert np.allclose(fftvals[k], expected)
@@ -0,0 +1,56 @@
+"""Test the import of the package."""
+
+import subprocess
+import sys
+from typing import Dict
+
+# heavy dependencies which are imported only when needed
+_HEAVY_DEPENDENCIES = ("bsl", "matplotlib", "mne", "pyqtgraph", "scipy")
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    """Measure the cumulative import time of the modules in a new interpreter.
+
+    The times are reported by ``python -X importtime``, in microseconds, for
+    each module imported while importing ``module``.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = dict()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():  # skip the header
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_heavy_dependencies():
+    """Test that the heavy dependencies are not imported with the package."""
+    code = (
+        "import sys; import psd_topo; "
+        f"print(','.join(sorted(m for m in {_HEAVY_DEPENDENCIES} "
+        "if m in sys.modules)))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert process.stdout.strip() == ""
+
+
+def test_import_time():
+    """Test that the import time does not include the heavy dependencies."""
+    times = _import_times("psd_topo")
+    assert "psd_topo" in times
+    heavy = [
+        name for name in times if name.split(".")[0] in _HEAVY_DEPENDENCIES
+    ]
+    assert heavy == []
@@ -0,0 +1,188 @@
+"""Test _launcher.py"""
+
+import time
+
+import pytest
+
+from .._launcher import _launch, _Supervisor
+
+
+def _worker(idx, delay, ready_callback=None):
+    """Worker reporting its readiness after a delay."""
+    time.sleep(delay)
+    if idx < 0:
+        raise RuntimeError("Worker failed.")
+    ready_callback()
+    time.sleep(10)
+
+
+def test_launch():
+    """Test the start of the workers and the report of their readiness."""
+    args = [(0, 0.1), (1, 0.5), (2, 0.1)]
+    processes, ready = _launch(_worker, args, timeout=30, preload=())
+    try:
+        assert len(processes) == 3
+        assert sorted(ready) == [0, 1, 2]
+        assert all(process.is_alive() for process in processes)
+        assert 0.5 <= ready[1]
+    finally:
+        for process in processes:
+            process.kill()
+            process.join()
+
+
+def test_launch_failure_and_timeout():
+    """Test that a failing or a slow worker does not block the launcher."""
+    args = [(0, 0.1), (-1, 0.1), (2, 60)]
+    start = time.perf_counter()
+    processes, ready = _launch(_worker, args, timeout=3, preload=())
+    try:
+        assert list(ready) == [0]
+        assert processes[1].exitcode == 1
+        assert processes[2].is_alive()
+        assert time.perf_counter() - start < 10
+    finally:
+        for process in processes:
+            process.kill()
+            process.join()
+
+
+def test_launch_iterator():
+    """Test the start of the workers from an iterator."""
+    started = list()
+
+    def _args():
+        yield (0, 0.1)
+        started.append(True)
+        raise RuntimeError("Amplifier not found.")
+
+    with pytest.raises(RuntimeError, match="not found"):
+        _launch(_worker, _args(), timeout=3, preload=())
+    assert started == [True]
+
+
+class _StreamInfo:
+    """Mock of pylsl.StreamInfo."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+    def type(self):
+        return "EEG"
+
+
+class _Resolver:
+    """Mock of pylsl.ContinuousResolver with streams set by the test."""
+
+    def __init__(self, names):
+        self.names = list(names)
+
+    def results(self):
+        return [_StreamInfo(name) for name in self.names]
+
+
+def _stream_worker(name, ready_callback=None):
+    """Worker failing on the stream 'WS-fail', ready otherwise."""
+    if name == "WS-fail":
+        raise RuntimeError("Worker failed.")
+    ready_callback()
+    time.sleep(60)
+
+
+def _wait(condition, timeout=10):
+    """Wait until a condition is met."""
+    start = time.perf_counter()
+    while not condition():
+        assert time.perf_counter() - start < timeout
+        time.sleep(0.05)
+
+
+def test_supervisor():
+    """Test the attach, stop and restart of the workers."""
+    resolver = _Resolver(["WS-1", "WS-2", "other"])
+    supervisor = _Supervisor(
+        _stream_worker,
+        lambda name: (name,),
+        probe=0.05,
+        resolver=resolver,
+        preload=(),
+    )
+    supervisor.start()
+    try:
+        _wait(lambda: supervisor.ready == ["WS-1", "WS-2"])
+        workers = supervisor.workers
+        assert sorted(workers) == ["WS-1", "WS-2"]
+
+        # stream lost
+        resolver.names.remove("WS-1")
+        _wait(lambda: supervisor.ready == ["WS-2"])
+        assert not workers["WS-1"].is_alive()
+        assert supervisor.workers["WS-2"] is workers["WS-2"]
+
+        # stream reconnected
+        resolver.names.append("WS-1")
+        _wait(lambda: supervisor.ready == ["WS-1", "WS-2"])
+        assert supervisor.n_starts == {"WS-1": 2, "WS-2": 1}
+        assert supervisor.workers["WS-2"] is workers["WS-2"]
+
+        # worker crash
+        resolver.names.append("WS-fail")
+        _wait(lambda: 2 <= supervisor.n_starts.get("WS-fail", 0))
+        assert supervisor.ready == ["WS-1", "WS-2"]
+    finally:
+        supervisor.stop()
+    assert supervisor.workers == dict()
+    assert all(not worker.is_alive() for worker in workers.values())
+
+
+def test_supervisor_max_workers():
+    """Test the maximum number of workers."""
+    resolver = _Resolver(["WS-1", "WS-2"])
+    supervisor = _Supervisor(
+        _stream_worker,
+        lambda name: (name,),
+        n=1,
+        probe=0.05,
+        resolver=resolver,
+        preload=(),
+    )
+    supervisor.poll()
+    try:
+        assert list(supervisor.workers) == ["WS-1"]
+    finally:
+        supervisor.stop()
+
+
+def test_supervisor_backoff():
+    """Test that a worker crashing at startup is not restarted forever."""
+    resolver = _Resolver(["WS-fail"])
+    supervisor = _Supervisor(
+        _stream_worker,
+        lambda name: (name,),
+        probe=0.02,
+        resolver=resolver,
+        preload=(),
+        backoff=0.2,
+        max_failures=3,
+    )
+    supervisor.start()
+    try:
+        start = time.perf_counter()
+        _wait(lambda: supervisor.failed == ["WS-fail"])
+        # restarted after 0.2 s then 0.4 s
+        assert 0.6 <= time.perf_counter() - start
+        assert supervisor.n_starts == {"WS-fail": 3}
+        time.sleep(0.5)
+        assert supervisor.n_starts == {"WS-fail": 3}
+        assert supervisor.workers == dict()
+
+        # the stream reconnects
+        resolver.names.remove("WS-fail")
+        _wait(lambda: supervisor.failed == [])
+        resolver.names.append("WS-fail")
+        _wait(lambda: supervisor.n_starts == {"WS-fail": 4})
+    finally:
+        supervisor.stop()
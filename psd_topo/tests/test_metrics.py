@@ -0,0 +1,80 @@
+"""Test _metrics.py"""
+
+import json
+import time
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import numpy as np
+import pytest
+
+from .._metrics import _Metrics, _MetricsExporter, _start_metrics
+from .._quality import _StreamQuality
+
+
+def test_metrics():
+    """Test the counters of the ticks."""
+    metrics = _Metrics("WS-1", size=10)
+    snapshot = metrics.snapshot()
+    assert snapshot["ticks"] == 0
+    assert np.isnan(snapshot["tick_rate"])
+    assert np.isnan(snapshot["compute"]["p50"])
+
+    # 20 ticks at 10 Hz, only the last 10 are kept
+    for k in range(20):
+        compute = 0.1 if k < 10 else 0.01
+        metrics.record(k / 10, compute, 0.02, queue_depth=k)
+    metrics.drop()
+    snapshot = metrics.snapshot()
+    assert snapshot["stream"] == "WS-1"
+    assert snapshot["ticks"] == 20
+    assert snapshot["tick_rate"] == pytest.approx(10)
+    assert snapshot["compute"]["p99"] == pytest.approx(0.01)
+    assert snapshot["render"]["p50"] == pytest.approx(0.02)
+    assert snapshot["dropped"] == 1
+    assert snapshot["queue_depth"] == 19
+    assert 0 < snapshot["rss"]
+    assert "quality" not in snapshot
+
+    quality = _StreamQuality("WS-1", 100.0, log_interval=None)
+    quality.update(np.arange(100) / 100.0)
+    snapshot = _Metrics("WS-1", quality=quality).snapshot()
+    assert snapshot["quality"]["received"] == 100
+
+
+def test_exporter(tmp_path):
+    """Test the export of the metrics over HTTP and to a file."""
+    assert _start_metrics([], None) is None
+    with pytest.raises(ValueError, match="strictly positive"):
+        _MetricsExporter(list, interval=0)
+
+    metrics = _Metrics("WS-1")
+    metrics.record(0.0, 0.01, 0.02, queue_depth=5)
+    fname = tmp_path / "metrics.jsonl"
+    exporter = _start_metrics(
+        [metrics], dict(port=0, fname=fname, interval=0.05)
+    )
+    try:
+        url = f"http://127.0.0.1:{exporter.port}"
+        with urlopen(f"{url}/metrics", timeout=5) as response:
+            payload = json.loads(response.read())
+        (snapshot,) = payload["streams"]
+        assert snapshot["stream"] == "WS-1"
+        assert snapshot["queue_depth"] == 5
+        assert snapshot["tick_rate"] is None  # NaN is not valid JSON
+        with pytest.raises(HTTPError, match="404"):
+            urlopen(f"{url}/other", timeout=5)
+
+        # a second server uses the next port
+        other = _MetricsExporter(list, port=exporter.port)
+        assert other.port != exporter.port
+        other.close()
+
+        start = time.perf_counter()
+        while not fname.exists() or len(fname.read_text().splitlines()) < 2:
+            assert time.perf_counter() - start < 10
+            time.sleep(0.05)
+    finally:
+        exporter.close()
+    lines = fname.read_text().splitlines()
+    assert json.loads(lines[0])["streams"][0]["ticks"] == 1
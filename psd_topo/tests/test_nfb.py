@@ -0,0 +1,21 @@
+"""Test nfb.py and weather_map.py"""
+
+import inspect
+
+import pytest
+
+from .. import nfb, nfb_sync, weather_map
+
+
+@pytest.mark.parametrize("function", (nfb, nfb_sync, weather_map))
+def test_positional_arguments(function):
+    """Test that the options of the loops are keyword-only."""
+    parameters = inspect.signature(function).parameters.values()
+    positional = [
+        parameter.name
+        for parameter in parameters
+        if parameter.kind == parameter.POSITIONAL_OR_KEYWORD
+    ]
+    assert positional[1:] == ["band", "winsize", "figsize", "verbose"]
+    with pytest.raises(TypeError, match="positional argument"):
+        function("WS-1", (8, 13), 1.0, None, None, None)
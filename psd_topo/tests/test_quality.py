@@ -0,0 +1,62 @@
+"""Test _quality.py"""
+
+import numpy as np
+import pytest
+
+from .. import _quality
+from .._quality import _StreamQuality
+
+
+def test_stream_quality():
+    """Test the counters on a stream with a gap."""
+    quality = _StreamQuality("WS-1", 100.0, log_interval=None)
+    snapshot = quality.snapshot()
+    assert snapshot["received"] == snapshot["expected"] == 0
+    assert np.isnan(snapshot["effective_sfreq"])
+
+    timestamps = np.arange(1000) / 100.0
+    timestamps = np.delete(timestamps, np.arange(500, 510))  # 10 missing
+    # overlapping windows, as returned by the receivers
+    for stop in range(100, 1001, 50):
+        window = timestamps[max(stop - 200, 0) : stop]
+        quality.update(window)
+    assert quality.update(timestamps[-200:]) == 0
+    snapshot = quality.snapshot()
+    assert snapshot["stream"] == "WS-1"
+    assert snapshot["received"] == 990
+    assert snapshot["expected"] == 1000
+    assert snapshot["gaps"] == 1
+    assert snapshot["missing"] == 10
+    assert snapshot["effective_sfreq"] == pytest.approx(989 / 9.99)
+    assert snapshot["drift"] == pytest.approx(0, abs=1e-3)
+    assert snapshot["jitter"] == pytest.approx(0, abs=1e-9)
+
+    quality.reset()
+    assert quality.snapshot()["received"] == 0
+
+
+def test_stream_quality_drift():
+    """Test the effective rate and the jitter of an irregular stream."""
+    rng = np.random.default_rng(0)
+    intervals = 1 / 101.0 + rng.uniform(-1e-3, 1e-3, 10000)
+    quality = _StreamQuality("WS-1", 100.0, log_interval=0)
+    quality.update(np.cumsum(intervals))
+    snapshot = quality.snapshot()
+    assert snapshot["gaps"] == 0
+    assert snapshot["effective_sfreq"] == pytest.approx(101.0, rel=1e-3)
+    assert snapshot["drift"] == pytest.approx(1e4, rel=0.05)
+    assert snapshot["jitter"] == pytest.approx(1e-3 / np.sqrt(3), rel=0.05)
+
+
+def test_stream_quality_gap_logs(monkeypatch):
+    """Test that the gaps are logged at most once per second."""
+    warnings = list()
+    monkeypatch.setattr(
+        _quality.logger, "warning", lambda *args: warnings.append(args)
+    )
+    quality = _StreamQuality("WS-1", 100.0, log_interval=None)
+    # a gap of 1 sample in each of 10 updates
+    for k in range(10):
+        quality.update(np.array([2 * k, 2 * k + 0.01, 2 * k + 0.03]))
+    assert quality.snapshot()["gaps"] == 10 + 9  # and between the updates
+    assert len(warnings) == 1
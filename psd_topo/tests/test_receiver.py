@@ -0,0 +1,104 @@
+"""Test _receiver.py"""
+
+import time
+
+import numpy as np
+from bsl.externals.pylsl import StreamInfo, StreamOutlet
+
+from .._receiver import _MultiReceiver, _Receiver, _RingBuffer
+
+
+def test_receiver():
+    """Test the provisional windows returned while the buffer fills."""
+    info = StreamInfo("WS-test-receiver", "EEG", 2, 100.0, "float32", "uid")
+    channels = info.desc().append_child("channels")
+    for ch in ("Fz", "Cz"):
+        channels.append_child("channel").append_child_value("label", ch)
+    outlet = StreamOutlet(info)
+
+    receiver = _Receiver("WS-test-receiver", 1.0, warmup=0.2, band=(8, 13))
+    assert receiver.sfreq == 100
+    assert receiver.n_times == 100
+    assert receiver.n_min == 40  # 2 frequencies in the band
+    assert receiver.fill == 0
+    assert not receiver.is_full
+
+    sizes = list()
+    n_new = 0
+    start = time.perf_counter()
+    while not receiver.is_full:
+        assert time.perf_counter() - start < 30
+        outlet.push_chunk(np.random.randn(2, 2).tolist())
+        time.sleep(0.02)
+        data, timestamps = receiver.get_window()
+        assert data.shape == (timestamps.size, len(receiver.ch_names))
+        sizes.append(timestamps.size)
+        n_new += receiver.n_new
+    sizes = np.array(sizes)
+    assert np.all((sizes == 0) | (40 <= sizes))
+    assert np.all(np.diff(sizes[sizes != 0]) >= 0)
+    assert receiver.fill == 1
+    data, timestamps = receiver.get_window()
+    n_new += receiver.n_new
+    assert data.shape == (100, len(receiver.ch_names))
+    snapshot = receiver.quality.snapshot()
+    assert snapshot["stream"] == "WS-test-receiver"
+    assert 100 <= snapshot["received"] == n_new
+
+
+def test_ring_buffer():
+    """Test the windows extracted from the ring buffer."""
+    buffer = _RingBuffer(10, 2)
+    assert buffer.last_timestamp == -np.inf
+    assert buffer.window(0, 1) == (None, None)
+    timestamps = np.arange(25, dtype=float)
+    data = np.tile(timestamps[:, np.newaxis], (1, 2))
+    for start, stop in ((0, 4), (4, 9), (9, 23), (23, 25)):
+        buffer.push(data[start:stop], timestamps[start:stop])
+        assert buffer.last_timestamp == stop - 1
+        assert buffer.n_samples == min(stop, 10)
+    window, times = buffer.window(20.5, 4)
+    assert np.array_equal(times, [17, 18, 19, 20])
+    assert np.array_equal(window[:, 1], times)
+    window, times = buffer.window(100, 10)
+    assert np.array_equal(times, np.arange(15, 25))
+    assert buffer.window(17, 4) == (None, None)  # 15, 16, 17 only
+
+
+def test_multi_receiver():
+    """Test the time alignment of the windows of several streams."""
+    outlets = list()
+    for k, sfreq in enumerate((100.0, 200.0)):
+        info = StreamInfo(f"WS-test-sync-{k}", "EEG", 2, sfreq, "float32")
+        outlets.append(StreamOutlet(info))
+    receiver = _MultiReceiver(
+        ["WS-test-sync-0", "WS-test-sync-1"], 0.5, step=0.1
+    )
+    assert receiver.n_times == [50, 100]
+    assert receiver.ch_names == [["0", "1"], ["0", "1"]]
+
+    frames = list()
+    n_new = np.zeros(2, dtype=int)
+    start = time.perf_counter()
+    while len(frames) < 5:
+        assert time.perf_counter() - start < 30
+        # the second stream is pushed with a different chunk size
+        outlets[0].push_chunk(np.random.randn(2, 2).tolist())
+        outlets[1].push_chunk(np.random.randn(4, 2).tolist())
+        time.sleep(0.02)
+        receiver.acquire()
+        tmax, windows = receiver.get_windows()
+        if tmax is not None:
+            # the samples of the acquisitions without frame are included
+            n_new += receiver.n_new
+            frames.append(tmax)
+            assert 0 < receiver.time_to_next_frame() <= 0.1
+            assert [window.shape for window in windows] == [(50, 2), (100, 2)]
+    # the frames end on the time grid
+    frames = np.array(frames)
+    assert np.allclose(np.round(frames / 0.1) * 0.1, frames)
+    assert np.all(0 < np.diff(frames))
+    for quality, sfreq, n in zip(receiver.quality, (100, 200), n_new):
+        snapshot = quality.snapshot()
+        assert snapshot["sfreq"] == sfreq
+        assert 0.5 * sfreq <= snapshot["received"] == n
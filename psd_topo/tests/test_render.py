@@ -0,0 +1,156 @@
+"""Test _render.py"""
+
+import numpy as np
+import pytest
+from matplotlib import colormaps
+from mne.utils.check import _check_sphere
+from mne.viz.topomap import (
+    _find_topomap_coords,
+    _make_head_outlines,
+    _setup_interp,
+)
+
+from .._render import (
+    _N_COLORS,
+    _AdaptiveResolution,
+    _compute_geometry,
+    _load_geometry,
+    _LUTRenderer,
+    _make_lut,
+)
+
+
+def test_compute_geometry(info, ch_names):
+    """Test that the interpolation matrix matches MNE interpolation."""
+    data = np.random.default_rng(101).normal(size=len(ch_names))
+    geometry = _compute_geometry(info, 32)
+    # MNE interpolation
+    sphere = _check_sphere(None, info)
+    pos = _find_topomap_coords(info, list(range(len(ch_names))), sphere=sphere)
+    outlines = _make_head_outlines(sphere, pos, "head", (0.0, 0.0))
+    _, Xi, Yi, interp = _setup_interp(
+        pos, 32, "cubic", "head", outlines, "mean"
+    )
+    interp.set_values(data)
+    expected = interp.set_locations(Xi, Yi)().ravel()[geometry["mask"]]
+    assert np.allclose(geometry["interpolation"] @ data, expected)
+
+
+def test_lut_renderer(info, ch_names):
+    """Test the rendering with the colormap lookup table."""
+    renderer = _LUTRenderer(info, "Purples", res=32)
+    image = renderer.render(np.zeros(len(ch_names)), -1, 1)
+    assert image.shape == (32, 32, 4)
+    assert image.dtype == np.uint8
+    # pixels outside of the head are transparent
+    assert np.all(image[0, 0] == 0)
+    # saturated values are mapped to the ends of the colormap
+    cmap = colormaps["Purples"]
+    image = renderer.render(np.full(len(ch_names), 10.0), -1, 1)
+    expected = np.round(np.array(cmap(1.0)) * 255)
+    assert np.all(image[16, 16] == expected)
+    out = renderer.render(np.full(len(ch_names), -10.0), -1, 1)
+    assert out is image
+    expected = np.round(np.array(cmap(0.0)) * 255)
+    assert np.all(image[16, 16] == expected)
+    # constant range
+    renderer.render(np.zeros(len(ch_names)), 0, 0)
+    assert renderer._pixels.max() < _N_COLORS
+
+
+@pytest.mark.parametrize("image_interp", ("cubic", "nearest"))
+def test_lut_renderer_non_finite(info, ch_names, image_interp):
+    """Test that the non-finite values are rendered transparent."""
+    renderer = _LUTRenderer(info, "Purples", res=32, image_interp=image_interp)
+    topodata = np.linspace(-1, 1, len(ch_names))
+    for value in (-np.inf, np.nan):
+        topodata[2] = value
+        image = renderer.render(topodata, np.min(topodata), 1)
+        assert renderer._pixels.max() <= _N_COLORS
+        pixels = image.reshape(-1, 4)[renderer._mask]
+        assert np.any(pixels[:, 3] == 0)
+        if image_interp == "nearest":
+            # the other channels are still visible
+            assert np.any(pixels[:, 3] != 0)
+
+
+def test_nearest_renderer(info, ch_names):
+    """Test the nearest channel rendering."""
+    renderer = _LUTRenderer(info, "Purples", res=32, image_interp="nearest")
+    assert renderer.image_interp == "nearest"
+    topodata = np.linspace(-1, 1, len(ch_names))
+    image = renderer.render(topodata, -1, 1)
+    # each pixel takes the color of one of the channels
+    lut = _make_lut("Purples")
+    colors = lut[((topodata + 1) / 2 * (_N_COLORS - 1)).astype(int)]
+    pixels = image.reshape(-1, 4)[renderer._mask]
+    assert all(np.any(np.all(colors == pixel, axis=1)) for pixel in pixels)
+
+
+def test_adaptive_resolution():
+    """Test the selection of the rendering level from the frame time."""
+    levels = [("cubic", 128), ("cubic", 64), ("nearest", 64)]
+    adaptive = _AdaptiveResolution(10, levels, 1, n_frames=5)
+    # too slow, switch to a cheaper level after n_frames
+    switches = [adaptive.step(0.2) for _ in range(5)]
+    assert switches == [None] * 4 + [2]
+    # no cheaper level
+    assert all(adaptive.step(0.2) is None for _ in range(10))
+    # within budget, no switch
+    adaptive = _AdaptiveResolution(10, levels, 1, n_frames=5)
+    assert all(adaptive.step(0.08) is None for _ in range(10))
+    # headroom, switch to more expensive levels
+    adaptive = _AdaptiveResolution(10, levels, 2, n_frames=5)
+    switches = [adaptive.step(0.01) for _ in range(10)]
+    assert switches == [None] * 4 + [1] + [None] * 4 + [0]
+    assert adaptive.level == 0
+    # an expensive level immediately abandoned is tried again later
+    assert [adaptive.step(0.2) for _ in range(5)][-1] == 1
+    switches = [adaptive.step(0.01) for _ in range(10)]
+    assert switches == [None] * 9 + [0]
+
+
+def test_geometry_cache(info, tmp_path, monkeypatch):
+    """Test the on-disk cache of the geometries."""
+    monkeypatch.setenv("PSD_TOPO_CACHE", str(tmp_path))
+    geometry = _load_geometry(info, 32)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+    cached = _load_geometry(info, 32)
+    for key in ("interpolation", "mask", "extent", "pos", "clip_radius"):
+        assert np.array_equal(geometry[key], cached[key])
+    assert cached["nearest"] is None
+    assert geometry["outlines"].keys() == cached["outlines"].keys()
+    for key, (x, y) in geometry["outlines"].items():
+        assert np.array_equal(x, cached["outlines"][key][0])
+        assert np.array_equal(y, cached["outlines"][key][1])
+    # the key depends on the resolution, the method and the positions
+    _load_geometry(info, 16)
+    _load_geometry(info, 32, "nearest")
+    assert len(list(tmp_path.glob("*.npz"))) == 3
+    assert _load_geometry(info, 32, "nearest")["interpolation"] is None
+    info = info.copy()
+    with info._unlock():
+        info["chs"][0]["loc"][0] += 0.01
+    _load_geometry(info, 32)
+    assert len(list(tmp_path.glob("*.npz"))) == 4
+
+
+def test_geometry_cache_corrupted(info, tmp_path, monkeypatch):
+    """Test that a corrupted geometry is computed again."""
+    monkeypatch.setenv("PSD_TOPO_CACHE", str(tmp_path))
+    geometry = _load_geometry(info, 32)
+    (fname,) = tmp_path.glob("*.npz")
+    # truncated file
+    content = fname.read_bytes()
+    fname.write_bytes(content[: len(content) // 2])
+    cached = _load_geometry(info, 32)
+    assert np.array_equal(geometry["interpolation"], cached["interpolation"])
+    assert fname.read_bytes() == content  # written again
+    # missing array
+    with np.load(fname) as file:
+        arrays = {key: value for key, value in file.items() if key != "mask"}
+    np.savez(fname, **arrays)
+    cached = _load_geometry(info, 32)
+    assert np.array_equal(geometry["mask"], cached["mask"])
+    with np.load(fname) as file:
+        assert "mask" in file
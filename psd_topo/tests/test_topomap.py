@@ -0,0 +1,48 @@
+"""Test topomap.py"""
+
+import time
+
+import numpy as np
+import pytest
+
+from ..topomap import TopomapQtGraph
+
+
+def test_topomap_qtgraph(info, ch_names, monkeypatch):
+    """Test the pyqtgraph backend with an offscreen Qt platform."""
+    pytest.importorskip("pyqtgraph")
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    topomap = TopomapQtGraph(info, "Purples", res=32)
+    rng = np.random.default_rng(101)
+    for _ in range(3):
+        topomap.update(rng.normal(size=len(ch_names)))
+        topomap.redraw()
+    assert topomap.vmin < topomap.vmax
+    assert topomap._image.image.shape == (32, 32, 4)
+    topomap.set_title("1")
+    topomap.process_events()
+    topomap.redraw()
+    topomap.widget.close()
+
+
+def test_topomap_adaptive_resolution(info, ch_names, monkeypatch):
+    """Test that the resolution decreases when the frames are too slow."""
+    pytest.importorskip("pyqtgraph")
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    topomap = TopomapQtGraph(info, "Purples", res=64, target_fps=100)
+    assert topomap._renderer.res == 64
+    # each redraw takes 20 ms while the budget is 10 ms
+    process_events = topomap._app.processEvents
+
+    def slow_process_events():
+        process_events()
+        time.sleep(0.02)
+
+    monkeypatch.setattr(topomap._app, "processEvents", slow_process_events)
+    rng = np.random.default_rng(101)
+    for _ in range(25):
+        topomap.update(rng.normal(size=len(ch_names)))
+        topomap.redraw()
+    assert topomap._renderer.res == 48
+    assert topomap._image.image.shape == (48, 48, 4)
+    topomap.widget.close()
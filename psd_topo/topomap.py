@@ -1,15 +1,22 @@
+import logging
+import time
 from abc import ABC, abstractmethod
+from typing import Optional
 
 import numpy as np
 from matplotlib import pyplot as plt
+from matplotlib.patches import Ellipse
 from mne import Info
 from mne.viz import plot_topomap
+from mne.viz.topomap import _draw_outlines
 from numpy.typing import NDArray
 
+from ._render import _RESOLUTIONS, _AdaptiveResolution, _LUTRenderer
 from ._typing import FigSize
-from .utils._checks import _check_type
+from .utils._checks import _check_type, _ensure_int
 from .utils._docs import copy_doc, fill_doc
-from .utils._logs import logger
+from .utils._imports import import_optional_dependency
+from .utils._logs import _RateLimit, logger
 
 
 @fill_doc
@@ -30,9 +37,10 @@ class _Topomap(ABC):
         self._inc = 0
         self._vmin_arr = np.ones(100) * np.nan
         self._vmax_arr = np.ones(100) * np.nan
+        self._log_rate = _RateLimit(1.0)
 
     @abstractmethod
-    def update(self, topodata: NDArray[float]):
+    def update(self, topodata: NDArray[float], calibrate: bool = True):
         """Update the topographic map with the new data array (n_channels, ).
 
         Parameters
@@ -40,7 +48,16 @@ class _Topomap(ABC):
         topodata : array
             1D array of shape (n_channels, ) containing the new data samples to
             plot.
+        calibrate : bool
+            If True, the data is added to the history used to calibrate the
+            colormap range. Set to False for data which should not impact the
+            colormap range, e.g. data with interpolated bad channels.
         """
+        if not calibrate:
+            if self._inc == 0:  # no calibration yet
+                self._vmin = np.min(topodata)
+                self._vmax = np.max(topodata)
+            return
         # update arrays that stores 100 points for vmin/vmax
         self._vmin_arr[self._inc % 100] = np.min(topodata)
         self._vmax_arr[self._inc % 100] = np.max(topodata)
@@ -55,9 +72,76 @@ class _Topomap(ABC):
         self._vmax = np.percentile(
             self._vmax_arr[~np.isnan(self._vmax_arr)], 95
         )
-        logger.debug(
-            "%i --Vmin: %.3f -- Vmax: %.3f", self._inc, self._vmin, self._vmax
+        if logger.isEnabledFor(logging.DEBUG) and self._log_rate():
+            logger.debug(
+                "%i --Vmin: %.3f -- Vmax: %.3f",
+                self._inc,
+                self._vmin,
+                self._vmax,
+            )
+
+    @abstractmethod
+    def redraw(self):
+        """Redraw the topographic map."""
+
+    @abstractmethod
+    def process_events(self):
+        """Process the pending GUI events without redrawing."""
+
+    @abstractmethod
+    def set_title(self, title: str):
+        """Set the title of the topographic map.
+
+        Parameters
+        ----------
+        title : str
+            Title displayed above the topographic map.
+        """
+
+    def _init_renderer(
+        self, res: int, target_fps: Optional[float], margin: int
+    ):
+        """Initialize the lookup table rendering and its resolution levels."""
+        # rendering levels, from the most to the least expensive
+        resolutions = sorted(set(_RESOLUTIONS) | {res}, reverse=True)
+        self._levels = [("cubic", elt) for elt in resolutions]
+        self._levels.append(("nearest", 64))
+        level = self._levels.index(("cubic", res))
+        self._margin = margin
+        self._renderers = dict()
+        self._set_renderer(level)
+        self._adaptive = (
+            None
+            if target_fps is None
+            else _AdaptiveResolution(target_fps, self._levels, level)
         )
+        self._tic = None
+
+    def _set_renderer(self, level: int):
+        """Select the renderer of a level, computed once per level."""
+        if level not in self._renderers:
+            image_interp, res = self._levels[level]
+            self._renderers[level] = _LUTRenderer(
+                self._info, self._cmap, res, image_interp, self._margin
+            )
+        self._renderer = self._renderers[level]
+
+    def _adapt_resolution(self):
+        """Measure the frame time and switch the resolution level."""
+        if self._adaptive is None or self._tic is None:
+            return
+        frame_time = time.perf_counter() - self._tic
+        self._tic = None
+        level = self._adaptive.step(frame_time)
+        if level is not None:
+            logger.info(
+                "Topomap: frame time %.1f ms for a target of %.1f ms, "
+                "switching to %s rendering at resolution %i.",
+                self._adaptive.frame_time * 1000,
+                1000 / self._adaptive.target_fps,
+                *self._levels[level],
+            )
+            self._set_renderer(level)
 
     # ------------------------------------------------------------------------
     @property
@@ -107,6 +191,19 @@ class TopomapMPL(_Topomap):
     cmap : str
         The matplotlib color map name.
     %(figsize)s
+    lut : bool
+        If True, the interpolation on the image grid is precomputed and the
+        image is colored with a precomputed uint8 lookup table of the
+        colormap, which is faster than `mne.viz.plot_topomap` on every frame.
+    res : int
+        Resolution of the image, in pixels per side.
+    target_fps : float | None
+        If provided, the duration of each frame (update and redraw) is
+        measured and the resolution is adapted to sustain this number of frames
+        per second. The resolution decreases when the frames are too long,
+        down to a nearest channel (Voronoi) rendering, and increases again when
+        there is headroom. Requires ``lut=True``. None to keep the resolution
+        fixed.
     """
 
     def __init__(
@@ -114,6 +211,9 @@ class TopomapMPL(_Topomap):
         info: Info,
         cmap: str = "Purples",
         figsize: FigSize = (3, 3),
+        lut: bool = True,
+        res: int = 64,
+        target_fps: Optional[float] = None,
     ):
         if plt.get_backend() != "QtAgg":
             plt.switch_backend("QtAgg")
@@ -121,13 +221,49 @@ class TopomapMPL(_Topomap):
             plt.ion()  # enable interactive mode
         super().__init__(info)
         _check_type(cmap, (str,), "cmap")
+        _check_type(lut, (bool,), "lut")
+        res = _ensure_int(res, "res")
+        if res <= 1:
+            raise ValueError(
+                "The resolution 'res' must be above 1 pixel. "
+                f"{res} is invalid."
+            )
+        _check_type(target_fps, ("numeric", None), "target_fps")
+        if target_fps is not None and (not lut or target_fps <= 0):
+            raise ValueError(
+                "The target frame rate 'target_fps' must be a strictly "
+                "positive number and requires the lookup table rendering "
+                "'lut=True'."
+            )
         self._cmap = cmap
         self._fig, self._axes = plt.subplots(1, 1, figsize=figsize)
+        if lut:
+            self._init_renderer(res, target_fps, margin=2)
+            self._image = self._axes.imshow(
+                np.zeros((self._renderer.res, self._renderer.res, 4)),
+                origin="lower",
+                aspect="equal",
+                extent=self._renderer.extent,
+                interpolation="bilinear",
+            )
+            origin, radius = self._renderer.clip
+            patch = Ellipse(
+                origin,
+                2 * radius[0],
+                2 * radius[1],
+                clip_on=True,
+                transform=self._axes.transData,
+            )
+            self._image.set_clip_path(patch)
+            _draw_outlines(self._axes, self._renderer.outlines)
+            self._axes.set_axis_off()
+            return
+        self._renderer = None
         # define kwargs for plot_topomap
         self._kwargs = dict(
             cmap=self._cmap,
             sensors=False,
-            res=64,
+            res=res,
             axes=self._axes,
             names=None,
             outlines="head",
@@ -144,12 +280,18 @@ class TopomapMPL(_Topomap):
         )
 
     @copy_doc(_Topomap.update)
-    def update(self, topodata: NDArray[float]):
-        super().update(topodata)
+    def update(self, topodata: NDArray[float], calibrate: bool = True):
+        super().update(topodata, calibrate)
         self._update_topoplot(topodata)
 
     def _update_topoplot(self, topodata: NDArray[float]):
         """Update topographic plot."""
+        if self._renderer is not None:
+            self._tic = time.perf_counter()
+            self._image.set_data(
+                self._renderer.render(topodata, self._vmin, self._vmax)
+            )
+            return
         self._axes.clear()
         plot_topomap(
             topodata,
@@ -163,6 +305,16 @@ class TopomapMPL(_Topomap):
         """Redraw the canvas."""
         self._fig.canvas.draw()
         self._fig.canvas.flush_events()
+        if self._renderer is not None:
+            self._adapt_resolution()
+
+    @copy_doc(_Topomap.process_events)
+    def process_events(self):
+        self._fig.canvas.flush_events()
+
+    @copy_doc(_Topomap.set_title)
+    def set_title(self, title: str):
+        self._axes.set_title(title)
 
     # ------------------------------------------------------------------------
     @property
@@ -212,3 +364,116 @@ class TopomapMPL(_Topomap):
                 "stuttering."
             )
         return figsize
+
+
+@fill_doc
+class TopomapQtGraph(_Topomap):
+    """Topographic map feedback using pyqtgraph.
+
+    The topographic map is rendered with a precomputed interpolation and a
+    colormap lookup table into an ``ImageItem``, with the head outline drawn
+    once. OpenGL is not used, thus the rendering relies on the Qt raster
+    engine and does not require a GPU.
+
+    Parameters
+    ----------
+    %(info)s
+    cmap : str
+        The matplotlib color map name.
+    %(figsize)s
+    res : int
+        Resolution of the image, in pixels per side. The image is not smoothed
+        when displayed, thus the default resolution is higher than for
+        `~psd_topo.topomap.TopomapMPL`.
+    target_fps : float | None
+        If provided, the duration of each frame (update and redraw) is
+        measured and the resolution is adapted to sustain this number of frames
+        per second. None to keep the resolution fixed.
+    """
+
+    def __init__(
+        self,
+        info: Info,
+        cmap: str = "Purples",
+        figsize: FigSize = (3, 3),
+        res: int = 128,
+        target_fps: Optional[float] = None,
+    ):
+        pg = import_optional_dependency(
+            "pyqtgraph", extra="The pyqtgraph backend requires pyqtgraph."
+        )
+        super().__init__(info)
+        _check_type(cmap, (str,), "cmap")
+        res = _ensure_int(res, "res")
+        if res <= 1:
+            raise ValueError(
+                "The resolution 'res' must be above 1 pixel. "
+                f"{res} is invalid."
+            )
+        _check_type(target_fps, ("numeric", None), "target_fps")
+        if target_fps is not None and target_fps <= 0:
+            raise ValueError(
+                "The target frame rate 'target_fps' must be a strictly "
+                "positive number."
+            )
+        self._cmap = cmap
+        # the image is not clipped, thus no pixel is rendered outside the head
+        self._init_renderer(res, target_fps, margin=0)
+
+        self._app = pg.mkQApp()
+        self._widget = pg.GraphicsLayoutWidget(show=True)
+        self._widget.resize(int(figsize[0] * 100), int(figsize[1] * 100))
+        self._widget.setBackground("w")
+        self._plot = self._widget.addPlot()
+        self._plot.hideAxis("left")
+        self._plot.hideAxis("bottom")
+        self._plot.setAspectLocked(True)
+        self._plot.setMouseEnabled(x=False, y=False)
+        self._plot.hideButtons()
+        self._image = pg.ImageItem(axisOrder="row-major")
+        self._plot.addItem(self._image)
+        self._image_res = None  # resolution of the displayed image
+        for x, y in self._renderer.outlines.values():
+            self._plot.addItem(
+                pg.PlotCurveItem(np.asarray(x), np.asarray(y), pen="k")
+            )
+        self._app.processEvents()
+
+    @copy_doc(_Topomap.update)
+    def update(self, topodata: NDArray[float], calibrate: bool = True):
+        super().update(topodata, calibrate)
+        self._tic = time.perf_counter()
+        renderer = self._renderer
+        self._image.setImage(
+            renderer.render(topodata, self._vmin, self._vmax),
+            autoLevels=False,
+        )
+        if renderer.res != self._image_res:
+            # position the image on the extent of the renderer
+            xmin, xmax, ymin, ymax = renderer.extent
+            self._image.setRect(xmin, ymin, xmax - xmin, ymax - ymin)
+            self._image_res = renderer.res
+
+    def redraw(self):
+        """Process the Qt events to redraw the widget."""
+        self._app.processEvents()
+        self._adapt_resolution()
+
+    @copy_doc(_Topomap.process_events)
+    def process_events(self):
+        self._app.processEvents()
+
+    @copy_doc(_Topomap.set_title)
+    def set_title(self, title: str):
+        self._plot.setTitle(title, color="k")
+
+    # ------------------------------------------------------------------------
+    @property
+    def widget(self):
+        """pyqtgraph widget."""
+        return self._widget
+
+    @property
+    def cmap(self) -> str:
+        """Matplotlib colormap name."""
+        return self._cmap
@@ -1,3 +1,3 @@
 """Utilities module."""
 
-from .utils import search_amplifiers  # noqa: F401
+from .utils import iter_amplifiers, search_amplifiers  # noqa: F401
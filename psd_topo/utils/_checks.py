@@ -4,7 +4,7 @@ import logging
 import operator
 import os
 from pathlib import Path
-from typing import Any, Optional, Tuple, Union
+from typing import Any, List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -248,3 +248,12 @@ def _check_band(band: Any) -> Tuple[float, float]:
         )
 
     return band
+
+
+def _check_reference(reference: Any) -> Optional[Union[str, List[str]]]:
+    """Check that the reference of the online loops is valid."""
+    _check_type(reference, (str, list, tuple, None), "reference")
+    if isinstance(reference, (list, tuple)):
+        for ch in reference:
+            _check_type(ch, (str,), "reference")
+    return reference
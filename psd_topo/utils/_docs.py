@@ -7,15 +7,23 @@ Inspired from mne.utils.docs.py by Eric Larson <larson.eric.d@gmail.com>
 import sys
 from typing import Callable, List
 
-from mne.utils.docs import docdict as docdict_mne
-
 # ------------------------- Documentation dictionary -------------------------
 docdict = dict()
 
-# documentation from MNE
-keys = ("picks_all",)
-for key in keys:
-    docdict[key] = docdict_mne[key]
+# ---------------------------------- picks -----------------------------------
+# copied from MNE to avoid importing mne with the package
+docdict[
+    "picks_all"
+] = """
+picks : str | array-like | slice | None
+    Channels to include. Slices and lists of integers will be interpreted as
+    channel indices. In lists, channel *type* strings (e.g., ``['meg',
+    'eeg']``) will pick channels of those types, channel *name* strings (e.g.,
+    ``['MEG0111', 'MEG2623']`` will pick the given channels. Can also be the
+    string values "all" to pick all channels, or "data" to pick :term:`data
+    channels`. None (default) will pick all channels. Note that channels in
+    ``info['bads']`` *will be included* if their names or indices are
+    explicitly provided."""
 
 # ---------------------------------- verbose ---------------------------------
 docdict[
@@ -41,6 +49,38 @@ figsize : tuple
     2-sequence tuple defining the matplotlib figure size as (width, height)
     in inches."""
 
+docdict[
+    "backend"
+] = """
+backend : str
+    Backend used to display the topographic map, "matplotlib" for
+    `~psd_topo.topomap.TopomapMPL` or "pyqtgraph" for
+    `~psd_topo.topomap.TopomapQtGraph`."""
+docdict[
+    "target_fps"
+] = """
+target_fps : float | None
+    If provided, the duration of each frame is measured and the resolution of
+    the topographic map is adapted to sustain this number of frames per
+    second. None to keep the resolution fixed."""
+docdict[
+    "ready_callback"
+] = """
+ready_callback : callable | None
+    Function called without argument once the first topographic map is
+    displayed, e.g. to report the readiness of a worker process."""
+docdict[
+    "metrics"
+] = """
+metrics : dict | None
+    If provided, the tick rate, the percentiles of the computation and of the
+    rendering time, the dropped frames, the memory usage, the number of new
+    samples per tick and the data-quality counters of each stream are
+    exported in the background. Valid keys are 'port' to serve the metrics
+    as JSON on ``http://127.0.0.1:<port>/metrics``, 'fname' to append them as
+    JSON lines to a file, and 'interval' to set the interval between two
+    lines in seconds (default 10). None to disable."""
+
 # ------------------------------------ FFT -----------------------------------
 docdict[
     "band"
@@ -48,6 +88,58 @@ docdict[
 band : tuple
     Frequency band of interest in Hz as 2 floats, e.g. (8, 13) (edge inc.)."""
 
+# ------------------------------ Preprocessing -------------------------------
+docdict[
+    "reference"
+] = """
+reference : str | list of str | None
+    Reference applied to the EEG channels. "average" applies a common average
+    reference and a channel name or a list of channel names re-references to
+    the (average of the) channel(s). None to disable re-referencing."""
+docdict[
+    "spatial_filter"
+] = """
+spatial_filter : str | None
+    Spatial filter applied to the EEG channels after the reference.
+    "laplacian" applies a surface Laplacian computed from the montage and
+    "average" applies a common average reference. The filter is folded with
+    the reference in the band power computation. None to disable."""
+docdict[
+    "artifact_rejection"
+] = """
+artifact_rejection : dict | None
+    If a dictionary, the windows are checked for artifacts with
+    `psd_topo.preprocessing.ArtifactDetector`, called with the dictionary as
+    keyword arguments, e.g. ``dict(ptp=200, zscore=5)``. The bad channels are
+    interpolated before the band power computation and the windows with too
+    many bad channels are skipped. Neither enter the colormap calibration.
+    None to disable."""
+docdict[
+    "online_filter"
+] = """
+online_filter : dict | None
+    If a dictionary, the received samples are filtered with
+    `psd_topo.preprocessing.OnlineFilter`, called with the dictionary as
+    keyword arguments, e.g. ``dict(l_freq=1, notch=50)``. Each sample is
+    filtered once, when it is received. None to disable."""
+docdict[
+    "smoothing"
+] = """
+smoothing : float | None
+    Time constant in seconds of the exponential moving average applied to the
+    band power before display, see
+    `psd_topo.preprocessing.ExponentialSmoothing`. Short windows can be used
+    for a lower latency while keeping a stable display. None to disable."""
+docdict[
+    "warmup"
+] = """
+warmup : float | None
+    Minimum duration in seconds of the provisional windows displayed while the
+    acquisition buffer fills. The provisional windows grow to 'winsize' as the
+    samples accumulate and their power is normalized to a power spectral
+    density, thus comparable across window durations. None to wait for a full
+    buffer before the first display."""
+
 # -------------------------------- Real-time ---------------------------------
 docdict[
     "stream_name"
@@ -1,5 +1,11 @@
+import atexit
 import logging
+import os
+import queue
 import sys
+import time
+from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
 from typing import Callable, Optional, Union
 
 from ._checks import _check_verbose
@@ -9,6 +15,52 @@ logger = logging.getLogger(__package__.split(".utils", maxsplit=1)[0])
 logger.propagate = False  # don't propagate (in case of multiple imports)
 
 
+class _QueueHandler(QueueHandler):
+    """Queue handler deferring the formatting to the listener thread.
+
+    The listener runs in the same process, thus the record is enqueued as is
+    and the message is merged with its arguments by the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# the records are enqueued by the logger and written to the handlers by a
+# background thread, thus logging does not block on the output streams
+_queue_handler = _QueueHandler(queue.SimpleQueue())
+_listener = QueueListener(_queue_handler.queue, respect_handler_level=True)
+logger.addHandler(_queue_handler)
+
+
+def _start_listener() -> None:
+    """Start the thread writing the records to the handlers."""
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    """Write the pending records and stop the listener thread."""
+    if _listener._thread is not None:
+        _listener.stop()
+
+
+def _restart_listener() -> None:
+    """Restart the listener in a forked child, which lacks its thread."""
+    global _listener
+
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = QueueListener(
+        _queue_handler.queue, *_listener.handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+
+_start_listener()
+atexit.register(_stop_listener)
+if hasattr(os, "register_at_fork"):  # not available on Windows
+    os.register_at_fork(after_in_child=_restart_listener)
+
+
 @fill_doc
 def init_logger(verbose: Optional[Union[bool, str, int]] = None) -> None:
     """Initialize a logger.
@@ -37,7 +89,7 @@ def add_stream_handler(
     verbose = _check_verbose(verbose)
     handler = logging.StreamHandler(stream)
     handler.setFormatter(LoggerFormatter())
-    logger.addHandler(handler)
+    _add_handler(handler)
     set_handler_log_level(-1, verbose)
 
 
@@ -57,10 +109,17 @@ def add_file_handler(
     verbose = _check_verbose(verbose)
     handler = logging.FileHandler(fname, mode)
     handler.setFormatter(LoggerFormatter())
-    logger.addHandler(handler)
+    _add_handler(handler)
     set_handler_log_level(-1, verbose)
 
 
+def _add_handler(handler: logging.Handler) -> None:
+    """Add a handler to the listener writing the records of the logger."""
+    # the tuple is replaced at once, thus the listener thread iterates either
+    # on the previous or on the new handlers
+    _listener.handlers = _listener.handlers + (handler,)
+
+
 @fill_doc
 def set_handler_log_level(
     handler_id: int, verbose: Union[bool, str, int, None]
@@ -72,11 +131,11 @@ def set_handler_log_level(
     Parameters
     ----------
     handler_id : int
-        ID of the handler among 'logger.handlers'.
+        ID of the handler, in the order in which the handlers were added.
     %(verbose)s
     """
     verbose = _check_verbose(verbose)
-    logger.handlers[handler_id].setLevel = verbose
+    _listener.handlers[handler_id].setLevel(verbose)
 
 
 @fill_doc
@@ -88,7 +147,9 @@ def set_log_level(verbose: Union[bool, str, int, None]) -> None:
     %(verbose)s
     """
     verbose = _check_verbose(verbose)
-    logger.setLevel(verbose)
+    # setting the level clears the cache of the enabled levels of all loggers
+    if logger.level != verbose:
+        logger.setLevel(verbose)
 
 
 class LoggerFormatter(logging.Formatter):
@@ -109,6 +170,7 @@ class LoggerFormatter(logging.Formatter):
     _formatters[logging.ERROR] = logging.Formatter(
         fmt="[%(module)s:%(funcName)s:%(lineno)d] %(levelname)s: %(message)s"
     )
+    _formatters[logging.CRITICAL] = _formatters[logging.ERROR]
 
     def __init__(self):
         super().__init__(fmt="%(levelname): %(message)s")
@@ -121,14 +183,18 @@ class LoggerFormatter(logging.Formatter):
         ----------
         record : logging.LogRecord
         """
-        if record.levelno <= logging.DEBUG:
-            return self._formatters[logging.DEBUG].format(record)
-        elif record.levelno <= logging.INFO:
-            return self._formatters[logging.INFO].format(record)
-        elif record.levelno <= logging.WARNING:
-            return self._formatters[logging.WARNING].format(record)
-        else:
-            return self._formatters[logging.ERROR].format(record)
+        try:
+            formatter = self._formatters[record.levelno]
+        except KeyError:
+            # custom level, formatted as the next standard level
+            levels = sorted(
+                level for level in self._formatters if record.levelno <= level
+            )
+            formatter = self._formatters[
+                levels[0] if len(levels) != 0 else logging.ERROR
+            ]
+            self._formatters[record.levelno] = formatter
+        return formatter.format(record)
 
 
 def verbose(f: Callable) -> Callable:
@@ -145,6 +211,7 @@ def verbose(f: Callable) -> Callable:
         The function.
     """
 
+    @wraps(f)
     def wrapper(*args, **kwargs):
         if "verbose" in kwargs:
             set_log_level(kwargs["verbose"])
@@ -153,4 +220,30 @@ def verbose(f: Callable) -> Callable:
     return wrapper
 
 
+class _RateLimit:
+    """Limit the rate of an event, e.g. of a log emitted on every frame.
+
+    Only the emission is limited: the caller keeps updating its counters or
+    values on every frame, and the event reports their latest state when it
+    is allowed.
+
+    Parameters
+    ----------
+    interval : float
+        Minimum interval between two events, in seconds.
+    """
+
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._last = -float("inf")
+
+    def __call__(self) -> bool:
+        """Return True if the event is allowed."""
+        now = time.monotonic()
+        if now - self._last < self._interval:
+            return False
+        self._last = now
+        return True
+
+
 init_logger()
@@ -5,7 +5,16 @@ from typing import Optional, Union
 
 import pytest
 
-from .._logs import init_logger, logger, set_log_level, verbose
+from .. import _logs
+from .._logs import (
+    _RateLimit,
+    add_file_handler,
+    init_logger,
+    logger,
+    set_handler_log_level,
+    set_log_level,
+    verbose,
+)
 
 logger.propagate = True
 
@@ -85,3 +94,55 @@ def test_verbose(caplog):
     caplog.clear()
     foo(verbose="DEBUG")
     assert "101" in caplog.text
+
+
+def _flush():
+    """Wait until the listener has written the pending records."""
+    _logs._stop_listener()
+    _logs._start_listener()
+
+
+def test_handlers(tmp_path):
+    """Test the handlers fed by the listener thread."""
+    set_log_level("INFO")
+    fname = tmp_path / "logs.log"
+    add_file_handler(fname, verbose="WARNING")
+    try:
+        logger.info("101")
+        logger.warning("102")
+        _flush()
+        assert "101" not in fname.read_text()
+        assert "102" in fname.read_text()
+        set_handler_log_level(-1, "INFO")
+        logger.info("103")
+        logger.log(25, "104")  # custom level, formatted as WARNING
+        _flush()
+        logs = fname.read_text()
+        assert "INFO: 103" in logs
+        assert "Level 25: 104" in logs
+    finally:
+        handler = _logs._listener.handlers[-1]
+        _logs._listener.handlers = _logs._listener.handlers[:-1]
+        handler.close()
+
+
+def test_set_log_level(monkeypatch):
+    """Test that the level is not reset if unchanged."""
+    set_log_level("INFO")
+    calls = list()
+    monkeypatch.setattr(logger, "setLevel", calls.append)
+    set_log_level("INFO")
+    set_log_level(20)
+    assert calls == []
+    set_log_level("DEBUG")
+    assert calls == [logging.DEBUG]
+
+
+def test_rate_limit():
+    """Test the rate limit of a log."""
+    rate = _RateLimit(60)
+    assert rate()
+    assert not rate()
+    rate = _RateLimit(0)
+    assert rate()
+    assert rate()
@@ -0,0 +1,80 @@
+"""Test utils.py"""
+
+import pytest
+
+from ..utils import iter_amplifiers, search_amplifiers
+
+
+class _StreamInfo:
+    """Mock of pylsl.StreamInfo."""
+
+    def __init__(self, name, stype="EEG"):
+        self._name = name
+        self._type = stype
+
+    def name(self):
+        return self._name
+
+    def type(self):
+        return self._type
+
+
+class _Resolver:
+    """Mock of pylsl.ContinuousResolver with streams appearing over the polls.
+
+    The streams are provided as (poll, StreamInfo), where poll is the index of
+    the first call to results() returning the stream.
+    """
+
+    def __init__(self, streams):
+        self._streams = streams
+        self.n_polls = 0
+
+    def results(self):
+        self.n_polls += 1
+        return [
+            stream for poll, stream in self._streams if poll < self.n_polls
+        ]
+
+
+def test_iter_amplifiers():
+    """Test the incremental discovery of the amplifiers."""
+    resolver = _Resolver(
+        [
+            (0, _StreamInfo("WS-1")),
+            (0, _StreamInfo("PSD-markers", "Markers")),
+            (0, _StreamInfo("other")),
+            (3, _StreamInfo("WS-2")),
+            (10**6, _StreamInfo("WS-3")),
+        ]
+    )
+    iterator = iter_amplifiers(2, timeout=3, probe=0.01, resolver=resolver)
+    assert next(iterator) == "WS-1"
+    assert resolver.n_polls == 1  # yielded without waiting for 'WS-2'
+    assert next(iterator) == "WS-2"
+    assert resolver.n_polls == 4
+    # the search stops once 2 amplifiers are found, 'WS-3' is never yielded
+    with pytest.raises(StopIteration):
+        next(iterator)
+    assert resolver.n_polls == 4
+
+
+def test_search_amplifiers():
+    """Test the search of the amplifiers."""
+    streams = [(0, _StreamInfo("WS-1")), (1, _StreamInfo("WS-2"))]
+    stream_names = search_amplifiers(2, resolver=_Resolver(streams))
+    assert stream_names == ["WS-1", "WS-2"]
+
+    with pytest.raises(RuntimeError, match="2 streams found"):
+        search_amplifiers(3, timeout=0.3, resolver=_Resolver(streams))
+
+    # without number of amplifiers, search until the timeout
+    stream_names = list(
+        iter_amplifiers(timeout=0.3, probe=0.01, resolver=_Resolver(streams))
+    )
+    assert stream_names == ["WS-1", "WS-2"]
+
+    with pytest.raises(ValueError, match="strictly positive"):
+        search_amplifiers(0)
+    with pytest.raises(ValueError, match="must be provided"):
+        list(iter_amplifiers(None, timeout=None))
@@ -1,40 +1,124 @@
-from typing import List
-
-from bsl.utils.lsl import list_lsl_streams
+import time
+from typing import Iterator, List, Optional
 
 from ..config import load_config
 from ._checks import _check_type
+from ._logs import logger
 
 
-def search_amplifiers(n: int) -> List[str]:
+def search_amplifiers(
+    n: int, timeout: Optional[float] = 10.0, resolver=None
+) -> List[str]:
     """Search the available DSI-24 amplifiers on the network.
 
     Parameters
     ----------
     n : int
         Number of amplifiers to search.
+    timeout : float | None
+        Maximum time to wait for the amplifiers, in seconds. None to wait
+        indefinitely.
+    resolver : ContinuousResolver | None
+        Resolver of the LSL streams, see `~psd_topo.utils.iter_amplifiers`.
 
     Returns
     -------
     stream_names : list of str
         List of amplifiers' names.
     """
-    _check_type(n, ("int",), "n")
-    if n <= 0:
+    return list(iter_amplifiers(n, timeout, resolver=resolver))
+
+
+def iter_amplifiers(
+    n: Optional[int] = None,
+    timeout: Optional[float] = 10.0,
+    probe: float = 0.1,
+    resolver=None,
+) -> Iterator[str]:
+    """Yield the amplifiers as they appear on the network.
+
+    The LSL streams are resolved continuously in the background and the
+    resolved streams are probed every 'probe' seconds. Each new stream whose
+    name starts with the amplifier prefix of the configuration is yielded as
+    soon as it is found.
+
+    Parameters
+    ----------
+    n : int | None
+        Number of amplifiers to search. The iteration stops once 'n'
+        amplifiers are found. None to search until the timeout.
+    timeout : float | None
+        Maximum time to wait for the amplifiers, in seconds. None to wait
+        indefinitely, in which case 'n' must be provided.
+    probe : float
+        Interval between two probes of the resolved streams, in seconds.
+    resolver : ContinuousResolver | None
+        Resolver of the LSL streams. Any object with a ``results()`` method
+        returning the list of ``StreamInfo`` currently on the network is
+        valid. None to use a ``pylsl.ContinuousResolver``.
+
+    Yields
+    ------
+    stream_name : str
+        Name of an amplifier.
+    """
+    _check_type(n, ("int", None), "n")
+    if n is not None and n <= 0:
         raise ValueError(
             "The number of amplifiers to look for 'n' must be a "
             "strictly positive integer."
         )
-
+    _check_type(timeout, ("numeric", None), "timeout")
+    if n is None and timeout is None:
+        raise ValueError(
+            "At least one of the number of amplifiers 'n' or the 'timeout' "
+            "must be provided."
+        )
+    _check_type(probe, ("numeric",), "probe")
+    if probe <= 0:
+        raise ValueError(
+            "The probe interval 'probe' must be a strictly positive number."
+        )
+    resolver = _get_resolver() if resolver is None else resolver
     amp_prefix, _ = load_config()
 
-    stream_names, _ = list_lsl_streams(ignore_markers=True)
-    stream_names = [
-        stream for stream in stream_names if stream.startswith(amp_prefix)
-    ]
-    if len(stream_names) != n:
+    found = set()
+    start = time.perf_counter()
+    while True:
+        for name in _resolve_amplifiers(resolver, amp_prefix):
+            if name in found:
+                continue
+            found.add(name)
+            logger.info(
+                "Amplifier: found '%s' after %.2f s.",
+                name,
+                time.perf_counter() - start,
+            )
+            yield name
+            if n is not None and len(found) == n:
+                return
+        if timeout is not None and timeout <= time.perf_counter() - start:
+            break
+        time.sleep(probe)
+    if n is not None:
         raise RuntimeError(
-            f"{len(stream_names)} streams found starting with "
-            f"'WS-' while {n} streams were expected."
+            f"{len(found)} streams found starting with '{amp_prefix}' while "
+            f"{n} streams were expected."
         )
-    return stream_names
+
+
+def _get_resolver():
+    """Create a resolver of the LSL streams running in the background."""
+    from bsl.externals.pylsl import ContinuousResolver
+
+    return ContinuousResolver()
+
+
+def _resolve_amplifiers(resolver, amp_prefix: str) -> List[str]:
+    """Name of the amplifiers currently resolved, in order of resolution."""
+    return [
+        stream.name()
+        for stream in resolver.results()
+        if stream.name().startswith(amp_prefix)
+        and "Markers" not in stream.type()
+    ]
@@ -1,13 +1,15 @@
 import time
-from typing import Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
-from bsl import StreamReceiver
-from mne import create_info
 
 from .fft import _fft
-from .topomap import TopomapMPL
-from .utils._checks import _check_band, _check_type
+from .utils._checks import (
+    _check_band,
+    _check_reference,
+    _check_type,
+    _check_value,
+)
 from .utils._docs import fill_doc
 from .utils._logs import logger, set_log_level
 
@@ -19,6 +21,17 @@ def weather_map(
     winsize: float,
     figsize: Optional[Tuple[float, float]] = None,
     verbose: Optional[Union[str, int]] = None,
+    *,
+    reference: Optional[Union[str, List[str]]] = "average",
+    spatial_filter: Optional[str] = None,
+    artifact_rejection: Optional[Dict[str, float]] = None,
+    online_filter: Optional[Dict[str, Any]] = None,
+    smoothing: Optional[float] = None,
+    warmup: Optional[float] = 0.5,
+    backend: str = "matplotlib",
+    target_fps: Optional[float] = None,
+    ready_callback: Optional[Callable[[], Any]] = None,
+    metrics: Optional[Dict[str, Any]] = None,
 ) -> None:
     """Online loop to create a "weather map" from an EGI recording.
 
@@ -29,60 +42,154 @@ def weather_map(
     %(winsize)s
     %(figsize)s
     %(verbose)s
+    %(reference)s
+    %(spatial_filter)s
+    %(artifact_rejection)s
+    %(online_filter)s
+    %(smoothing)s
+    %(warmup)s
+    %(backend)s
+    %(target_fps)s
+    %(ready_callback)s
+    %(metrics)s
     """
+    from mne import create_info
+
+    from ._metrics import _Metrics, _start_metrics
+    from ._receiver import _Receiver
+    from .preprocessing import (
+        ArtifactDetector,
+        ExponentialSmoothing,
+        OnlineFilter,
+        Reference,
+        SpatialFilter,
+    )
+    from .topomap import TopomapMPL, TopomapQtGraph
+
     set_log_level(verbose)
     _check_type(stream_name, (str,), "stream_name")
-    _check_band(band)
+    band = _check_band(band)
     _check_type(winsize, ("numeric",), "winsize")
     if winsize <= 0:
         raise ValueError("The window size must be a strictly positive number.")
     figsize = TopomapMPL._check_figsize(figsize)
-
-    # create receiver and feedback
-    sr = StreamReceiver(
-        bufsize=winsize, winsize=winsize, stream_name=stream_name
+    _check_reference(reference)
+    _check_value(
+        spatial_filter, ("laplacian", "average", None), "spatial_filter"
     )
+    _check_type(artifact_rejection, (dict, None), "artifact_rejection")
+    _check_type(online_filter, (dict, None), "online_filter")
+    _check_type(smoothing, ("numeric", None), "smoothing")
+    _check_type(warmup, ("numeric", None), "warmup")
+    if warmup is not None and warmup <= 0:
+        raise ValueError(
+            "The warm-up window duration 'warmup' must be a strictly positive "
+            "number."
+        )
+    _check_value(backend, ("matplotlib", "pyqtgraph"), "backend")
+    _check_type(target_fps, ("numeric", None), "target_fps")
+    if target_fps is not None and target_fps <= 0:
+        raise ValueError(
+            "The target frame rate 'target_fps' must be a strictly positive "
+            "number."
+        )
+    _check_type(ready_callback, ("callable", None), "ready_callback")
+    _check_type(metrics, (dict, None), "metrics")
+
+    # create receiver, provisional windows are returned while the buffer fills
+    receiver = _Receiver(stream_name, winsize, warmup, band)
 
     # retrieve sampling rate and channels
-    fs = sr.streams[stream_name].sample_rate
-    ch_names = sr.streams[stream_name].ch_list
-    # remove trigger channel
+    fs = receiver.sfreq
+    ch_names = receiver.ch_names
+    # remove trigger channel and apply the reference in one operation
     trigger_idx = ch_names.index("TRIGGER")
-    ch_idx = np.array([k for k, ch in enumerate(ch_names) if ch != "TRIGGER"])
-    ch_names = [ch for ch in ch_names if ch != "TRIGGER"]
+    picks = [ch for ch in ch_names if ch != "TRIGGER"]
+    picks_idx = [ch_names.index(ch) for ch in picks]
+    # filter the new samples of each window with a persistent state
+    if online_filter is not None:
+        online_filter = OnlineFilter(
+            fs, len(ch_names), receiver.n_times, **online_filter
+        )
+    reference = Reference(ch_names, picks, reference)
+    ch_names = list(reference.ch_names)
     # replace E257 with Cz
     ch_names[ch_names.index("E257")] = "Cz"
 
-    # wait to fill one buffer
-    logger.info(
-        "Buffer: waiting for an entire %.2f seconds buffer to be fill..",
-        winsize,
-    )
-    time.sleep(winsize)
-    logger.info("Buffer: ready!")
-
     # create feedback
     info = create_info(ch_names=ch_names, sfreq=fs, ch_types="eeg")
     info.set_montage("GSN-HydroCel-257")
     logger.info("Topomap: creating display window..")
-    feedback = TopomapMPL(info, "hsv", figsize)
+    topomap = TopomapMPL if backend == "matplotlib" else TopomapQtGraph
+    feedback = topomap(info, "hsv", figsize, target_fps=target_fps)
     logger.info("Topomap: ready!")
 
+    # fold the reference and the spatial filter in a single operator
+    spatial_filter = SpatialFilter(info, spatial_filter)
+    operator = spatial_filter.matrix @ reference.operator
+    detector = (
+        None
+        if artifact_rejection is None
+        else ArtifactDetector(info, **artifact_rejection)
+    )
+    if smoothing is not None:
+        smoothing = ExponentialSmoothing(smoothing)
+    # the counters are recorded on every tick, their export is optional
+    counters = _Metrics(stream_name, quality=receiver.quality)
+    _start_metrics([counters], metrics)
+
     # main loop
     while True:
         # retrieve data
-        sr.acquire()
-        data, _ = sr.get_window()
-        # remove unwanted channels
+        data, timestamps = receiver.get_window()
+        if timestamps.size == 0:  # not enough samples for a first window
+            feedback.redraw()
+            continue
+        tic = time.perf_counter()
         trigger = data[:, trigger_idx]  # retrieve trigger channel
-        data = data[:, ch_idx]  # retrieve EEG channels
-        # apply CAR
-        data = (data.T - np.average(data, axis=1)).T
-        # compute metric
-        fftval = _fft(data.T, fs=fs, band=band, dB=True)  # (n_channels, )
+        if online_filter is not None:
+            data = online_filter.apply(data, timestamps)
+        # look for artifacts and interpolate the bad channels
+        frame_operator = operator
+        # provisional windows do not impact the colormap range
+        calibrate = receiver.is_full
+        if detector is not None:
+            bads, reject = detector.detect(data[:, picks_idx].T)
+            if reject:
+                counters.drop()
+                feedback.redraw()
+                continue
+            if bads.any():
+                interpolation = detector.interpolation(bads)
+                frame_operator = operator.copy()
+                frame_operator[:, picks_idx] = (
+                    operator[:, picks_idx] @ interpolation
+                )
+                calibrate = False
+        # compute metric, the operator removes the unwanted channels and
+        # applies the reference and the spatial filter on the FFT bins
+        fftval = _fft(
+            data.T,
+            fs=fs,
+            band=band,
+            dB=True,
+            operator=frame_operator,
+            normalize=True,
+        )  # (n_channels, )
+        if smoothing is not None:
+            fftval = smoothing.apply(fftval, timestamps[-1])
+        toc = time.perf_counter()
         # update feedback
-        feedback.update(fftval)
+        feedback.update(fftval, calibrate=calibrate)
         if np.any(trigger):
             idx = np.nonzero(trigger)[0][-1]
-            feedback.axes.set_title(str(trigger[idx]))
+            feedback.set_title(str(trigger[idx]))
+        else:
+            feedback.set_title("")
         feedback.redraw()
+        counters.record(
+            tic, toc - tic, time.perf_counter() - toc, receiver.n_new
+        )
+        if ready_callback is not None:
+            ready_callback()
+            ready_callback = None